@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from app.security.service import require_roles_or_service
+from app.services.warmup import WARMING, start_warm_up, warm_up_status
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 
 router = APIRouter()
 
@@ -6,3 +9,21 @@ router = APIRouter()
 @router.get("/health")
 def health():
     return {"status": "ok", "service": "ai-service"}
+
+
+@router.get("/health/ready")
+def ready():
+    """
+    Readiness probe: 503 while models are still warming up. A cold or
+    failed warm-up still reports ready, since models then load on first use.
+    """
+    state = warm_up_status()
+    status_code = 503 if state["status"] == WARMING else 200
+    return JSONResponse({"models": state}, status_code=status_code)
+
+
+@router.post("/health/warmup", status_code=202)
+def warmup(data=Depends(require_roles_or_service("ADMIN"))):
+    """Preload models in the background ahead of the first quiz."""
+    started = start_warm_up()
+    return {"started": started, "models": warm_up_status()}
@@ -1,12 +1,27 @@
+import json
 import logging
-import os
 
-from app.schemas.quiz_schema import QuizFromPDFRequest, QuizRequest, QuizResponse
+from app.schemas.quiz_schema import (
+    QuizFromPDFRequest,
+    QuizJobRequest,
+    QuizJobResponse,
+    QuizRequest,
+    QuizResponse,
+)
 from app.security.rbac import require_roles
-from app.services.pdf_service import PDFService
-from app.services.quiz_service import QuizService
-from app.services.s3_service import S3Service
+from app.security.service import require_roles_or_service
+from app.services.model_pool import ModelPoolBusy
+from app.services.model_pool import generate_quiz as pool_generate_quiz
+from app.services.model_pool import stream_quiz
+from app.services.pdf_quiz_pipeline import extract_pdf_text
+from app.services.pdf_quiz_pipeline import generate_quiz_from_pdf as run_pdf_pipeline
+from app.services.quiz_jobs import (
+    QuizJobQueueFull,
+    QuizJobService,
+    QuizJobStoreUnavailable,
+)
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +34,19 @@ def generate_quiz(
     data=Depends(require_roles("INSTRUCTOR", "ADMIN")),
 ):
     """Generate a quiz from raw text (original endpoint)."""
-    return QuizService.generate_quiz(
-        text=request.lesson_text,
-        num_questions=request.num_questions,
-    )
+    try:
+        return pool_generate_quiz(
+            text=request.lesson_text,
+            num_questions=request.num_questions,
+        )
+    except ModelPoolBusy as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "10"}
+        )
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Quiz generation timed out.")
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
 
 
 @router.post("/generate-from-pdf", response_model=QuizResponse)
@@ -37,28 +61,17 @@ def generate_quiz_from_pdf(
     3. Generate MCQs with Flan-T5
     4. Return structured JSON
     """
-    s3 = S3Service()
-    tmp_path = None
-
     try:
-        # Step 1 — Download from S3
-        logger.info(f"Downloading PDF: {request.pdf_key}")
-        tmp_path = s3.download_file(request.pdf_key)
-
-        # Step 2 — Extract text
-        logger.info("Extracting text from PDF …")
-        text = PDFService.extract_text(tmp_path)
-        logger.info(f"Extracted {len(text)} characters from PDF.")
-
-        # Step 3 — Generate quiz
-        logger.info(f"Generating {request.num_questions} questions …")
-        result = QuizService.generate_quiz(
-            text=text,
+        return run_pdf_pipeline(
+            pdf_key=request.pdf_key,
             num_questions=request.num_questions,
         )
-
-        return result
-
+    except ModelPoolBusy as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "10"}
+        )
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Quiz generation timed out.")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except RuntimeError as e:
@@ -66,7 +79,86 @@ def generate_quiz_from_pdf(
     except Exception as e:
         logger.exception("Unexpected error in generate-from-pdf")
         raise HTTPException(status_code=500, detail=f"Quiz generation failed: {e}")
-    finally:
-        # Clean up temp file
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+
+
+@router.post("/generate-from-pdf/stream")
+def stream_quiz_from_pdf(
+    request: QuizFromPDFRequest,
+    data=Depends(require_roles_or_service("INSTRUCTOR", "ADMIN")),
+):
+    """
+    Same pipeline as /generate-from-pdf, streamed as NDJSON. One line per
+    question as soon as it passes validation and dedup:
+        {"type": "question", "index": 0, "question": {...}}
+    then {"type": "done", "count": n}, or {"type": "error", "detail": ...}
+    if generation fails part-way. Download/extraction errors are returned as
+    normal HTTP errors before the stream starts.
+    """
+    try:
+        text = extract_pdf_text(request.pdf_key, request.num_questions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    def events():
+        count = 0
+        try:
+            for question in stream_quiz(text, request.num_questions):
+                line = {"type": "question", "index": count, "question": question}
+                count += 1
+                yield json.dumps(line) + "\n"
+        except Exception as e:
+            logger.exception("Streaming quiz generation failed")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+            return
+
+        yield json.dumps({"type": "done", "count": count}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/jobs", response_model=QuizJobResponse, status_code=202)
+def submit_quiz_job(
+    request: QuizJobRequest,
+    data=Depends(require_roles_or_service("INSTRUCTOR", "ADMIN")),
+):
+    """
+    Queue quiz generation for a PDF and return a job id immediately.
+    Poll GET /quiz/jobs/{job_id}, or pass callback_url to have the result
+    POSTed to a backend /internal/ route when the job finishes.
+    """
+    try:
+        return QuizJobService.submit(
+            pdf_key=request.pdf_key,
+            num_questions=request.num_questions,
+            tenant_id=data["tenant_id"],
+            callback_url=request.callback_url,
+            metadata=request.metadata,
+        )
+    except (QuizJobQueueFull, QuizJobStoreUnavailable) as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "30"}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=QuizJobResponse)
+def get_quiz_job(
+    job_id: str,
+    data=Depends(require_roles_or_service("INSTRUCTOR", "ADMIN")),
+):
+    """Current status of a quiz job, with questions once completed."""
+    try:
+        job = QuizJobService.get(job_id)
+    except QuizJobStoreUnavailable as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "30"}
+        )
+
+    # Users only see their own tenant's jobs; services see all
+    if job is None or (not data["service"] and job["tenant_id"] != data["tenant_id"]):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
@@ -19,6 +19,58 @@ class Settings(BaseSettings):
     aws_secret_access_key: str = ""
     aws_region: str = "eu-north-1"
     aws_storage_bucket_name: str = ""
+    aws_s3_endpoint_url: str = ""  # e.g. http://minio:9000 outside AWS
+    s3_max_pool_connections: int = 20
+    s3_memory_max_bytes: int = 32 * 1024 * 1024  # larger PDFs spool to disk
+    s3_max_object_bytes: int = 200 * 1024 * 1024  # refuse anything bigger
+
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Quiz generation
+    quiz_model_name: str = "google/flan-t5-base"
+    quiz_batch_size: int = 4  # prompts per Flan-T5 forward pass
+    quiz_dedup_threshold: float = 0.7  # TF-IDF cosine above this = duplicate
+    # Larger requests are split into pool tasks of this many questions
+    quiz_generation_batch_questions: int = 10
+    # Inference backend: "torch", "quantized" (dynamic int8) or "onnx"
+    quiz_inference_backend: str = "torch"
+    quiz_onnx_dir: str = "/tmp/eduflow-ai/onnx"  # one export per model, onnx only
+
+    # PDF extraction
+    pdf_extract_workers: int = 2  # processes for page ranges of large PDFs
+    pdf_parallel_min_pages: int = 40  # smaller PDFs are read in-process
+    pdf_chars_per_question: int = 5000  # text read per requested question
+    pdf_min_chars: int = 20000
+
+    # Extracted-text artifacts keyed by bucket/key/ETag
+    text_artifact_dir: str = "/tmp/eduflow-ai/text-artifacts"
+    text_artifact_max_bytes: int = 512 * 1024 * 1024
+    text_artifact_s3_sidecar: bool = False  # also share artifacts via S3
+    text_artifact_s3_prefix: str = "ai-text-artifacts/"
+
+    # Load models in the background at startup instead of on first request
+    warm_up_on_startup: bool = True
+
+    # Model worker processes; 0 runs generation in the request thread
+    model_pool_workers: int = 2
+    model_pool_threads_per_worker: int = 0  # 0 = cpu_count // workers
+    model_pool_queue_size: int = 8  # requests allowed to wait for a worker
+    model_pool_max_wait: float = 5.0  # seconds to wait for a queue slot
+    model_pool_timeout: float = 300.0  # seconds for one generation
+
+    # Background quiz jobs
+    quiz_job_runners: int = 4  # jobs running the PDF pipeline at once
+    quiz_job_max_pending: int = 100
+    quiz_job_ttl: int = 3600  # seconds a finished job stays pollable
+    quiz_job_deadline: int = 3600  # seconds before an unfinished job is abandoned
+    quiz_job_store: str = "redis"  # "redis" (shared by all pods) or "memory"
+    quiz_callback_allowed_prefix: str = "http://backend:8000/internal/"
+
+    # Generated-quiz cache: "disk", "memory", "redis" or "none"
+    quiz_cache_backend: str = "disk"
+    quiz_cache_dir: str = "/tmp/eduflow-ai/quiz-cache"
+    quiz_cache_max_entries: int = 1000
+    quiz_cache_ttl: int = 7 * 24 * 3600  # seconds, redis backend only
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,105 @@
+"""
+Flan-T5 inference backends.
+
+Every loader returns a callable with the Hugging Face text2text-generation
+pipeline interface, so QuizService does not care which one is active:
+
+- ``torch``      full fp32 PyTorch weights (original behaviour)
+- ``quantized``  PyTorch with dynamic int8 quantization of the Linear layers
+- ``onnx``       ONNX Runtime export via ``optimum`` (optional dependency)
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "quantized", "onnx")
+
+
+def load_pipeline(model_name: str, backend: str = "torch", onnx_dir: str = ""):
+    if backend == "torch":
+        return _load_torch(model_name)
+    if backend == "quantized":
+        return _load_quantized(model_name)
+    if backend == "onnx":
+        return _load_onnx(model_name, onnx_dir)
+    raise ValueError(
+        f"Unknown inference backend '{backend}', expected one of {BACKENDS}"
+    )
+
+
+def _load_torch(model_name: str):
+    from transformers import pipeline as hf_pipeline
+
+    return hf_pipeline(
+        "text2text-generation",
+        model=model_name,
+        device=-1,  # CPU
+    )
+
+
+def _load_quantized(model_name: str):
+    """
+    int8 weights for every nn.Linear, activations quantized on the fly.
+    Roughly quarters the Linear weight memory and speeds up CPU matmuls.
+    """
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+    from transformers import pipeline as hf_pipeline
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+
+    model = torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+    return hf_pipeline(
+        "text2text-generation",
+        model=model,
+        tokenizer=tokenizer,
+        device=-1,
+    )
+
+
+def onnx_export_dir(onnx_dir: str, model_name: str) -> str:
+    """Per-model export location, so changing the model never reuses a stale export."""
+    if not onnx_dir:
+        return ""
+    return os.path.join(onnx_dir, model_name.replace("/", "--"))
+
+
+def _load_onnx(model_name: str, onnx_dir: str):
+    """
+    ONNX Runtime session for encoder and decoder. The export is slow, so it
+    is written under ``onnx_dir`` once per model and loaded from there
+    afterwards.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise RuntimeError(
+            "The onnx inference backend needs 'optimum[onnxruntime]' installed."
+        ) from e
+    from transformers import AutoTokenizer
+    from transformers import pipeline as hf_pipeline
+
+    export_dir = onnx_export_dir(onnx_dir, model_name)
+    if export_dir and os.path.isdir(export_dir):
+        model = ORTModelForSeq2SeqLM.from_pretrained(export_dir)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        logger.info(f"Exporting {model_name} to ONNX … (first load only)")
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if export_dir:
+            model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+
+    return hf_pipeline(
+        "text2text-generation",
+        model=model,
+        tokenizer=tokenizer,
+    )
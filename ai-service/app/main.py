@@ -7,6 +7,8 @@ from app.api.v1.insights import router as insights_router
 from app.api.v1.protected import router as protected_router
 from app.api.v1.quiz import router as quiz_router
 from app.core.config import settings
+from app.services.model_pool import start_model_pool, stop_model_pool
+from app.services.warmup import start_warm_up
 from fastapi import FastAPI
 
 app = FastAPI(
@@ -22,3 +24,16 @@ app.include_router(demo_router, prefix="/api/v1")
 app.include_router(courses_router, prefix="/api/v1")
 app.include_router(insights_router, prefix="/api/v1")
 app.include_router(quiz_router, prefix="/api/v1")
+
+
+@app.on_event("startup")
+def startup():
+    start_model_pool()
+    if settings.warm_up_on_startup:
+        # In the background, so /health answers immediately
+        start_warm_up()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    stop_model_pool()
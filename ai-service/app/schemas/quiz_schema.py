@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -21,3 +21,18 @@ class Question(BaseModel):
 
 class QuizResponse(BaseModel):
     questions: List[Question]
+
+
+class QuizJobRequest(BaseModel):
+    pdf_key: str
+    num_questions: int = 5
+    callback_url: Optional[str] = None
+    metadata: Optional[dict] = None
+
+
+class QuizJobResponse(BaseModel):
+    job_id: str
+    status: str
+    questions: Optional[List[Question]] = None
+    error: Optional[str] = None
+    metadata: dict = {}
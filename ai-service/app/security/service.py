@@ -0,0 +1,38 @@
+import hmac
+
+from app.core.config import settings
+from app.security.jwt import verify_jwt_token
+from app.security.tenant import verify_tenant_access
+from fastapi import Header, HTTPException, status
+
+
+def require_roles_or_service(*allowed_roles: str):
+    """
+    Accept either a trusted internal service (X-Service-Token) or a user JWT
+    with one of ``allowed_roles``. Service calls have no tenant.
+    """
+
+    def checker(
+        authorization: str | None = Header(None),
+        x_service_token: str | None = Header(None),
+    ):
+        expected = settings.internal_service_token
+        if x_service_token and expected:
+            if hmac.compare_digest(x_service_token, expected):
+                return {"tenant_id": None, "service": True}
+
+        if authorization is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Missing credentials",
+            )
+
+        data = verify_tenant_access(verify_jwt_token(authorization))
+        if data["token_payload"]["role"] not in allowed_roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Role not allowed"
+            )
+
+        return {**data, "service": False}
+
+    return checker
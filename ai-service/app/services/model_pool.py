@@ -0,0 +1,251 @@
+"""
+Fixed pool of model worker processes.
+
+Each worker loads Flan-T5 once and runs generations with its torch thread
+count pinned to its share of the cores, so requests no longer fight over the
+GIL in the uvicorn threadpool and memory is one model copy per worker.
+
+Admission is bounded: at most ``workers + queue_size`` generations are in
+flight. A request that cannot get a slot within ``max_wait`` seconds gets
+ModelPoolBusy (HTTP 503) instead of piling up behind the backlog. A slot is
+only given back once its task has actually left the pool, so callers that
+time out don't let abandoned work pile up on the workers.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.config import settings
+from app.services.quiz_cache import QuizCache
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPoolBusy(Exception):
+    """All workers are busy and the request queue is full."""
+
+
+def _init_worker(num_threads: int, ready):
+    import torch
+    from app.services.quiz_service import _get_nlp, _get_pipeline
+
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+    _get_pipeline()
+    _get_nlp()  # the spaCy fallback also runs in the worker
+    logger.info(f"Model worker {os.getpid()} ready ({num_threads} threads)")
+    ready.release()
+
+
+def _generate_quiz(text: str, num_questions: int) -> dict:
+    from app.services.quiz_service import QuizService
+
+    return QuizService.generate_quiz(text=text, num_questions=num_questions)
+
+
+def _run_prompts(prompts: list) -> list:
+    from app.services.quiz_service import QuizService
+
+    return QuizService._run_prompts(prompts)
+
+
+def _generate_with_spacy(text: str, num_questions: int) -> list:
+    from app.services.quiz_service import QuizService
+
+    return QuizService._generate_with_spacy(text, num_questions)
+
+
+class ModelPool:
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        threads_per_worker: int = 0,
+        initializer=_init_worker,
+    ):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(
+            1, (os.cpu_count() or 1) // workers
+        )
+        self._initializer = initializer
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+        self._warm_futures = []
+
+    def _new_executor(self):
+        # Each worker releases this once its models are loaded
+        self._ready = self._context.Semaphore(0)
+        self._ready_count = 0
+        # spawn, not fork: forking a process that already imported torch
+        # can deadlock on its internal thread pools
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=self._initializer,
+            initargs=(self.threads_per_worker, self._ready),
+        )
+
+    def _restart(self, broken):
+        # A worker died (usually OOM); replace the pool for later requests.
+        # Every caller that was using it lands here, so only the first one
+        # swaps it out instead of shutting down its fresh replacement.
+        with self._lock:
+            if self._executor is not broken:
+                return
+            logger.error("Model worker pool broke, restarting it")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+
+    def run(self, fn, *args, max_wait: float, timeout: float):
+        """Run ``fn(*args)`` on a worker once a queue slot is free."""
+        if not self._slots.acquire(timeout=max_wait):
+            raise ModelPoolBusy("Quiz generation is at capacity, try again shortly.")
+
+        executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool as e:
+            self._slots.release()
+            self._restart(executor)
+            raise RuntimeError("Model worker crashed during generation.") from e
+        except BaseException:
+            self._slots.release()
+            raise
+
+        # The slot stays taken until the task is done, cancelled or lost
+        # with its worker, not just until this caller stops waiting
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # Frees the slot straight away if no worker has picked it up yet
+            future.cancel()
+            raise
+        except BrokenProcessPool as e:
+            self._restart(executor)
+            raise RuntimeError("Model worker crashed during generation.") from e
+
+    def warm_up(self):
+        """
+        Spawn every worker now so the first requests don't pay model load.
+        The pool starts a process per task while none is idle, so one
+        trivial task per worker starts them all.
+        """
+        self._warm_futures = [
+            self._executor.submit(os.getpid) for _ in range(self.workers)
+        ]
+
+    def wait_warm(self, timeout: float | None = None) -> bool:
+        """
+        Block until every worker has reported its models loaded, as counted
+        by the initializer's ready signal. False on timeout or when a
+        worker failed to start.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._ready_count < self.workers:
+            if any(
+                f.done() and not f.cancelled() and f.exception()
+                for f in self._warm_futures
+            ):
+                return False
+            remaining = 0.5
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+                if remaining <= 0:
+                    return False
+            if self._ready.acquire(timeout=remaining):
+                self._ready_count += 1
+        return True
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide pool, started from the FastAPI startup hook
+# ---------------------------------------------------------------------------
+_pool = None
+
+
+def start_model_pool():
+    global _pool
+    if _pool is None and settings.model_pool_workers > 0:
+        _pool = ModelPool(
+            workers=settings.model_pool_workers,
+            queue_size=settings.model_pool_queue_size,
+            threads_per_worker=settings.model_pool_threads_per_worker,
+        )
+        logger.info(
+            f"Started {_pool.workers} model workers "
+            f"({_pool.threads_per_worker} threads each)"
+        )
+
+
+def warm_up_model_pool(timeout: float | None = None) -> bool | None:
+    """
+    Spawn and load all pool workers, waiting up to ``timeout`` seconds.
+    Returns None when the pool is disabled, else whether every worker loaded.
+    """
+    if _pool is None:
+        return None
+    _pool.warm_up()
+    return _pool.wait_warm(timeout)
+
+
+def stop_model_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def _run(fn, *args, max_wait: float | None = None):
+    """``fn(*args)`` on the worker pool, or inline when the pool is disabled."""
+    if _pool is None:
+        return fn(*args)
+
+    return _pool.run(
+        fn,
+        *args,
+        max_wait=settings.model_pool_max_wait if max_wait is None else max_wait,
+        timeout=settings.model_pool_timeout,
+    )
+
+
+def generate_quiz(text: str, num_questions: int, max_wait: float | None = None) -> dict:
+    """
+    Generate a quiz on the worker pool, or in the calling thread when the
+    pool is disabled (MODEL_POOL_WORKERS=0). Cache hits skip the queue.
+    ``max_wait`` overrides MODEL_POOL_MAX_WAIT, e.g. for background jobs.
+    """
+    cached = QuizCache.get(text, num_questions)
+    if cached is not None:
+        return cached
+
+    return _run(_generate_quiz, text, num_questions, max_wait=max_wait)
+
+
+def stream_quiz(text: str, num_questions: int, max_wait: float | None = None):
+    """
+    Yield questions as they are generated. Each prompt batch is a separate
+    pool task, so questions arrive batch by batch and long streams share
+    the workers fairly with other requests.
+    """
+    from app.services.quiz_service import QuizService
+
+    return QuizService.iter_quiz(
+        text,
+        num_questions,
+        run_prompts=lambda prompts: _run(_run_prompts, prompts, max_wait=max_wait),
+        run_spacy=lambda text, n: _run(
+            _generate_with_spacy, text, n, max_wait=max_wait
+        ),
+    )
@@ -0,0 +1,104 @@
+import logging
+import math
+
+from app.core.config import settings
+from app.services.model_pool import generate_quiz
+from app.services.pdf_service import PDFService
+from app.services.question_dedup import dedupe_questions
+from app.services.s3_service import S3Service
+from app.services.text_artifact_store import TextArtifactStore
+
+logger = logging.getLogger(__name__)
+
+
+def text_budget(num_questions: int) -> int:
+    """
+    Characters of PDF text worth reading for ``num_questions`` questions.
+    Generation only draws on the leading chunks, so reading further is waste.
+    """
+    return max(settings.pdf_min_chars, num_questions * settings.pdf_chars_per_question)
+
+
+def extract_pdf_text(pdf_key: str, num_questions: int | None = None) -> str:
+    """
+    Return the cleaned text of a PDF in S3, reading only as many pages as
+    ``num_questions`` needs (all pages when None).
+
+    Extractions are cached per object ETag, so repeat requests for the same
+    upload skip both the download and the parse.
+    """
+    s3 = S3Service()
+    max_chars = text_budget(num_questions) if num_questions else None
+
+    head = s3.head_object(pdf_key)
+    etag = head["etag"]
+    artifact = TextArtifactStore.get(s3, pdf_key, etag)
+    if artifact is not None and (
+        artifact["complete"]
+        or (max_chars is not None and len(artifact["text"]) >= max_chars)
+    ):
+        logger.info(f"Using cached text for {pdf_key} ({len(artifact['text'])} chars)")
+        return artifact["text"]
+
+    logger.info(f"Reading PDF: {pdf_key} ({head['size']} bytes)")
+    with s3.open_object(pdf_key, size=head["size"]) as source:
+        logger.info("Extracting text from PDF …")
+        artifact = PDFService.extract_document(source, max_chars=max_chars)
+    logger.info(f"Extracted {len(artifact['text'])} characters from PDF.")
+
+    TextArtifactStore.set(s3, pdf_key, etag, artifact)
+    return artifact["text"]
+
+
+def generate_quiz_from_pdf(
+    pdf_key: str, num_questions: int, max_wait: float | None = None
+) -> dict:
+    """
+    Full pipeline:
+    1. Download PDF from S3
+    2. Extract text with pdfplumber
+    3. Generate MCQs with Flan-T5 on the model pool
+    """
+    text = extract_pdf_text(pdf_key, num_questions)
+
+    logger.info(f"Generating {num_questions} questions …")
+    if num_questions <= settings.quiz_generation_batch_questions:
+        return generate_quiz(text=text, num_questions=num_questions, max_wait=max_wait)
+    return generate_quiz_in_batches(text, num_questions, max_wait=max_wait)
+
+
+def generate_quiz_in_batches(
+    text: str, num_questions: int, max_wait: float | None = None
+) -> dict:
+    """
+    Generate a large question set (e.g. a question bank) as several pool
+    tasks of at most ``quiz_generation_batch_questions``, each on its own
+    slice of the text and under its own model_pool_timeout. A batch that
+    times out or crashes is skipped, so one slow batch doesn't lose the rest;
+    only when every batch fails is the error raised.
+    """
+    batch_size = settings.quiz_generation_batch_questions
+    batches = math.ceil(num_questions / batch_size)
+    slice_len = math.ceil(len(text) / batches)
+
+    questions = []
+    error = None
+    for idx in range(batches):
+        wanted = min(batch_size, num_questions - idx * batch_size)
+        chunk = text[idx * slice_len : (idx + 1) * slice_len]
+        try:
+            result = generate_quiz(text=chunk, num_questions=wanted, max_wait=max_wait)
+        except (TimeoutError, RuntimeError) as e:
+            logger.warning(f"Question batch {idx + 1}/{batches} failed: {e!r}")
+            error = e
+            continue
+
+        questions += dedupe_questions(
+            result.get("questions", []),
+            existing=questions,
+            threshold=settings.quiz_dedup_threshold,
+        )
+
+    if not questions and error is not None:
+        raise error
+    return {"questions": questions[:num_questions]}
@@ -1,62 +1,216 @@
+import multiprocessing
+import os
 import re
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 import pdfplumber
+from app.core.config import settings
+
+# Pages sampled across the document to detect repeated headers/footers
+HEADER_SAMPLE_PAGES = 12
+# Pages handed to one worker process at a time
+PAGE_RANGE_SIZE = 16
+
+
+def _read_page(page) -> tuple:
+    """Raw lines and table texts of one pdfplumber page."""
+    page_text = page.extract_text(x_tolerance=2, y_tolerance=2)
+    lines = page_text.strip().split("\n") if page_text else []
+
+    tables = []
+    for table in page.extract_tables():
+        if table:
+            table_text = PDFService._table_to_text(table)
+            if table_text:
+                tables.append(table_text)
+
+    # Drop pdfplumber's per-page object cache so memory stays flat
+    page.close()
+    return lines, tables
+
+
+def _page_lines(page) -> list:
+    page_text = page.extract_text(x_tolerance=2, y_tolerance=2)
+    page.close()
+    return page_text.strip().split("\n") if page_text else []
+
+
+def _sample_indices(page_count: int) -> list:
+    """HEADER_SAMPLE_PAGES page indices spread evenly over the document."""
+    if page_count <= HEADER_SAMPLE_PAGES:
+        return list(range(page_count))
+    step = (page_count - 1) / (HEADER_SAMPLE_PAGES - 1)
+    return sorted({round(idx * step) for idx in range(HEADER_SAMPLE_PAGES)})
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list:
+    """Worker entry point: read pages [start, stop) in a separate process."""
+    with pdfplumber.open(file_path, pages=list(range(start + 1, stop + 1))) as pdf:
+        return [_read_page(page) for page in pdf.pages]
 
 
 class PDFService:
     """Extract accurate text content from PDF files with advanced cleaning."""
 
     @staticmethod
-    def extract_text(file_path: str) -> str:
+    def extract_text(file_path, max_chars: int | None = None) -> str:
         """
-        Extract all text from a PDF file using pdfplumber.
+        Extract text from a PDF file (path or binary file object) using
+        pdfplumber.
         Applies cleaning for accurate quiz generation:
         - Removes repeated headers/footers
         - Fixes broken hyphenation across lines
         - Normalizes whitespace
         - Extracts tables as structured text
+
+        Stops reading pages once ``max_chars`` characters are collected.
         """
-        text_parts = []
-        all_lines_per_page = []
-
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                # Extract main text
-                page_text = page.extract_text(x_tolerance=2, y_tolerance=2)
-                if page_text:
-                    all_lines_per_page.append(page_text.strip().split("\n"))
-
-                # Extract tables and append as structured text
-                tables = page.extract_tables()
-                for table in tables:
-                    if table:
-                        table_text = PDFService._table_to_text(table)
-                        if table_text:
-                            text_parts.append(table_text)
-
-        # Detect and remove repeated headers/footers
-        header_footer = PDFService._detect_repeated_lines(all_lines_per_page)
-
-        # Clean each page's text
-        for page_lines in all_lines_per_page:
-            cleaned_lines = [
-                line
-                for line in page_lines
-                if line.strip() and line.strip() not in header_footer
-            ]
-            if cleaned_lines:
-                page_text = "\n".join(cleaned_lines)
-                text_parts.append(page_text)
+        return PDFService.extract_document(file_path, max_chars)["text"]
+
+    @staticmethod
+    def extract_document(file_path, max_chars: int | None = None) -> dict:
+        """
+        Like extract_text, but returns the compact artifact cached by
+        TextArtifactStore:
+        {"text", "page_offsets", "headers", "complete"}
+
+        ``page_offsets[i]`` is where the i-th kept page starts in ``text``;
+        ``complete`` is False when extraction stopped early at ``max_chars``.
+        """
+        headers = set()
+        pages = []
+        page_offsets = []
+        offset = 0
+        complete = True
 
-        full_text = "\n\n".join(text_parts)
+        page_iter = PDFService.iter_pages(file_path, headers=headers)
+        try:
+            for page_text in page_iter:
+                if max_chars is not None and offset >= max_chars:
+                    # One page past the budget tells us the text is partial
+                    complete = False
+                    break
+                page_offsets.append(offset)
+                pages.append(page_text)
+                offset += len(page_text) + 2  # "\n\n" separator
+        finally:
+            page_iter.close()  # stops any page ranges still in flight
 
-        # Post-processing
-        full_text = PDFService._clean_text(full_text)
+        full_text = "\n\n".join(pages)
 
         if not full_text.strip():
             raise ValueError("No readable text found in the PDF.")
 
-        return full_text
+        return {
+            "text": full_text,
+            "page_offsets": page_offsets,
+            "headers": sorted(headers),
+            "complete": complete,
+        }
+
+    @staticmethod
+    def iter_pages(file_path, max_chars: int | None = None, headers: set | None = None):
+        """
+        Yield cleaned text page by page. The detected header/footer lines
+        are added to ``headers`` when given.
+
+        Headers/footers are detected on HEADER_SAMPLE_PAGES pages spread
+        across the document, so running heads that only start after the
+        front matter are still found; then pages stream through one at a
+        time. Large PDFs are read in page ranges on a process pool with
+        bounded read-ahead, and closing the generator (or hitting
+        ``max_chars``) stops the remaining work.
+        """
+        with pdfplumber.open(PDFService._rewound(file_path)) as pdf:
+            page_count = len(pdf.pages)
+            header_footer = PDFService._detect_repeated_lines(
+                [_page_lines(pdf.pages[idx]) for idx in _sample_indices(page_count)]
+            )
+        if headers is not None:
+            headers.update(header_footer)
+
+        raw_pages = PDFService._iter_raw_pages(file_path, page_count)
+        try:
+            collected = 0
+            for lines, tables in raw_pages:
+                page_text = PDFService._clean_page(lines, tables, header_footer)
+                if not page_text:
+                    continue
+
+                yield page_text
+
+                collected += len(page_text)
+                if max_chars is not None and collected >= max_chars:
+                    return
+        finally:
+            raw_pages.close()
+
+    @staticmethod
+    def _rewound(file_path):
+        if hasattr(file_path, "seek"):
+            file_path.seek(0)
+        return file_path
+
+    @staticmethod
+    def _iter_raw_pages(file_path, page_count: int):
+        workers = settings.pdf_extract_workers
+        if workers <= 1 or page_count < settings.pdf_parallel_min_pages:
+            with pdfplumber.open(PDFService._rewound(file_path)) as pdf:
+                for page in pdf.pages:
+                    yield _read_page(page)
+            return
+
+        # Worker processes reopen the PDF by path, so an in-memory PDF is
+        # spilled to a temp file first rather than pickled to every range
+        tmp_path = None
+        if not isinstance(file_path, (str, os.PathLike)):
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                shutil.copyfileobj(PDFService._rewound(file_path), tmp)
+            file_path = tmp_path = tmp.name
+
+        ranges = iter(
+            (start, min(start + PAGE_RANGE_SIZE, page_count))
+            for start in range(0, page_count, PAGE_RANGE_SIZE)
+        )
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            # Keep only a couple of ranges in flight per worker, so an early
+            # stop leaves most of a long book unread
+            pending = deque(
+                executor.submit(_extract_page_range, file_path, *page_range)
+                for page_range in islice(ranges, workers * 2)
+            )
+            while pending:
+                pages = pending.popleft().result()
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(
+                        executor.submit(_extract_page_range, file_path, *next_range)
+                    )
+                yield from pages
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if tmp_path is not None:
+                os.unlink(tmp_path)
+
+    @staticmethod
+    def _clean_page(lines: list, tables: list, header_footer: set) -> str:
+        cleaned_lines = [
+            line
+            for line in lines
+            if line.strip() and line.strip() not in header_footer
+            # Standalone page numbers
+            and not re.fullmatch(r"\s*\d{1,3}\s*", line)
+        ]
+        parts = ["\n".join(cleaned_lines)] if cleaned_lines else []
+        parts.extend(tables)
+        return PDFService._clean_text("\n\n".join(parts))
 
     @staticmethod
     def _clean_text(text: str) -> str:
@@ -92,10 +246,10 @@ class PDFService:
 
         line_counts = {}
         for page_lines in all_lines_per_page:
-            # Check first 2 and last 2 lines of each page
-            candidates = page_lines[:2] + page_lines[-2:]
-            for line in candidates:
-                stripped = line.strip()
+            # Check first 2 and last 2 lines of each page, counting a line
+            # once per page even when a short page has it in both
+            candidates = {line.strip() for line in page_lines[:2] + page_lines[-2:]}
+            for stripped in candidates:
                 if stripped and len(stripped) < 100:  # headers/footers are short
                     line_counts[stripped] = line_counts.get(stripped, 0) + 1
 
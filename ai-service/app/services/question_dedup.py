@@ -0,0 +1,79 @@
+"""
+Near-duplicate filtering for generated questions.
+
+Question texts are turned into TF-IDF vectors with NumPy and compared in one
+cosine-similarity matrix per batch, instead of pairwise word-set overlap in
+Python. IDF weighting means shared filler ("which of the following") counts
+for little while shared topic words count for a lot, so rephrasings of the
+same question are caught too.
+"""
+
+import re
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Question boilerplate that says nothing about the topic
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be by can does do for from how in is it of on or that
+    the this to was what when where which who why will with following best
+    describes true statement passage according text
+    """.split()
+)
+
+
+def _tokens(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def tfidf_matrix(texts: list) -> np.ndarray:
+    """L2-normalised TF-IDF rows, one per text."""
+    token_lists = [_tokens(text) for text in texts]
+
+    vocab = {}
+    rows, cols = [], []
+    for row, tokens in enumerate(token_lists):
+        for token in tokens:
+            rows.append(row)
+            cols.append(vocab.setdefault(token, len(vocab)))
+
+    tf = np.zeros((len(texts), max(len(vocab), 1)), dtype=np.float32)
+    np.add.at(tf, (rows, cols), 1.0)
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+    weights = tf * idf
+
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return weights / norms
+
+
+def dedupe_questions(
+    candidates: list, existing: list = (), threshold: float = 0.7
+) -> list:
+    """
+    Return the candidates, in order, that are not near-duplicates of an
+    ``existing`` question or of an earlier accepted candidate.
+    Similarity is TF-IDF cosine; above ``threshold`` counts as duplicate.
+    """
+    if not candidates:
+        return []
+
+    texts = [q.get("question", "") for q in existing]
+    texts += [q.get("question", "") for q in candidates]
+    vectors = tfidf_matrix(texts)
+    similarity = vectors @ vectors.T
+
+    offset = len(existing)
+    accepted = np.zeros(len(texts), dtype=bool)
+    accepted[:offset] = True
+
+    for idx in range(offset, len(texts)):
+        # Empty texts have zero vectors and never match anything
+        if not accepted.any() or similarity[idx, accepted].max() <= threshold:
+            accepted[idx] = True
+
+    return [q for q, keep in zip(candidates, accepted[offset:]) if keep]
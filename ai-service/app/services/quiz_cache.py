@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when prompts or post-processing change so old entries stop matching
+QUIZ_CACHE_VERSION = 1
+
+
+def quiz_cache_key(text: str, num_questions: int) -> str:
+    """
+    Cache key for a generated quiz: SHA-256 of the source text plus
+    everything that changes the output for the same text.
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (
+        f"quiz:v{QUIZ_CACHE_VERSION}:{settings.quiz_model_name}:"
+        f"{settings.quiz_inference_backend}:{num_questions}:{digest}"
+    )
+
+
+class MemoryQuizCache:
+    """In-process LRU, bounded by entry count."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            quiz = self._entries.get(key)
+            if quiz is not None:
+                self._entries.move_to_end(key)
+            return quiz
+
+    def set(self, key: str, quiz: dict) -> None:
+        with self._lock:
+            self._entries[key] = quiz
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DiskQuizCache:
+    """
+    One JSON file per quiz under ``directory``, shared by all workers on
+    the pod. Hits touch the file, and the least recently used files are
+    evicted once there are more than ``max_entries``.
+    """
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                quiz = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return quiz
+
+    def set(self, key: str, quiz: dict) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(quiz, f)
+        os.replace(tmp_path, path)  # atomic, readers never see partial files
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        entries.sort()
+        for _, path in entries[:overflow]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class RedisQuizCache:
+    """Shared across pods; entries expire after ``ttl`` seconds."""
+
+    def __init__(self, url: str, ttl: int):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key: str) -> dict | None:
+        raw = self.client.get(key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, quiz: dict) -> None:
+        self.client.set(key, json.dumps(quiz), ex=self.ttl)
+
+
+# ---------------------------------------------------------------------------
+# Backend is chosen by settings.quiz_cache_backend and built on first use
+# ---------------------------------------------------------------------------
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _build_cache():
+    backend = settings.quiz_cache_backend
+    if backend == "memory":
+        return MemoryQuizCache(settings.quiz_cache_max_entries)
+    if backend == "disk":
+        return DiskQuizCache(settings.quiz_cache_dir, settings.quiz_cache_max_entries)
+    if backend == "redis":
+        return RedisQuizCache(settings.redis_url, settings.quiz_cache_ttl)
+    return None
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _build_cache() or False
+    return _cache or None
+
+
+class QuizCache:
+    """
+    Lookup/store wrapper used by QuizService. Cache errors are logged and
+    treated as misses so a broken backend never fails a quiz request.
+    """
+
+    @staticmethod
+    def get(text: str, num_questions: int) -> dict | None:
+        cache = _get_cache()
+        if cache is None:
+            return None
+
+        key = quiz_cache_key(text, num_questions)
+        started = time.perf_counter()
+        try:
+            quiz = cache.get(key)
+        except Exception:
+            logger.exception("Quiz cache lookup failed")
+            return None
+
+        if quiz is not None:
+            logger.info(
+                f"Quiz cache hit in {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+        return quiz
+
+    @staticmethod
+    def set(text: str, num_questions: int, quiz: dict) -> None:
+        cache = _get_cache()
+        if cache is None:
+            return
+
+        try:
+            cache.set(quiz_cache_key(text, num_questions), quiz)
+        except Exception:
+            logger.exception("Quiz cache store failed")
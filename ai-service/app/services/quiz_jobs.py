@@ -0,0 +1,304 @@
+"""
+Background quiz jobs.
+
+Callers submit a PDF and get a job id back straight away. The job runs the
+PDF pipeline on a small thread pool (generation itself happens on the model
+worker pool), and the result can be polled or delivered to a callback URL.
+
+Job state lives in Redis (``quiz_job_store="redis"``), so any pod or uvicorn
+worker can answer a poll for a job another one is running. Finished jobs stay
+pollable for ``quiz_job_ttl`` seconds. A job whose runner died stops counting
+against the pending limit after ``quiz_job_deadline`` seconds; the backend
+gives up on it after its own deadline.
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from app.core.config import settings
+from app.services.pdf_quiz_pipeline import generate_quiz_from_pdf
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+CALLBACK_ATTEMPTS = 3
+
+
+class QuizJobQueueFull(Exception):
+    """Too many jobs are already waiting."""
+
+
+class QuizJobStoreUnavailable(Exception):
+    """The job store could not be reached."""
+
+
+class MemoryQuizJobStore:
+    """Per-process store for a single uvicorn worker, e.g. local dev and tests."""
+
+    errors = ()
+
+    def __init__(self, ttl: int, deadline: int):
+        self.ttl = ttl
+        self.deadline = deadline
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def add(self, job: dict) -> None:
+        with self._lock:
+            self._prune()
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> dict:
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields)
+            return dict(job)
+
+    def pending_count(self) -> int:
+        cutoff = time.time() - self.deadline
+        with self._lock:
+            return sum(
+                1
+                for job in self._jobs.values()
+                if job["status"] in (QUEUED, RUNNING) and job["created_at"] > cutoff
+            )
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if (job["finished_at"] and job["finished_at"] < now - self.ttl)
+            or job["created_at"] < now - self.deadline - self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class RedisQuizJobStore:
+    """
+    Shared across pods. Each job is a JSON value; unfinished job ids are
+    also kept in a sorted set scored by creation time for the pending count.
+    Only the runner that picked a job up writes to it, so plain GET/SET is
+    enough.
+    """
+
+    PENDING_KEY = "quiz_jobs:pending"
+
+    def __init__(self, url: str, ttl: int, deadline: int, client=None):
+        import redis
+
+        if client is None:
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.errors = (redis.RedisError,)
+        self.ttl = ttl
+        self.deadline = deadline
+
+    def _key(self, job_id: str) -> str:
+        return f"quiz_job:{job_id}"
+
+    def add(self, job: dict) -> None:
+        pipe = self.client.pipeline()
+        # Expires on its own even if the runner dies before finishing it
+        pipe.set(self._key(job["job_id"]), json.dumps(job), ex=self.deadline + self.ttl)
+        pipe.zadd(self.PENDING_KEY, {job["job_id"]: job["created_at"]})
+        pipe.execute()
+
+    def get(self, job_id: str) -> dict | None:
+        raw = self.client.get(self._key(job_id))
+        return json.loads(raw) if raw else None
+
+    def update(self, job_id: str, **fields) -> dict:
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        job.update(fields)
+
+        pipe = self.client.pipeline()
+        if job["status"] in (COMPLETED, FAILED):
+            pipe.set(self._key(job_id), json.dumps(job), ex=self.ttl)
+            pipe.zrem(self.PENDING_KEY, job_id)
+        else:
+            pipe.set(self._key(job_id), json.dumps(job), keepttl=True)
+        pipe.execute()
+        return job
+
+    def pending_count(self) -> int:
+        cutoff = time.time() - self.deadline
+        pipe = self.client.pipeline()
+        pipe.zremrangebyscore(self.PENDING_KEY, "-inf", cutoff)
+        pipe.zcard(self.PENDING_KEY)
+        return pipe.execute()[1]
+
+
+# ---------------------------------------------------------------------------
+# Store is chosen by settings.quiz_job_store and built on first use
+# ---------------------------------------------------------------------------
+_store = None
+_store_lock = threading.Lock()
+
+
+def _build_store():
+    if settings.quiz_job_store == "memory":
+        return MemoryQuizJobStore(settings.quiz_job_ttl, settings.quiz_job_deadline)
+    return RedisQuizJobStore(
+        settings.redis_url, settings.quiz_job_ttl, settings.quiz_job_deadline
+    )
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build_store()
+    return _store
+
+
+_runner = ThreadPoolExecutor(
+    max_workers=settings.quiz_job_runners, thread_name_prefix="quiz-job"
+)
+# Callbacks get their own threads so a slow backend never holds up generation
+_callbacks = ThreadPoolExecutor(max_workers=2, thread_name_prefix="quiz-callback")
+
+
+class QuizJobService:
+    @staticmethod
+    def submit(
+        *,
+        pdf_key: str,
+        num_questions: int,
+        tenant_id,
+        callback_url: str | None = None,
+        metadata: dict | None = None,
+    ) -> dict:
+        if callback_url and not callback_url.startswith(
+            settings.quiz_callback_allowed_prefix
+        ):
+            raise ValueError("callback_url is not an allowed internal endpoint.")
+
+        store = _get_store()
+        try:
+            pending = store.pending_count()
+        except store.errors as e:
+            logger.error(f"Quiz job store unavailable: {e}")
+            raise QuizJobStoreUnavailable("Quiz jobs are unavailable right now.") from e
+        if pending >= settings.quiz_job_max_pending:
+            raise QuizJobQueueFull("Too many quiz jobs queued, try again shortly.")
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": QUEUED,
+            "tenant_id": tenant_id,
+            "pdf_key": pdf_key,
+            "num_questions": num_questions,
+            "callback_url": callback_url,
+            "metadata": metadata or {},
+            "questions": None,
+            "error": None,
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+        try:
+            store.add(job)
+        except store.errors as e:
+            logger.error(f"Quiz job store unavailable: {e}")
+            raise QuizJobStoreUnavailable("Quiz jobs are unavailable right now.") from e
+        _runner.submit(QuizJobService._run, job["job_id"])
+        return job
+
+    @staticmethod
+    def get(job_id: str) -> dict | None:
+        store = _get_store()
+        try:
+            return store.get(job_id)
+        except store.errors as e:
+            logger.error(f"Quiz job store unavailable: {e}")
+            raise QuizJobStoreUnavailable("Quiz jobs are unavailable right now.") from e
+
+    @staticmethod
+    def _run(job_id: str) -> None:
+        store = _get_store()
+        job = store.update(job_id, status=RUNNING)
+
+        try:
+            result = generate_quiz_from_pdf(
+                job["pdf_key"],
+                job["num_questions"],
+                # Jobs are already queued; wait for a model worker, don't 503
+                max_wait=settings.model_pool_timeout,
+            )
+            questions = result.get("questions", [])
+            if not questions:
+                raise ValueError("No questions could be generated from the PDF.")
+            job = store.update(
+                job_id,
+                status=COMPLETED,
+                questions=questions,
+                finished_at=time.time(),
+            )
+        except Exception as e:
+            logger.exception(f"Quiz job {job_id} failed")
+            job = store.update(
+                job_id, status=FAILED, error=str(e), finished_at=time.time()
+            )
+
+        if job["callback_url"]:
+            _callbacks.submit(QuizJobService._send_callback, job)
+
+    @staticmethod
+    def _send_callback(job: dict, attempt: int = 1) -> None:
+        """
+        POST the result to the job's callback URL. Failed attempts are
+        rescheduled on a timer rather than slept on, and after the last one
+        the backend poller picks the result up from GET /quiz/jobs/{id}.
+        """
+        payload = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "questions": job["questions"],
+            "error": job["error"],
+            "metadata": job["metadata"],
+        }
+        headers = {"X-Service-Token": settings.internal_service_token or ""}
+
+        try:
+            response = requests.post(
+                job["callback_url"], json=payload, headers=headers, timeout=10
+            )
+            if response.status_code < 500:
+                if response.status_code >= 400:
+                    logger.error(
+                        f"Quiz job {job['job_id']} callback rejected: "
+                        f"{response.status_code}"
+                    )
+                return
+        except requests.RequestException as e:
+            logger.warning(f"Quiz job {job['job_id']} callback failed: {e}")
+
+        if attempt >= CALLBACK_ATTEMPTS:
+            logger.error(f"Giving up on callback for quiz job {job['job_id']}")
+            return
+
+        timer = threading.Timer(
+            2**attempt,
+            _callbacks.submit,
+            args=(QuizJobService._send_callback, job, attempt + 1),
+        )
+        timer.daemon = True
+        timer.start()
@@ -3,37 +3,61 @@ import logging
 import random
 import re
 import textwrap
+import threading
 
-import spacy
-
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    from spacy.cli import download
-
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+from app.core.config import settings
+from app.services.question_dedup import dedupe_questions
+from app.services.quiz_cache import QuizCache
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# Lazy-load the Flan-T5 model so startup stays fast when not generating quizzes
+# Lazy-load spaCy and the Flan-T5 model so startup stays fast when not
+# generating quizzes. The locks stop a background warm-up and a request
+# from loading the same model twice.
 # ---------------------------------------------------------------------------
+_nlp = None
+_nlp_lock = threading.Lock()
 _pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                logger.info("Loading spaCy en_core_web_sm … (first call only)")
+                import spacy
+
+                try:
+                    _nlp = spacy.load("en_core_web_sm")
+                except OSError:
+                    from spacy.cli import download
+
+                    download("en_core_web_sm")
+                    _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
 
 def _get_pipeline():
     global _pipeline
     if _pipeline is None:
-        logger.info("Loading Flan-T5-base model … (first call only)")
-        from transformers import pipeline as hf_pipeline
+        with _pipeline_lock:
+            if _pipeline is None:
+                backend = settings.quiz_inference_backend
+                logger.info(
+                    f"Loading {settings.quiz_model_name} ({backend}) "
+                    "… (first call only)"
+                )
+                from app.integrations.llm.flan_t5 import load_pipeline
 
-        _pipeline = hf_pipeline(
-            "text2text-generation",
-            model="google/flan-t5-base",
-            device=-1,  # CPU
-        )
-        logger.info("Flan-T5-base model loaded successfully.")
+                _pipeline = load_pipeline(
+                    settings.quiz_model_name, backend, settings.quiz_onnx_dir
+                )
+                logger.info(
+                    f"{settings.quiz_model_name} ({backend}) loaded successfully."
+                )
     return _pipeline
 
 
@@ -48,20 +72,48 @@ class QuizService:
         Generate conceptual MCQs from the given text using Flan-T5.
         Uses multi-section chunking for better coverage.
         Falls back to spaCy-based generation if Flan-T5 fails.
+        Flan-T5 results are cached by text hash, question count and model.
+        """
+        return {"questions": list(QuizService.iter_quiz(text, num_questions))}
+
+    @staticmethod
+    def iter_quiz(text: str, num_questions: int = 5, run_prompts=None, run_spacy=None):
+        """
+        Yield questions one by one as soon as each prompt batch has been
+        parsed and deduplicated, so callers can stream them.
+
+        ``run_prompts(prompts) -> outputs`` and ``run_spacy(text, n) -> list``
+        run the model work; they default to this process and are swapped for
+        model-pool calls by app.services.model_pool.
         """
+        run_prompts = run_prompts or QuizService._run_prompts
+        run_spacy = run_spacy or QuizService._generate_with_spacy
+
+        cached = QuizCache.get(text, num_questions)
+        if cached is not None:
+            yield from cached["questions"]
+            return
+
         # Split text into meaningful chunks for diverse questions
         chunks = QuizService._split_into_chunks(text, max_chars=2500)
 
+        questions = []
         try:
-            questions = QuizService._generate_with_flan_t5(chunks, num_questions)
-            if questions and len(questions) >= 1:
-                return {"questions": questions[:num_questions]}
+            for question in QuizService._iter_flan_t5(
+                chunks, num_questions, run_prompts
+            ):
+                questions.append(question)
+                yield question
         except Exception as e:
             logger.warning(f"Flan-T5 generation failed, falling back to spaCy: {e}")
+        else:
+            if questions:
+                QuizCache.set(text, num_questions, {"questions": questions})
+                return
 
-        # Fallback: spaCy-based extraction
-        questions = QuizService._generate_with_spacy(text, num_questions)
-        return {"questions": questions}
+        # Fallback: spaCy-based extraction for whatever is still missing
+        # (not cached, so the next call gets another chance at Flan-T5)
+        yield from run_spacy(text, num_questions)[: num_questions - len(questions)]
 
     # ------------------------------------------------------------------
     # Text chunking — extract questions from different sections
@@ -101,43 +153,100 @@ class QuizService:
     # Flan-T5 generation — multi-section
     # ------------------------------------------------------------------
     @staticmethod
-    def _generate_with_flan_t5(chunks: list, num_questions: int) -> list:
-        pipe = _get_pipeline()
-        all_questions = []
+    def _generate_with_flan_t5(
+        chunks: list, num_questions: int, batch_size: int | None = None
+    ) -> list:
+        return list(
+            QuizService._iter_flan_t5(
+                chunks, num_questions, QuizService._run_prompts, batch_size
+            )
+        )
+
+    @staticmethod
+    def _iter_flan_t5(
+        chunks: list, num_questions: int, run_prompts, batch_size: int | None = None
+    ):
+        prompts = QuizService._build_prompts(chunks, num_questions)
+        accepted = []
+
+        for batch in QuizService._prompt_batches(
+            prompts, batch_size or settings.quiz_batch_size
+        ):
+            parsed = [
+                QuizService._parse_question_json(raw) for raw in run_prompts(batch)
+            ]
+
+            # Deduplicate the batch at once — drop questions too similar to
+            # an earlier one, including those from previous batches
+            for question in dedupe_questions(
+                [q for q in parsed if q],
+                existing=accepted,
+                threshold=settings.quiz_dedup_threshold,
+            ):
+                if len(accepted) >= num_questions:
+                    return
+                accepted.append(question)
+                yield question
+
+    @staticmethod
+    def _build_prompts(chunks: list, num_questions: int) -> list:
+        """One prompt per requested question, spread across the chunks."""
+        prompts = []
 
         # Distribute questions across chunks
         questions_per_chunk = max(1, num_questions // len(chunks))
         remainder = num_questions % len(chunks)
 
         for chunk_idx, chunk in enumerate(chunks):
-            if len(all_questions) >= num_questions:
+            if len(prompts) >= num_questions:
                 break
 
             q_count = questions_per_chunk + (1 if chunk_idx < remainder else 0)
 
             for i in range(q_count):
-                if len(all_questions) >= num_questions:
+                if len(prompts) >= num_questions:
                     break
 
                 # Vary the prompt style for diversity
-                prompt = QuizService._build_prompt(chunk, i, len(all_questions))
-
-                result = pipe(
-                    prompt,
-                    max_new_tokens=300,
-                    do_sample=True,
-                    temperature=0.7,
-                    top_p=0.9,
-                )
+                prompts.append(QuizService._build_prompt(chunk, i, len(prompts)))
 
-                raw = result[0]["generated_text"].strip()
-                parsed = QuizService._parse_question_json(raw)
-                if parsed:
-                    # Deduplicate — skip if question is too similar
-                    if not QuizService._is_duplicate(parsed, all_questions):
-                        all_questions.append(parsed)
+        return prompts
 
-        return all_questions
+    @staticmethod
+    def _prompt_batches(prompts: list, batch_size: int) -> list:
+        """
+        Split prompts into batches of ``batch_size``. Prompts are sorted by
+        length first so each batch holds similarly sized inputs and little
+        compute is spent on padding tokens.
+        """
+        ordered = sorted(prompts, key=len)
+        return [
+            ordered[start : start + batch_size]
+            for start in range(0, len(ordered), batch_size)
+        ]
+
+    @staticmethod
+    def _run_prompts(prompts: list) -> list:
+        """Run one batch through the pipeline; raw outputs in prompt order."""
+        if not prompts:
+            return []
+
+        results = _get_pipeline()(
+            prompts,
+            batch_size=len(prompts),
+            max_new_tokens=300,
+            do_sample=True,
+            temperature=0.7,
+            top_p=0.9,
+        )
+
+        outputs = []
+        for result in results:
+            # List input yields one dict per prompt (a list when unwrapped)
+            if isinstance(result, list):
+                result = result[0]
+            outputs.append(result["generated_text"].strip())
+        return outputs
 
     @staticmethod
     def _build_prompt(text: str, question_idx: int, total_so_far: int) -> str:
@@ -185,24 +294,6 @@ class QuizService:
 
         return prompts[(total_so_far + question_idx) % len(prompts)]
 
-    @staticmethod
-    def _is_duplicate(new_q: dict, existing: list, threshold: float = 0.6) -> bool:
-        """Check if a question is too similar to existing ones."""
-        new_text = new_q.get("question", "").lower()
-        for eq in existing:
-            existing_text = eq.get("question", "").lower()
-            # Simple word overlap check
-            new_words = set(new_text.split())
-            existing_words = set(existing_text.split())
-            if not new_words or not existing_words:
-                continue
-            overlap = len(new_words & existing_words) / max(
-                len(new_words), len(existing_words)
-            )
-            if overlap > threshold:
-                return True
-        return False
-
     # ------------------------------------------------------------------
     # JSON parsing helpers
     # ------------------------------------------------------------------
@@ -266,36 +357,20 @@ class QuizService:
     # ------------------------------------------------------------------
     @staticmethod
     def _generate_with_spacy(text: str, num_questions: int) -> list:
-        doc = nlp(text[:50000])  # spaCy can handle more text
-
-        # Extract meaningful noun chunks and sentences
-        sentences = [
-            sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 30
-        ]
-        concepts = list(
-            set(
-                [
-                    chunk.text.strip()
-                    for chunk in doc.noun_chunks
-                    if len(chunk.text.strip()) > 3
-                ]
-            )
+        sentences, sentence_concepts, concepts = QuizService._analyze_with_spacy(
+            text[:50000]
         )
 
         questions = []
         used_concepts = set()
 
-        for sent in sentences[: num_questions * 2]:
+        for sent_idx, sent in enumerate(sentences[: num_questions * 2]):
             if len(questions) >= num_questions:
                 break
 
             # Find a concept in this sentence
-            sent_doc = nlp(sent)
             sent_concepts = [
-                chunk.text.strip()
-                for chunk in sent_doc.noun_chunks
-                if chunk.text.strip() in concepts
-                and chunk.text.strip() not in used_concepts
+                c for c in sentence_concepts.get(sent_idx, []) if c not in used_concepts
             ]
 
             if not sent_concepts:
@@ -309,29 +384,8 @@ class QuizService:
             if not question_text.endswith("?"):
                 question_text = f"What completes this statement? {question_text}"
 
-            # Generate distractors from other concepts
-            distractors = [c for c in concepts if c != target]
-            random.shuffle(distractors)
-            distractors = distractors[:3]
-
-            while len(distractors) < 3:
-                distractors.append("None of the above")
-
-            options = [target] + distractors[:3]
-            random.shuffle(options)
-
-            # Label with A/B/C/D
-            labeled_options = [f"{chr(65 + j)}) {opt}" for j, opt in enumerate(options)]
-            correct_label = next(
-                lbl for lbl, opt in zip(labeled_options, options) if opt == target
-            )
-
             questions.append(
-                {
-                    "question": question_text,
-                    "options": labeled_options,
-                    "correct_answer": correct_label,
-                }
+                QuizService._spacy_question(question_text, target, concepts)
             )
 
         # If we still don't have enough, add concept-based questions
@@ -342,26 +396,82 @@ class QuizService:
                 continue
 
             used_concepts.add(concept)
-
-            distractors = [c for c in concepts if c != concept]
-            random.shuffle(distractors)
-            distractors = distractors[:3]
-            while len(distractors) < 3:
-                distractors.append("None of the above")
-
-            options = [concept] + distractors[:3]
-            random.shuffle(options)
-            labeled_options = [f"{chr(65 + j)}) {opt}" for j, opt in enumerate(options)]
-            correct_label = next(
-                lbl for lbl, opt in zip(labeled_options, options) if opt == concept
-            )
-
             questions.append(
-                {
-                    "question": "Which of the following is discussed in the text?",
-                    "options": labeled_options,
-                    "correct_answer": correct_label,
-                }
+                QuizService._spacy_question(
+                    "Which of the following is discussed in the text?",
+                    concept,
+                    concepts,
+                )
             )
 
         return questions[:num_questions]
+
+    @staticmethod
+    def _analyze_with_spacy(text: str) -> tuple:
+        """
+        One nlp.pipe pass over the text's paragraphs, with NER and the
+        lemmatizer disabled (only the parser's sentences and noun chunks
+        are used).
+
+        Returns (sentences, sentence_concepts, concepts):
+        - sentences: sentence texts longer than 30 characters
+        - sentence_concepts: sentence index -> noun chunks inside it,
+          matched by token offsets rather than re-parsing the sentence
+        - concepts: unique noun chunks, in order of first appearance
+        """
+        paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+        nlp = _get_nlp()
+        disabled = [name for name in ("ner", "lemmatizer") if name in nlp.pipe_names]
+
+        sentences = []
+        sentence_concepts = {}
+        concepts = {}  # dict as an ordered set
+
+        for doc in nlp.pipe(paragraphs, disable=disabled, batch_size=32):
+            doc_sents = []
+            for sent in doc.sents:
+                sent_text = sent.text.strip()
+                if len(sent_text) > 30:
+                    doc_sents.append((sent.start, sent.end, len(sentences)))
+                    sentences.append(sent_text)
+
+            # Noun chunks and sentences are both in token order, so one
+            # forward walk assigns every chunk to its sentence
+            pos = 0
+            for chunk in doc.noun_chunks:
+                chunk_text = chunk.text.strip()
+                if len(chunk_text) <= 3:
+                    continue
+                concepts[chunk_text] = None
+
+                while pos < len(doc_sents) and doc_sents[pos][1] <= chunk.start:
+                    pos += 1
+                if pos < len(doc_sents) and doc_sents[pos][0] <= chunk.start:
+                    sentence_concepts.setdefault(doc_sents[pos][2], []).append(
+                        chunk_text
+                    )
+
+        return sentences, sentence_concepts, list(concepts)
+
+    @staticmethod
+    def _spacy_question(question_text: str, answer: str, concepts: list) -> dict:
+        # Generate distractors from other concepts
+        distractors = [
+            c for c in random.sample(concepts, min(4, len(concepts))) if c != answer
+        ][:3]
+
+        while len(distractors) < 3:
+            distractors.append("None of the above")
+
+        options = [answer] + distractors
+        random.shuffle(options)
+
+        # Label with A/B/C/D
+        labeled_options = [f"{chr(65 + j)}) {opt}" for j, opt in enumerate(options)]
+        correct_label = labeled_options[options.index(answer)]
+
+        return {
+            "question": question_text,
+            "options": labeled_options,
+            "correct_answer": correct_label,
+        }
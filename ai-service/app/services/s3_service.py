@@ -1,23 +1,95 @@
+import io
 import os
 import tempfile
+import threading
+from contextlib import contextmanager
 
 import boto3
 from app.core.config import settings
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# boto3 clients are thread-safe; one per process keeps its connection pool
+# warm instead of paying client construction and TLS setup per request
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client(
+                    "s3",
+                    aws_access_key_id=settings.aws_access_key_id or None,
+                    aws_secret_access_key=settings.aws_secret_access_key or None,
+                    region_name=settings.aws_region,
+                    # MinIO / moto server / LocalStack in dev and tests
+                    endpoint_url=settings.aws_s3_endpoint_url or None,
+                    config=Config(
+                        max_pool_connections=settings.s3_max_pool_connections,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                    ),
+                )
+    return _client
+
 
 class S3Service:
-    """Download files from AWS S3 to a local temp path."""
+    """Read files from AWS S3 (or an S3-compatible endpoint)."""
 
     def __init__(self):
-        self.client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region,
-        )
+        self.client = _get_client()
         self.bucket = settings.aws_storage_bucket_name
 
+    @contextmanager
+    def open_object(self, s3_key: str, size: int | None = None):
+        """
+        Yield the object as something pdfplumber can open: an in-memory
+        BytesIO for objects up to S3_MEMORY_MAX_BYTES, otherwise a temp file
+        path that is removed afterwards.
+
+        ``size`` comes from an earlier head_object call; it is fetched when
+        omitted. Objects over S3_MAX_OBJECT_BYTES raise ValueError before
+        any download starts.
+        """
+        if size is None:
+            size = self.head_object(s3_key)["size"]
+
+        if size > settings.s3_max_object_bytes:
+            raise ValueError(
+                f"'{s3_key}' is {size // (1024 * 1024)} MB, over the "
+                f"{settings.s3_max_object_bytes // (1024 * 1024)} MB limit."
+            )
+
+        if size <= settings.s3_memory_max_bytes:
+            yield self._read_into_memory(s3_key)
+            return
+
+        tmp_path = self.download_file(s3_key)
+        try:
+            yield tmp_path
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _read_into_memory(self, s3_key: str) -> io.BytesIO:
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=s3_key)["Body"]
+        except ClientError as e:
+            raise RuntimeError(f"Failed to download '{s3_key}' from S3: {e}") from e
+
+        buffer = io.BytesIO()
+        # HEAD said it fits, but the object may have been replaced since
+        for chunk in body.iter_chunks(chunk_size=1024 * 1024):
+            if buffer.tell() + len(chunk) > settings.s3_memory_max_bytes:
+                body.close()
+                raise RuntimeError(f"'{s3_key}' grew while it was being read.")
+            buffer.write(chunk)
+
+        buffer.seek(0)
+        return buffer
+
     def download_file(self, s3_key: str) -> str:
         """
         Download a file from S3 and return the local temp file path.
@@ -35,3 +107,33 @@ class S3Service:
             raise RuntimeError(f"Failed to download '{s3_key}' from S3: {e}") from e
 
         return tmp_path
+
+    def head_object(self, s3_key: str) -> dict:
+        """Return {"etag", "size"} for an object without downloading it."""
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=s3_key)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to stat '{s3_key}' in S3: {e}") from e
+
+        return {
+            "etag": response["ETag"].strip('"'),
+            "size": response["ContentLength"],
+        }
+
+    def get_bytes(self, s3_key: str) -> bytes | None:
+        """Small object body, or None if it does not exist."""
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=s3_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise RuntimeError(f"Failed to read '{s3_key}' from S3: {e}") from e
+        return response["Body"].read()
+
+    def put_bytes(self, s3_key: str, data: bytes, content_type: str) -> None:
+        try:
+            self.client.put_object(
+                Bucket=self.bucket, Key=s3_key, Body=data, ContentType=content_type
+            )
+        except ClientError as e:
+            raise RuntimeError(f"Failed to write '{s3_key}' to S3: {e}") from e
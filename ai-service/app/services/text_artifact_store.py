@@ -0,0 +1,147 @@
+"""
+Extracted PDF text, cached per S3 object version.
+
+Artifacts are gzipped JSON ({"text", "page_offsets", "headers", "complete"})
+keyed by bucket/key/ETag, so a re-uploaded PDF gets a fresh entry and
+regenerations skip both the download and the pdfplumber parse. They live in
+a local directory with size-bounded LRU eviction and, optionally, in an S3
+sidecar prefix so other pods can reuse them.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when PDF cleaning changes so old artifacts stop matching
+ARTIFACT_VERSION = 1
+
+
+def artifact_key(bucket: str, s3_key: str, etag: str) -> str:
+    raw = f"v{ARTIFACT_VERSION}:{bucket}/{s3_key}@{etag}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DiskArtifactCache:
+    """
+    One .json.gz file per artifact. Reads touch the file; writes evict the
+    least recently used files until the directory fits in ``max_bytes``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json.gz")
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json.gz"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+
+_disk = None
+
+
+def _get_disk():
+    global _disk
+    if _disk is None:
+        _disk = DiskArtifactCache(
+            settings.text_artifact_dir, settings.text_artifact_max_bytes
+        )
+    return _disk
+
+
+def _encode(artifact: dict) -> bytes:
+    return gzip.compress(
+        json.dumps(artifact, separators=(",", ":")).encode("utf-8"), compresslevel=6
+    )
+
+
+def _decode(data: bytes) -> dict:
+    return json.loads(gzip.decompress(data))
+
+
+class TextArtifactStore:
+    """Lookups never raise: a broken cache only costs a re-extraction."""
+
+    @staticmethod
+    def get(s3, s3_key: str, etag: str) -> dict | None:
+        key = artifact_key(s3.bucket, s3_key, etag)
+
+        try:
+            data = _get_disk().get(key)
+            if data is None and settings.text_artifact_s3_sidecar:
+                data = s3.get_bytes(TextArtifactStore._sidecar_key(key))
+                if data is not None:
+                    _get_disk().set(key, data)
+            return _decode(data) if data is not None else None
+        except Exception:
+            logger.exception(f"Text artifact lookup failed for {s3_key}")
+            return None
+
+    @staticmethod
+    def set(s3, s3_key: str, etag: str, artifact: dict) -> None:
+        key = artifact_key(s3.bucket, s3_key, etag)
+
+        try:
+            data = _encode(artifact)
+            _get_disk().set(key, data)
+            if settings.text_artifact_s3_sidecar:
+                s3.put_bytes(
+                    TextArtifactStore._sidecar_key(key), data, "application/gzip"
+                )
+        except Exception:
+            logger.exception(f"Text artifact store failed for {s3_key}")
+
+    @staticmethod
+    def _sidecar_key(key: str) -> str:
+        return f"{settings.text_artifact_s3_prefix}{key}.json.gz"
@@ -0,0 +1,65 @@
+"""
+Background model warm-up.
+
+Models load lazily, so /health answers as soon as uvicorn is up. When
+WARM_UP_ON_STARTUP is set (or POST /health/warmup is called) a background
+thread loads them ahead of the first quiz request: the worker pool's models
+when the pool is enabled, otherwise spaCy and Flan-T5 in this process.
+/health/ready reports the progress for readiness probes.
+"""
+
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.services.model_pool import warm_up_model_pool
+
+logger = logging.getLogger(__name__)
+
+COLD = "cold"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+_state = {"status": COLD, "seconds": None, "error": None}
+_lock = threading.Lock()
+
+
+def start_warm_up() -> bool:
+    """Start warming in the background. False if already warming or done."""
+    with _lock:
+        if _state["status"] in (WARMING, READY):
+            return False
+        _state.update(status=WARMING, seconds=None, error=None)
+
+    threading.Thread(target=_warm_up, name="model-warm-up", daemon=True).start()
+    return True
+
+
+def warm_up_status() -> dict:
+    with _lock:
+        return dict(_state)
+
+
+def _warm_up():
+    from app.services.quiz_service import _get_nlp, _get_pipeline
+
+    started = time.perf_counter()
+    try:
+        pool_ready = warm_up_model_pool(timeout=settings.model_pool_timeout)
+        if pool_ready is None:
+            _get_nlp()
+            _get_pipeline()
+        elif not pool_ready:
+            raise RuntimeError("Model workers did not finish loading.")
+    except Exception as e:
+        logger.exception("Model warm-up failed; models will load on first use")
+        with _lock:
+            _state.update(status=FAILED, error=str(e))
+        return
+
+    seconds = round(time.perf_counter() - started, 2)
+    logger.info(f"Models warmed up in {seconds}s")
+    with _lock:
+        _state.update(status=READY, seconds=seconds)
@@ -0,0 +1,67 @@
+"""
+Measure Flan-T5 quiz generation throughput at several batch sizes.
+
+Usage (from ai-service/):
+    python -m scripts.benchmark_batching --text-file lecture.txt
+    python -m scripts.benchmark_batching --batch-sizes 1,4,8 --num-questions 16
+"""
+
+import argparse
+import time
+
+from app.services.quiz_service import QuizService, _get_pipeline
+
+SAMPLE_PARAGRAPH = (
+    "Photosynthesis converts light energy into chemical energy stored in "
+    "glucose. The light-dependent reactions take place in the thylakoid "
+    "membranes, where water is split and oxygen is released, while the "
+    "Calvin cycle in the stroma fixes carbon dioxide using ATP and NADPH."
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--text-file", help="Plain-text source; sample text if omitted")
+    parser.add_argument("--batch-sizes", default="1,2,4,8")
+    parser.add_argument("--num-questions", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.text_file:
+        with open(args.text_file, encoding="utf-8") as f:
+            text = f.read()
+    else:
+        text = "\n\n".join([SAMPLE_PARAGRAPH] * 40)
+
+    chunks = QuizService._split_into_chunks(text, max_chars=2500)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    print("Loading model …")
+    _get_pipeline()
+    # Warm-up so one-off allocation cost does not land on the first size
+    QuizService._generate_with_flan_t5(chunks, 1, batch_size=1)
+
+    print(f"{len(chunks)} chunks, {args.num_questions} prompts per run")
+    print(f"{'batch':>5}  {'seconds':>8}  {'questions':>9}  {'q/sec':>6}")
+
+    for batch_size in batch_sizes:
+        elapsed = 0.0
+        produced = 0
+        for _ in range(args.repeats):
+            started = time.perf_counter()
+            questions = QuizService._generate_with_flan_t5(
+                chunks, args.num_questions, batch_size=batch_size
+            )
+            elapsed += time.perf_counter() - started
+            produced += len(questions)
+
+        per_run = elapsed / args.repeats
+        rate = produced / elapsed if elapsed else 0.0
+        print(
+            f"{batch_size:>5}  {per_run:>8.2f}  {produced / args.repeats:>9.1f}  "
+            f"{rate:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Measure AI service startup: time to first /health, time until models are
+warm (/health/ready), and time to the first generated quiz.
+
+Starts uvicorn as a subprocess with the current environment (.env is read
+as usual), so run it from ai-service/:
+    python -m scripts.benchmark_startup
+    python -m scripts.benchmark_startup --no-warm-up --workers 0
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+from app.core.config import settings
+from jose import jwt
+
+SAMPLE_TEXT = "\n\n".join(
+    [
+        "Photosynthesis converts light energy into chemical energy stored in "
+        "glucose. The light-dependent reactions take place in the thylakoid "
+        "membranes, where water is split and oxygen is released, while the "
+        "Calvin cycle in the stroma fixes carbon dioxide using ATP and NADPH."
+    ]
+    * 4
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, started: float, timeout: float, ok=(200,)) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            if requests.get(url, timeout=1).status_code in ok:
+                return time.perf_counter() - started
+        except requests.RequestException:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def _instructor_token() -> str:
+    payload = {
+        "user_id": 0,
+        "role": "INSTRUCTOR",
+        "tenant_id": 0,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+    }
+    return jwt.encode(payload, settings.jwt_secret_key, settings.jwt_algorithm)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--warm-up", action=argparse.BooleanOptionalAction, default=True
+    )
+    parser.add_argument("--workers", type=int, default=settings.model_pool_workers)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}/api/v1"
+    env = {
+        **os.environ,
+        "WARM_UP_ON_STARTUP": str(args.warm_up).lower(),
+        "MODEL_POOL_WORKERS": str(args.workers),
+        # Measure generation, not the cache
+        "QUIZ_CACHE_BACKEND": "none",
+    }
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        env=env,
+    )
+    try:
+        first_health = _wait_for(f"{base}/health", started, args.timeout)
+        ready = _wait_for(f"{base}/health/ready", started, args.timeout)
+
+        response = requests.post(
+            f"{base}/quiz/generate",
+            json={"lesson_text": SAMPLE_TEXT, "num_questions": 3},
+            headers={"Authorization": f"Bearer {_instructor_token()}"},
+            timeout=args.timeout,
+        )
+        first_quiz = time.perf_counter() - started
+        response.raise_for_status()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print(f"warm-up on startup: {args.warm_up}, model workers: {args.workers}")
+    print(f"time to first /health : {first_health:7.2f}s")
+    print(f"time to /health/ready : {ready:7.2f}s")
+    print(f"time to first quiz    : {first_quiz:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
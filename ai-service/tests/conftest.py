@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+# Settings() requires these; tests never talk to real services
+os.environ.setdefault("SERVICE_NAME", "ai-service-test")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("SERVICE_PORT", "8002")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("QUIZ_CACHE_BACKEND", "none")
+os.environ.setdefault("QUIZ_JOB_STORE", "memory")
+
+
+BUCKET = "eduflow-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """S3Service against moto's in-process S3, with a fresh pooled client."""
+    moto = pytest.importorskip("moto")
+    from app.core.config import settings
+    from app.services import s3_service
+    from app.services.s3_service import S3Service
+
+    monkeypatch.setattr(settings, "aws_storage_bucket_name", BUCKET)
+    monkeypatch.setattr(settings, "aws_region", "us-east-1")
+    monkeypatch.setattr(settings, "s3_memory_max_bytes", 1024)
+    monkeypatch.setattr(settings, "s3_max_object_bytes", 4096)
+    monkeypatch.setattr(s3_service, "_client", None)
+
+    with moto.mock_aws():
+        service = S3Service()
+        service.client.create_bucket(Bucket=BUCKET)
+        yield service
+
+    monkeypatch.setattr(s3_service, "_client", None)
@@ -0,0 +1,74 @@
+"""
+Parity check for the Flan-T5 inference backends.
+
+The parity tests load the real model, so they are skipped when transformers
+(or optimum for the onnx backend) is not installed. Run with:
+    python -m pytest tests/test_inference_backends.py
+"""
+
+import os
+
+import pytest
+from app.core.config import settings
+from app.integrations.llm.flan_t5 import load_pipeline, onnx_export_dir
+from app.services.quiz_service import QuizService
+
+PASSAGE = (
+    "Photosynthesis converts light energy into chemical energy stored in "
+    "glucose. The light-dependent reactions take place in the thylakoid "
+    "membranes, where water is split and oxygen is released, while the "
+    "Calvin cycle in the stroma fixes carbon dioxide using ATP and NADPH."
+)
+
+
+def _generate(pipe, num_questions=3):
+    prompts = [QuizService._build_prompt(PASSAGE, i, 0) for i in range(num_questions)]
+    # Greedy decoding so backends are compared on the same footing
+    results = pipe(prompts, batch_size=num_questions, max_new_tokens=300)
+    outputs = []
+    for result in results:
+        if isinstance(result, list):
+            result = result[0]
+        outputs.append(result["generated_text"].strip())
+    return outputs
+
+
+@pytest.fixture(scope="module")
+def reference_outputs():
+    pytest.importorskip("transformers")
+    pytest.importorskip("spacy")
+    return _generate(load_pipeline(settings.quiz_model_name, "torch"))
+
+
+@pytest.mark.parametrize("backend", ["quantized", "onnx"])
+def test_backend_produces_valid_questions(backend, reference_outputs, tmp_path):
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+
+    pipe = load_pipeline(settings.quiz_model_name, backend, str(tmp_path / "onnx"))
+    outputs = _generate(pipe)
+
+    parsed = [QuizService._parse_question_json(raw) for raw in outputs]
+    expected = [QuizService._parse_question_json(raw) for raw in reference_outputs]
+
+    # Every prompt the fp32 model answers with a usable question must also
+    # yield a valid question on the faster backend
+    for question, reference in zip(parsed, expected):
+        if reference is not None:
+            assert question is not None
+            assert QuizService._validate_question(question)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_pipeline(settings.quiz_model_name, "tensorrt")
+
+
+def test_onnx_export_dir_is_keyed_by_model():
+    assert onnx_export_dir("", "google/flan-t5-base") == ""
+    assert onnx_export_dir("/models/onnx", "google/flan-t5-base") == os.path.join(
+        "/models/onnx", "google--flan-t5-base"
+    )
+    assert onnx_export_dir("/models/onnx", "google/flan-t5-base") != onnx_export_dir(
+        "/models/onnx", "google/flan-t5-large"
+    )
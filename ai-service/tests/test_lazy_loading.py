@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+# A fresh interpreter, so modules imported by earlier tests can't hide an
+# eager import
+CHECK = """
+import sys
+
+import app.services.quiz_service as quiz_service
+
+assert quiz_service._nlp is None
+assert quiz_service._pipeline is None
+for heavy in ("spacy", "transformers", "torch"):
+    assert heavy not in sys.modules, f"{heavy} was imported"
+"""
+
+
+def test_importing_quiz_service_loads_no_models():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
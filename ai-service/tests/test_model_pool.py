@@ -0,0 +1,75 @@
+import time
+
+import pytest
+from app.services.model_pool import ModelPool, ModelPoolBusy
+
+
+def _ready_init(num_threads, ready):
+    ready.release()
+
+
+def _slow_init(num_threads, ready):
+    time.sleep(30)
+    ready.release()
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        kwargs.setdefault("initializer", _ready_init)
+        pool = ModelPool(**kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_timed_out_task_keeps_its_slot_until_the_worker_is_done(make_pool):
+    pool = make_pool(workers=1, queue_size=0)
+    pool.warm_up()
+    assert pool.wait_warm(timeout=30)
+
+    with pytest.raises(TimeoutError):
+        pool.run(_sleep, 1.0, max_wait=1, timeout=0.1)
+
+    # The worker is still busy with the abandoned task
+    with pytest.raises(ModelPoolBusy):
+        pool.run(_sleep, 0, max_wait=0.1, timeout=5)
+
+    assert pool.run(_sleep, 0, max_wait=5, timeout=5) == 0
+
+
+def test_wait_warm_counts_each_worker(make_pool):
+    pool = make_pool(workers=2, queue_size=0)
+    pool.warm_up()
+    assert pool.wait_warm(timeout=30)
+    assert pool._ready_count == 2
+
+
+def test_wait_warm_is_false_while_workers_are_loading(make_pool):
+    pool = make_pool(workers=1, queue_size=0, initializer=_slow_init)
+    pool.warm_up()
+    assert pool.wait_warm(timeout=0.5) is False
+
+
+def test_late_restart_keeps_the_replacement_pool(make_pool):
+    pool = make_pool(workers=1, queue_size=0)
+    broken = pool._executor
+
+    pool._restart(broken)
+    replacement = pool._executor
+    # A second caller that saw the same broken pool must not replace it again
+    pool._restart(broken)
+
+    assert replacement is not broken
+    assert pool._executor is replacement
+    assert pool.run(_sleep, 0, max_wait=5, timeout=30) == 0
@@ -0,0 +1,66 @@
+import pytest
+from app.services import pdf_quiz_pipeline
+from app.services.pdf_quiz_pipeline import generate_quiz_in_batches
+
+TOPICS = (
+    "photosynthesis mitochondria osmosis enzymes ribosomes chlorophyll glucose "
+    "membranes nucleus proteins gravity friction momentum voltage inertia "
+    "torque entropy pressure density velocity democracy parliament treaty "
+    "empire revolution monarchy senate colony tariff constitution"
+).split()
+
+
+def _fake_generate(calls, fail_batches=()):
+    def generate(text, num_questions, max_wait=None):
+        batch = len(calls)
+        calls.append((text, num_questions))
+        if batch in fail_batches:
+            raise TimeoutError("Generation timed out")
+        return {
+            "questions": [
+                {
+                    "question": f"Explain {TOPICS[batch * 10 + idx]}",
+                    "correct_answer": "A",
+                    "options": ["A", "B"],
+                }
+                for idx in range(num_questions)
+            ]
+        }
+
+    return generate
+
+
+def test_large_requests_run_as_batches_over_text_slices(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_quiz_pipeline, "generate_quiz", _fake_generate(calls))
+
+    text = "".join(f"part{idx}-" * 100 for idx in range(3))
+    result = generate_quiz_in_batches(text, 25)
+
+    assert [n for _, n in calls] == [10, 10, 5]
+    assert [chunk[:6] for chunk, _ in calls] == ["part0-", "part1-", "part2-"]
+    assert len(result["questions"]) == 25
+
+
+def test_a_timed_out_batch_keeps_the_others(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        pdf_quiz_pipeline, "generate_quiz", _fake_generate(calls, fail_batches={1})
+    )
+
+    text = "".join(f"part{idx}-" * 100 for idx in range(3))
+    result = generate_quiz_in_batches(text, 30)
+
+    assert len(calls) == 3
+    assert len(result["questions"]) == 20
+
+
+def test_all_batches_timing_out_raises(monkeypatch):
+    monkeypatch.setattr(
+        pdf_quiz_pipeline,
+        "generate_quiz",
+        _fake_generate([], fail_batches={0, 1, 2}),
+    )
+
+    with pytest.raises(TimeoutError):
+        generate_quiz_in_batches("x" * 300, 30)
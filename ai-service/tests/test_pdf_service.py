@@ -0,0 +1,83 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.services import pdf_service
+from app.services.pdf_service import PDFService
+from tests.pdf_factory import make_pdf
+
+RUNNING_HEAD = "Biology for Beginners"
+
+
+def _book(pages=40, front_matter=8):
+    """Front matter without running heads, then chapters that have one."""
+    return make_pdf(
+        [
+            ([] if idx < front_matter else [RUNNING_HEAD])
+            + [f"Page {idx} explains topic number {idx} in some detail."]
+            for idx in range(pages)
+        ]
+    )
+
+
+@pytest.fixture
+def sequential(monkeypatch):
+    monkeypatch.setattr(pdf_service.settings, "pdf_extract_workers", 1)
+
+
+def test_extract_document_reports_page_offsets(sequential):
+    doc = PDFService.extract_document(io.BytesIO(_book(pages=5, front_matter=5)))
+
+    assert doc["complete"] is True
+    assert len(doc["page_offsets"]) == 5
+    for idx, offset in enumerate(doc["page_offsets"]):
+        assert doc["text"][offset:].startswith(f"Page {idx} explains")
+
+
+def test_extract_document_stops_early_at_max_chars(sequential):
+    doc = PDFService.extract_document(io.BytesIO(_book()), max_chars=100)
+
+    assert doc["complete"] is False
+    assert 1 <= len(doc["page_offsets"]) < 40
+    assert doc["page_offsets"][-1] < 100
+
+
+def test_iter_pages_stops_once_max_chars_are_collected(sequential):
+    pages = list(PDFService.iter_pages(io.BytesIO(_book()), max_chars=120))
+
+    assert 1 < len(pages) < 40
+    assert sum(len(page) for page in pages[:-1]) < 120 <= sum(map(len, pages))
+
+
+def test_running_heads_after_front_matter_are_removed(sequential):
+    headers = set()
+    pages = list(PDFService.iter_pages(io.BytesIO(_book()), headers=headers))
+
+    assert RUNNING_HEAD in headers
+    assert len(pages) == 40
+    assert not any(RUNNING_HEAD in page for page in pages)
+
+
+def test_in_memory_pdfs_are_read_in_parallel_from_a_temp_file(monkeypatch):
+    monkeypatch.setattr(pdf_service.settings, "pdf_extract_workers", 2)
+    monkeypatch.setattr(pdf_service.settings, "pdf_parallel_min_pages", 10)
+    paths = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def __init__(self, max_workers, mp_context=None):
+            super().__init__(max_workers)
+
+        def submit(self, fn, file_path, *args):
+            paths.append(file_path)
+            return super().submit(fn, file_path, *args)
+
+    monkeypatch.setattr(pdf_service, "ProcessPoolExecutor", RecordingExecutor)
+
+    doc = PDFService.extract_document(io.BytesIO(_book()))
+
+    assert len(paths) == 3  # 40 pages in ranges of PAGE_RANGE_SIZE
+    assert len(set(paths)) == 1 and isinstance(paths[0], str)
+    assert not os.path.exists(paths[0])
+    assert len(doc["page_offsets"]) == 40
+    assert doc["text"].startswith("Page 0 explains")
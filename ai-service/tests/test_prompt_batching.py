@@ -0,0 +1,85 @@
+import json
+
+from app.services import quiz_service
+from app.services.quiz_service import QuizService
+
+# Prompt lengths deliberately out of order so sorting reshuffles them
+TOPICS = ["mitosis", "osmosis", "enzymes", "ribosomes", "chlorophyll", "meiosis"]
+PROMPTS = [
+    f"Topic: {topic}" + " context" * (7 - idx) for idx, topic in enumerate(TOPICS)
+]
+
+
+def _question_for(prompt, text=None):
+    topic = prompt.split()[1]
+    return json.dumps(
+        {
+            "question": text or f"What role does {topic} play in the cell?",
+            "options": [topic, "none"],
+            "correct_answer": topic,
+        }
+    )
+
+
+def _iter(monkeypatch, run_prompts, batch_size, prompts=PROMPTS):
+    monkeypatch.setattr(
+        QuizService, "_build_prompts", staticmethod(lambda chunks, n: list(prompts))
+    )
+    monkeypatch.setattr(quiz_service.settings, "quiz_batch_size", batch_size)
+    return list(QuizService._iter_flan_t5(["chunk"], len(prompts), run_prompts))
+
+
+def test_prompt_batches_respect_batch_size_and_keep_every_prompt():
+    for batch_size in (1, 2, 4, 6, 10):
+        batches = QuizService._prompt_batches(PROMPTS, batch_size)
+
+        assert all(0 < len(batch) <= batch_size for batch in batches)
+        assert sorted(p for batch in batches for p in batch) == sorted(PROMPTS)
+        flat = [len(p) for batch in batches for p in batch]
+        assert flat == sorted(flat)
+
+
+def test_length_sorted_batches_map_outputs_to_their_own_prompts(monkeypatch):
+    sent = []
+
+    def run_prompts(batch):
+        sent.append(list(batch))
+        return [_question_for(prompt) for prompt in batch]
+
+    questions = _iter(monkeypatch, run_prompts, batch_size=4)
+
+    assert [len(batch) for batch in sent] == [4, 2]
+    assert sorted(q["correct_answer"] for q in questions) == sorted(TOPICS)
+    assert all(q["correct_answer"] in q["question"] for q in questions)
+
+
+def test_run_prompts_returns_outputs_in_prompt_order(monkeypatch):
+    def pipeline(prompts, **kwargs):
+        assert kwargs["batch_size"] == len(prompts)
+        # The HF pipeline wraps some results in a single-element list
+        return [
+            [{"generated_text": f" out {p} "}] if idx % 2 else {"generated_text": p}
+            for idx, p in enumerate(prompts)
+        ]
+
+    monkeypatch.setattr(quiz_service, "_pipeline", pipeline)
+
+    assert QuizService._run_prompts(["a", "b", "c"]) == ["a", "out b", "c"]
+    assert QuizService._run_prompts([]) == []
+
+
+def test_duplicates_are_dropped_across_batches(monkeypatch):
+    repeated = "What role does the nucleus play in storing genetic material?"
+
+    def run_prompts(batch):
+        # One prompt per batch comes back with the same question
+        return [
+            _question_for(prompt, repeated if idx == 0 else None)
+            for idx, prompt in enumerate(batch)
+        ]
+
+    questions = _iter(monkeypatch, run_prompts, batch_size=2)
+
+    texts = [q["question"] for q in questions]
+    assert texts.count(repeated) == 1
+    assert len(questions) == len(PROMPTS) - 2
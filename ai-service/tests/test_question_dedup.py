@@ -0,0 +1,44 @@
+import time
+
+from app.services.question_dedup import dedupe_questions
+
+
+def _q(text):
+    return {"question": text, "options": ["A) x", "B) y"], "correct_answer": "A) x"}
+
+
+def test_rephrased_questions_are_dropped():
+    candidates = [
+        _q("Where do the light-dependent reactions of photosynthesis occur?"),
+        _q("In which location do photosynthesis light-dependent reactions occur?"),
+        _q("What molecule does the Calvin cycle fix from the atmosphere?"),
+    ]
+
+    unique = dedupe_questions(candidates)
+
+    assert [q["question"] for q in unique] == [
+        candidates[0]["question"],
+        candidates[2]["question"],
+    ]
+
+
+def test_candidates_are_checked_against_existing_questions():
+    existing = [_q("What does the Calvin cycle fix?")]
+    candidates = [_q("What does the Calvin cycle fix from the air?")]
+
+    assert dedupe_questions(candidates, existing=existing) == []
+
+
+def test_empty_questions_do_not_match_each_other():
+    assert len(dedupe_questions([_q(""), _q("")])) == 2
+
+
+def test_hundreds_of_candidates_are_fast():
+    candidates = [
+        _q(f"What is the role of enzyme {idx} in pathway {idx % 37}?")
+        for idx in range(500)
+    ]
+
+    started = time.perf_counter()
+    dedupe_questions(candidates)
+    assert time.perf_counter() - started < 2.0
@@ -0,0 +1,35 @@
+import pytest
+from app.api.v1 import quiz
+from app.schemas.quiz_schema import QuizJobRequest, QuizRequest
+from app.services.quiz_jobs import QuizJobStoreUnavailable
+from fastapi import HTTPException
+
+
+def test_generate_maps_a_crashed_worker_to_502(monkeypatch):
+    def crash(text, num_questions):
+        raise RuntimeError("Model worker crashed during generation.")
+
+    monkeypatch.setattr(quiz, "pool_generate_quiz", crash)
+
+    with pytest.raises(HTTPException) as exc:
+        quiz.generate_quiz(QuizRequest(lesson_text="Some text"), data={})
+
+    assert exc.value.status_code == 502
+    assert exc.value.detail == "Model worker crashed during generation."
+
+
+def test_job_endpoints_return_503_while_the_store_is_down(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise QuizJobStoreUnavailable("Quiz jobs are unavailable right now.")
+
+    monkeypatch.setattr(quiz.QuizJobService, "submit", unavailable)
+    monkeypatch.setattr(quiz.QuizJobService, "get", unavailable)
+    data = {"tenant_id": 1, "service": True}
+
+    with pytest.raises(HTTPException) as exc:
+        quiz.submit_quiz_job(QuizJobRequest(pdf_key="a.pdf"), data=data)
+    assert exc.value.status_code == 503
+
+    with pytest.raises(HTTPException) as exc:
+        quiz.get_quiz_job("job-1", data=data)
+    assert exc.value.status_code == 503
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+from app.services import quiz_cache
+from app.services.quiz_cache import (
+    DiskQuizCache,
+    MemoryQuizCache,
+    QuizCache,
+    RedisQuizCache,
+    quiz_cache_key,
+)
+
+QUIZ = {"questions": [{"question": "Q?", "correct_answer": "A", "options": ["A"]}]}
+
+
+def test_cache_key_covers_everything_that_changes_the_output(monkeypatch):
+    base = quiz_cache_key("Some lesson", 5)
+
+    assert quiz_cache_key("Some lesson", 5) == base
+    assert quiz_cache_key("Other lesson", 5) != base
+    assert quiz_cache_key("Some lesson", 6) != base
+
+    monkeypatch.setattr(quiz_cache.settings, "quiz_model_name", "google/flan-t5-large")
+    assert quiz_cache_key("Some lesson", 5) != base
+    monkeypatch.undo()
+
+    monkeypatch.setattr(quiz_cache.settings, "quiz_inference_backend", "onnx")
+    assert quiz_cache_key("Some lesson", 5) != base
+    monkeypatch.undo()
+
+    monkeypatch.setattr(quiz_cache, "QUIZ_CACHE_VERSION", 2)
+    assert quiz_cache_key("Some lesson", 5) != base
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryQuizCache(max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}  # now "b" is the oldest
+
+    cache.set("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskQuizCache(str(tmp_path), max_entries=2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    # Pin mtimes so the order doesn't depend on filesystem timestamp resolution
+    os.utime(cache._path("a"), (1000, 1000))
+    os.utime(cache._path("b"), (2000, 2000))
+    assert cache.get("a") == {"n": 1}  # a hit touches the file
+
+    cache.set("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_disk_cache_treats_a_corrupt_entry_as_a_miss(tmp_path):
+    cache = DiskQuizCache(str(tmp_path), max_entries=10)
+    with open(cache._path("a"), "w") as f:
+        f.write("{not json")
+
+    assert cache.get("a") is None
+
+
+def test_redis_cache_round_trip_with_ttl():
+    fakeredis = pytest.importorskip("fakeredis")
+    cache = RedisQuizCache("redis://localhost:6379/0", ttl=60)
+    cache.client = fakeredis.FakeRedis()
+
+    cache.set("a", QUIZ)
+
+    assert cache.get("a") == QUIZ
+    assert cache.get("b") is None
+    assert 0 < cache.client.ttl("a") <= 60
+
+
+def test_backend_errors_are_misses(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    cache = RedisQuizCache("redis://localhost:6379/0", ttl=60)
+    cache.client = fakeredis.FakeRedis(server=server)
+    monkeypatch.setattr(quiz_cache, "_cache", cache)
+    server.connected = False
+
+    QuizCache.set("Some lesson", 5, QUIZ)
+    assert QuizCache.get("Some lesson", 5) is None
+
+    server.connected = True
+    QuizCache.set("Some lesson", 5, QUIZ)
+    assert QuizCache.get("Some lesson", 5) == QUIZ
@@ -0,0 +1,170 @@
+import time
+
+import pytest
+import requests
+from app.services import quiz_jobs
+from app.services.quiz_jobs import (
+    COMPLETED,
+    FAILED,
+    MemoryQuizJobStore,
+    QuizJobQueueFull,
+    QuizJobService,
+    QuizJobStoreUnavailable,
+    RedisQuizJobStore,
+)
+
+CALLBACK_URL = "http://backend:8000/internal/ai/quizzes/1/job-complete/"
+QUESTIONS = [{"question": "Q?", "correct_answer": "A", "options": ["A", "B"]}]
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = MemoryQuizJobStore(ttl=60, deadline=600)
+    monkeypatch.setattr(quiz_jobs, "_store", store)
+    return store
+
+
+def _wait_finished(job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = QuizJobService.get(job_id)
+        if job["status"] in (COMPLETED, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_job_completes_and_posts_callback(store, monkeypatch):
+    monkeypatch.setattr(
+        quiz_jobs,
+        "generate_quiz_from_pdf",
+        lambda key, n, max_wait: {"questions": QUESTIONS},
+    )
+    posted = []
+    monkeypatch.setattr(
+        quiz_jobs.requests,
+        "post",
+        lambda url, **kwargs: posted.append((url, kwargs)) or FakeResponse(200),
+    )
+
+    job = QuizJobService.submit(
+        pdf_key="a.pdf",
+        num_questions=1,
+        tenant_id=1,
+        callback_url=CALLBACK_URL,
+        metadata={"quiz_id": 1},
+    )
+    finished = _wait_finished(job["job_id"])
+    quiz_jobs._callbacks.submit(lambda: None).result()  # drain callback thread
+
+    assert finished["questions"] == QUESTIONS
+    assert store.pending_count() == 0
+    url, kwargs = posted[0]
+    assert url == CALLBACK_URL
+    assert kwargs["json"]["status"] == COMPLETED
+    assert kwargs["json"]["metadata"] == {"quiz_id": 1}
+    assert "X-Service-Token" in kwargs["headers"]
+
+
+def test_job_failure_is_recorded(store, monkeypatch):
+    def boom(key, n, max_wait):
+        raise TimeoutError("Generation timed out")
+
+    monkeypatch.setattr(quiz_jobs, "generate_quiz_from_pdf", boom)
+
+    job = QuizJobService.submit(pdf_key="a.pdf", num_questions=1, tenant_id=1)
+    finished = _wait_finished(job["job_id"])
+
+    assert finished["status"] == FAILED
+    assert finished["error"] == "Generation timed out"
+
+
+def test_submit_rejects_foreign_callbacks_and_full_queue(store, monkeypatch):
+    with pytest.raises(ValueError):
+        QuizJobService.submit(
+            pdf_key="a.pdf",
+            num_questions=1,
+            tenant_id=1,
+            callback_url="http://evil.test/hook",
+        )
+
+    monkeypatch.setattr(quiz_jobs.settings, "quiz_job_max_pending", 0)
+    with pytest.raises(QuizJobQueueFull):
+        QuizJobService.submit(pdf_key="a.pdf", num_questions=1, tenant_id=1)
+
+
+def test_failed_callback_is_retried_on_a_timer(monkeypatch):
+    monkeypatch.setattr(
+        quiz_jobs.requests,
+        "post",
+        lambda url, **kwargs: (_ for _ in ()).throw(requests.ConnectionError()),
+    )
+    timers = []
+
+    class FakeTimer:
+        def __init__(self, interval, fn, args):
+            timers.append((interval, args))
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(quiz_jobs.threading, "Timer", FakeTimer)
+    job = {
+        "job_id": "job-1",
+        "status": COMPLETED,
+        "questions": QUESTIONS,
+        "error": None,
+        "metadata": {},
+        "callback_url": CALLBACK_URL,
+    }
+
+    started = time.monotonic()
+    QuizJobService._send_callback(job)
+    QuizJobService._send_callback(job, attempt=quiz_jobs.CALLBACK_ATTEMPTS)
+
+    assert time.monotonic() - started < 1  # nothing slept in the caller
+    assert timers == [(2, (QuizJobService._send_callback, job, 2))]
+
+
+def test_redis_store_is_shared_between_processes():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    pod_a = RedisQuizJobStore(
+        "", ttl=60, deadline=600, client=fakeredis.FakeRedis(server=server)
+    )
+    pod_b = RedisQuizJobStore(
+        "", ttl=60, deadline=600, client=fakeredis.FakeRedis(server=server)
+    )
+
+    now = time.time()
+    pod_a.add({"job_id": "fresh", "status": "queued", "created_at": now})
+    pod_a.add({"job_id": "abandoned", "status": "running", "created_at": now - 700})
+
+    assert pod_b.get("fresh")["status"] == "queued"
+    # The abandoned job's runner died long ago; it no longer blocks submissions
+    assert pod_b.pending_count() == 1
+
+    pod_a.update("fresh", status=COMPLETED, questions=QUESTIONS)
+    assert pod_b.get("fresh")["questions"] == QUESTIONS
+    assert pod_b.pending_count() == 0
+    assert 0 < pod_b.client.ttl("quiz_job:fresh") <= 60
+
+
+def test_redis_outage_is_reported_as_unavailable(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    store = RedisQuizJobStore(
+        "", ttl=60, deadline=600, client=fakeredis.FakeRedis(server=server)
+    )
+    monkeypatch.setattr(quiz_jobs, "_store", store)
+    server.connected = False
+
+    with pytest.raises(QuizJobStoreUnavailable):
+        QuizJobService.submit(pdf_key="a.pdf", num_questions=1, tenant_id=1)
+    with pytest.raises(QuizJobStoreUnavailable):
+        QuizJobService.get("job-1")
@@ -0,0 +1,53 @@
+"""
+S3Service against moto's in-process S3. The same tests run against MinIO
+by pointing AWS_S3_ENDPOINT_URL at it.
+"""
+
+import io
+import os
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("moto")
+
+from app.services.s3_service import S3Service  # noqa: E402
+
+
+def test_client_is_shared_between_instances(s3):
+    assert S3Service().client is s3.client
+
+
+def test_small_objects_are_read_into_memory(s3):
+    s3.client.put_object(Bucket=s3.bucket, Key="small.pdf", Body=b"x" * 100)
+
+    with s3.open_object("small.pdf") as source:
+        assert isinstance(source, io.BytesIO)
+        assert source.read() == b"x" * 100
+
+
+def test_larger_objects_spool_to_a_temp_file(s3):
+    s3.client.put_object(Bucket=s3.bucket, Key="large.pdf", Body=b"y" * 2048)
+
+    with s3.open_object("large.pdf") as source:
+        assert isinstance(source, str)
+        with open(source, "rb") as f:
+            assert f.read() == b"y" * 2048
+
+    assert not os.path.exists(source)
+
+
+def test_objects_over_the_cap_are_rejected_before_download(s3):
+    s3.client.put_object(Bucket=s3.bucket, Key="huge.pdf", Body=b"z" * 8192)
+    head = s3.head_object("huge.pdf")
+
+    assert head["size"] == 8192
+    with pytest.raises(ValueError):
+        with s3.open_object("huge.pdf", size=head["size"]):
+            pass
+
+
+def test_missing_objects_raise_runtime_error(s3):
+    with pytest.raises(RuntimeError):
+        s3.head_object("missing.pdf")
+    assert s3.get_bytes("missing.pdf") is None
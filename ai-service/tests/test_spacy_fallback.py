@@ -0,0 +1,121 @@
+"""
+The spaCy fallback against a tiny rule-based parser on a blank English
+pipeline, so no trained model is needed. The single nlp.pipe pass must pick
+the same sentences and targets as the old parse-every-sentence version.
+"""
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from app.services import quiz_service  # noqa: E402
+from app.services.quiz_service import QuizService  # noqa: E402
+from spacy.language import Language  # noqa: E402
+
+NOUNS = {"plants", "light", "energy", "leaves", "chlorophyll", "cells", "water"}
+NOUNS |= {"roots", "sugar", "oxygen", "air", "soil"}
+ADJS = {"green", "chemical", "solar", "tiny", "fresh"}
+VERBS = {"convert", "contain", "absorb", "release", "store", "use", "grow"}
+
+TEXT = (
+    "Green plants convert solar light into chemical energy every day.\n\n"
+    "Tiny cells in leaves contain chlorophyll for this purpose. Roots grow.\n"
+    "Plants absorb water and fresh air through their roots quite slowly.\n\n"
+    "Leaves release oxygen into the air after they use sugar for energy.\n\n"
+    "Green plants store sugar in roots and leaves for the long winter."
+)
+
+
+@Language.component("toy_parser")
+def toy_parser(doc):
+    bounds, start = [], 0
+    for tok in doc:
+        if tok.text == "." or tok.i == len(doc) - 1:
+            bounds.append((start, tok.i + 1))
+            start = tok.i + 1
+
+    for start, end in bounds:
+        span = doc[start:end]
+        root = next((t for t in span if t.lower_ in VERBS), span[0])
+        for t in span:
+            if t.i == root.i:
+                t.pos_, t.dep_ = "VERB", "ROOT"
+            elif t.lower_ in NOUNS:
+                t.pos_, t.dep_ = "NOUN", ("nsubj" if t.i < root.i else "dobj")
+                t.head = root
+            elif t.lower_ in ADJS and t.i + 1 < end and doc[t.i + 1].lower_ in NOUNS:
+                t.pos_, t.dep_ = "ADJ", "amod"
+                t.head = doc[t.i + 1]
+            else:
+                t.pos_, t.dep_ = "X", "dep"
+                t.head = root
+    return doc
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("toy_parser")
+    monkeypatch.setattr(quiz_service, "_nlp", nlp)
+    return nlp
+
+
+def _old_fill_in_blanks(nlp, text, num_questions):
+    """The pre-nlp.pipe logic: parse the text, then re-parse each sentence."""
+    doc = nlp(text[:50000])
+    sentences = [s.text.strip() for s in doc.sents if len(s.text.strip()) > 30]
+    concepts = {c.text.strip() for c in doc.noun_chunks if len(c.text.strip()) > 3}
+
+    used = set()
+    questions = []
+    for sent in sentences[: num_questions * 2]:
+        if len(questions) >= num_questions:
+            break
+        sent_concepts = [
+            c.text.strip()
+            for c in nlp(sent).noun_chunks
+            if c.text.strip() in concepts and c.text.strip() not in used
+        ]
+        if not sent_concepts:
+            continue
+        target = sent_concepts[0]
+        used.add(target)
+        question = sent.replace(target, "______")
+        if not question.endswith("?"):
+            question = f"What completes this statement? {question}"
+        questions.append((question, target))
+
+    return sentences, concepts, questions
+
+
+def test_analysis_matches_per_sentence_parsing(nlp):
+    old_sentences, old_concepts, _ = _old_fill_in_blanks(nlp, TEXT, 5)
+
+    sentences, sentence_concepts, concepts = QuizService._analyze_with_spacy(TEXT)
+
+    assert sentences == old_sentences
+    assert set(concepts) == old_concepts
+    for idx, sent in enumerate(sentences):
+        expected = [
+            c.text.strip()
+            for c in nlp(sent).noun_chunks
+            if c.text.strip() in old_concepts
+        ]
+        assert sentence_concepts.get(idx, []) == expected
+
+
+@pytest.mark.parametrize("num_questions", [1, 3, 5])
+def test_fill_in_the_blank_questions_match_the_old_output(nlp, num_questions):
+    _, _, old_questions = _old_fill_in_blanks(nlp, TEXT, num_questions)
+
+    questions = QuizService._generate_with_spacy(TEXT, num_questions)
+    fill_ins = [
+        (q["question"], q["correct_answer"][3:])  # strip the "B) " label
+        for q in questions
+        if q["question"].startswith("What completes")
+    ]
+
+    assert fill_ins == old_questions
+    assert len(questions) == num_questions
+    for q in questions:
+        assert q["correct_answer"] in q["options"]
@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+
+import pytest
+from app.core.config import settings
+from app.services import text_artifact_store
+from app.services.text_artifact_store import (
+    DiskArtifactCache,
+    TextArtifactStore,
+    artifact_key,
+)
+
+ARTIFACT = {
+    "text": "Photosynthesis converts light into chemical energy.",
+    "page_offsets": [0],
+    "headers": ["Biology"],
+    "complete": True,
+}
+
+
+@pytest.fixture
+def disk(tmp_path, monkeypatch):
+    cache = DiskArtifactCache(str(tmp_path / "artifacts"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(text_artifact_store, "_disk", cache)
+    return cache
+
+
+def test_round_trip_is_gzipped_json(s3, disk):
+    TextArtifactStore.set(s3, "notes.pdf", '"etag-1"', ARTIFACT)
+
+    assert TextArtifactStore.get(s3, "notes.pdf", '"etag-1"') == ARTIFACT
+    raw = disk.get(artifact_key(s3.bucket, "notes.pdf", '"etag-1"'))
+    assert json.loads(gzip.decompress(raw)) == ARTIFACT
+
+
+def test_a_new_etag_misses(s3, disk):
+    TextArtifactStore.set(s3, "notes.pdf", '"etag-1"', ARTIFACT)
+
+    assert TextArtifactStore.get(s3, "notes.pdf", '"etag-2"') is None
+    assert artifact_key("b", "k", "1") != artifact_key("b", "k", "2")
+    assert artifact_key("b", "k", "1") != artifact_key("other", "k", "1")
+
+
+def test_corrupt_entries_read_as_misses(s3, disk):
+    disk.set(artifact_key(s3.bucket, "notes.pdf", '"etag-1"'), b"not gzip")
+
+    assert TextArtifactStore.get(s3, "notes.pdf", '"etag-1"') is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskArtifactCache(str(tmp_path), max_bytes=250)
+    cache.set("old", b"a" * 100)
+    cache.set("used", b"b" * 100)
+    os.utime(cache._path("old"), (1000, 1000))
+    os.utime(cache._path("used"), (2000, 2000))
+
+    assert cache.get("old") == b"a" * 100  # reading makes it the newest
+    cache.set("new", b"c" * 100)
+
+    assert cache.get("used") is None
+    assert cache.get("old") == b"a" * 100
+    assert cache.get("new") == b"c" * 100
+
+
+def test_s3_sidecar_shares_artifacts_between_pods(s3, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "text_artifact_s3_sidecar", True)
+    monkeypatch.setattr(
+        text_artifact_store,
+        "_disk",
+        DiskArtifactCache(str(tmp_path / "pod-a"), max_bytes=1024 * 1024),
+    )
+    TextArtifactStore.set(s3, "notes.pdf", '"etag-1"', ARTIFACT)
+
+    key = artifact_key(s3.bucket, "notes.pdf", '"etag-1"')
+    sidecar = f"{settings.text_artifact_s3_prefix}{key}.json.gz"
+    assert s3.head_object(sidecar)["size"] > 0
+
+    # A second pod with an empty local cache reads it back from S3 ...
+    pod_b = DiskArtifactCache(str(tmp_path / "pod-b"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(text_artifact_store, "_disk", pod_b)
+    assert TextArtifactStore.get(s3, "notes.pdf", '"etag-1"') == ARTIFACT
+
+    # ... and keeps a local copy for next time
+    assert pod_b.get(key) is not None
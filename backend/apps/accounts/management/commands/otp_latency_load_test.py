@@ -0,0 +1,119 @@
+import statistics
+import time
+
+from apps.accounts.tasks import send_otp_task
+from apps.ai.tasks import load_test_ai_task
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from eduflow.celery import app
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue a backlog of AI-heavy tasks, then send OTPs at a steady rate "
+        "and report OTP latency from enqueue to completion. Needs the broker, "
+        "result backend and per-queue workers running, so point it at a "
+        "staging stack rather than production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ai-backlog", type=int, default=500)
+        parser.add_argument(
+            "--ai-seconds",
+            type=float,
+            default=2.0,
+            help="How long each AI task holds its worker",
+        )
+        parser.add_argument("--otps", type=int, default=200)
+        parser.add_argument(
+            "--rate", type=float, default=20.0, help="OTPs sent per second"
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60.0,
+            help="Seconds to wait for the last OTP once all are sent",
+        )
+        parser.add_argument(
+            "--max-p99",
+            type=float,
+            help="Fail when the OTP p99 latency in seconds exceeds this",
+        )
+
+    def handle(self, *args, **options):
+        for _ in range(options["ai_backlog"]):
+            load_test_ai_task.delay(options["ai_seconds"])
+        self.stdout.write(
+            f"Queued {options['ai_backlog']} AI tasks, "
+            f"{self._queue_depth('ai-heavy')} waiting on ai-heavy."
+        )
+
+        sent = []
+        interval = 1 / options["rate"]
+        for idx in range(options["otps"]):
+            sent_at = timezone.now()
+            result = send_otp_task.delay(0, f"loadtest-{idx}", "LOAD_TEST")
+            sent.append((sent_at, result))
+            time.sleep(interval)
+
+        latencies = []
+        lost = 0
+        deadline = time.monotonic() + options["timeout"]
+        for sent_at, result in sent:
+            try:
+                result.get(
+                    timeout=max(deadline - time.monotonic(), 0.1), propagate=False
+                )
+            except CeleryTimeoutError:
+                lost += 1
+                continue
+            if not result.successful():
+                lost += 1
+                continue
+            # date_done is stamped by the worker, so this is queue wait plus run time
+            latencies.append((result.date_done - sent_at).total_seconds())
+
+        if not latencies:
+            raise CommandError("No OTP task finished; are the workers running?")
+
+        percentiles = self._percentiles(latencies)
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"\nOTP latency over {len(latencies)} tasks (seconds)"
+            )
+        )
+        for label, value in percentiles.items():
+            self.stdout.write(f"  {label:<4} {value:.3f}")
+        self.stdout.write(
+            f"  Lost or failed: {lost}. "
+            f"AI tasks still queued: {self._queue_depth('ai-heavy')}."
+        )
+
+        max_p99 = options["max_p99"]
+        if max_p99 is not None:
+            if lost:
+                raise CommandError(f"{lost} OTPs were lost or failed")
+            if percentiles["p99"] > max_p99:
+                raise CommandError(
+                    f"OTP p99 {percentiles['p99']:.3f}s is over the {max_p99}s budget"
+                )
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def _percentiles(self, latencies):
+        if len(latencies) == 1:
+            cuts = latencies * 99
+        else:
+            cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        return {
+            "p50": cuts[49],
+            "p95": cuts[94],
+            "p99": cuts[98],
+            "max": max(latencies),
+        }
+
+    def _queue_depth(self, queue):
+        with app.connection_for_write() as conn:
+            return conn.default_channel.queue_declare(
+                queue=queue, passive=True
+            ).message_count
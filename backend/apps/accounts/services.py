@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from apps.accounts.models import User
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment, EnrollmentRequest
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+ADMIN_DASHBOARD_STATS_TTL = 60  # seconds
+
+
+def admin_dashboard_stats_key(tenant_id):
+    return f"admin_dashboard_stats:{tenant_id}"
+
+
+def invalidate_admin_dashboard_stats(tenant_id):
+    """Drop the tenant's cached admin stats once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(admin_dashboard_stats_key(tenant_id)))
+
+
+def get_admin_dashboard_stats(tenant):
+    """Return the admin dashboard stats for a tenant, cached briefly."""
+    key = admin_dashboard_stats_key(tenant.id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = build_admin_dashboard_stats(tenant)
+        cache.set(key, stats, ADMIN_DASHBOARD_STATS_TTL)
+    return stats
+
+
+def build_admin_dashboard_stats(tenant):
+    """One conditional-aggregation query per table."""
+    week_ago = timezone.now() - timedelta(days=7)
+
+    users = User.objects.filter(tenant=tenant).aggregate(
+        total_users=Count("id"),
+        total_students=Count("id", filter=Q(role="STUDENT")),
+        total_instructors=Count("id", filter=Q(role="INSTRUCTOR")),
+    )
+    courses = Course.objects.filter(tenant=tenant).aggregate(
+        total_courses=Count("id"),
+        active_courses=Count("id", filter=Q(is_active=True)),
+    )
+    requests = EnrollmentRequest.objects.filter(tenant=tenant).aggregate(
+        pending_approvals=Count("id", filter=Q(status="PENDING")),
+    )
+    enrollments = Enrollment.objects.filter(tenant=tenant).aggregate(
+        total_enrollments=Count("id"),
+        enrollments_this_week=Count("id", filter=Q(enrolled_at__gte=week_ago)),
+    )
+
+    return {**users, **courses, **requests, **enrollments}
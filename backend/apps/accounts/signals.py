@@ -0,0 +1,22 @@
+from apps.accounts.models import User
+from apps.accounts.services import invalidate_admin_dashboard_stats
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment, EnrollmentRequest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=EnrollmentRequest)
+@receiver(post_delete, sender=EnrollmentRequest)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def refresh_admin_dashboard_stats(sender, instance, update_fields=None, **kwargs):
+    """Drop the tenant's cached admin dashboard stats when its counts change."""
+    # Logins save only last_login, which no dashboard count depends on
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_admin_dashboard_stats(instance.tenant_id)
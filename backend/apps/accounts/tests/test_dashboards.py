@@ -0,0 +1,120 @@
+import pytest
+from apps.accounts.models import User
+from apps.accounts.services import admin_dashboard_stats_key, get_admin_dashboard_stats
+from apps.accounts.views import InstructorDashboardView
+from apps.courses.models import Course, Lesson
+from apps.enrollments.models import Enrollment, LessonProgress
+from apps.enrollments.services import rebuild_course_progress
+from apps.tenants.models import Tenant
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+dashboard_view = InstructorDashboardView.as_view()
+
+
+def _seed(tenant, instructor, courses, students_per_course):
+    for c_idx in range(courses):
+        course = Course.objects.create(
+            tenant=tenant, title=f"Course {c_idx}", created_by=instructor
+        )
+        lessons = [
+            Lesson.objects.create(
+                tenant=tenant,
+                course=course,
+                title=f"Lesson {order}",
+                video_url="https://example.com/video",
+                order=order,
+            )
+            for order in range(2)
+        ]
+        for s_idx in range(students_per_course):
+            student = User.objects.create(
+                tenant=tenant,
+                phone_number=f"7{course.id:04d}{s_idx:03d}",
+                role="STUDENT",
+            )
+            Enrollment.objects.create(tenant=tenant, student=student, course=course)
+            LessonProgress.objects.create(
+                tenant=tenant, student=student, lesson=lessons[0], is_completed=True
+            )
+    rebuild_course_progress(tenant=tenant)
+
+
+def _get_dashboard(instructor):
+    request = APIRequestFactory().get("/api/accounts/instructor/dashboard/")
+    force_authenticate(request, user=instructor)
+    with CaptureQueriesContext(connection) as queries:
+        response = dashboard_view(request)
+    return response, len(queries)
+
+
+@pytest.mark.django_db
+def test_instructor_dashboard_query_count_is_constant():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9999999999", role="INSTRUCTOR"
+    )
+
+    _seed(tenant, instructor, courses=1, students_per_course=1)
+    small_response, small_queries = _get_dashboard(instructor)
+
+    _seed(tenant, instructor, courses=5, students_per_course=6)
+    large_response, large_queries = _get_dashboard(instructor)
+
+    assert small_queries == large_queries
+
+    stats = large_response.data["data"]["stats"]
+    assert stats["total_courses"] == 6
+    assert stats["total_students"] == 31
+    assert stats["avg_completion_rate"] == 50.0
+
+
+@pytest.mark.django_db
+def test_admin_dashboard_stats_are_cached_until_data_changes(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9999999999", role="INSTRUCTOR"
+    )
+    _seed(tenant, instructor, courses=2, students_per_course=2)
+
+    with django_assert_num_queries(4):
+        stats = get_admin_dashboard_stats(tenant)
+
+    assert stats["total_users"] == 5
+    assert stats["total_students"] == 4
+    assert stats["active_courses"] == 2
+    assert stats["enrollments_this_week"] == 4
+
+    with django_assert_num_queries(0):
+        assert get_admin_dashboard_stats(tenant) == stats
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        Course.objects.create(tenant=tenant, title="New Course", created_by=instructor)
+        # Readers keep the cached stats until the write is committed
+        assert get_admin_dashboard_stats(tenant) == stats
+
+    for callback in callbacks:
+        callback()
+    assert get_admin_dashboard_stats(tenant)["total_courses"] == 3
+
+
+@pytest.mark.django_db
+def test_admin_dashboard_stats_survive_logins(django_capture_on_commit_callbacks):
+    cache.clear()
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9999999999", role="INSTRUCTOR"
+    )
+    stats = get_admin_dashboard_stats(tenant)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        update_last_login(None, instructor)
+
+    assert callbacks == []
+    assert cache.get(admin_dashboard_stats_key(tenant.id)) == stats
@@ -1,5 +1,3 @@
-from datetime import timedelta
-
 from apps.accounts.models import User
 from apps.accounts.serializers import (
     AdminCreateUserSerializer,
@@ -12,14 +10,13 @@ from apps.accounts.serializers import (
     ResetPasswordSerializer,
     VerifyOTPSerializer,
 )
+from apps.accounts.services import get_admin_dashboard_stats
 from apps.common.exceptions import AppException
 from apps.common.permissions import IsAdmin, IsInstructor, IsStudent
 from apps.common.responses import error_response, success_response
-from apps.courses.models import Course
-from apps.enrollments.models import Enrollment, EnrollmentRequest
 from apps.tenants.models import Tenant
 from django.conf import settings
-from django.utils import timezone
+from django.db.models import Count, F, Q, Sum
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -353,41 +350,12 @@ class AdminDashboardView(APIView):
     @swagger_auto_schema(responses={200: "Admin dashboard stats"})
     def get(self, request):
 
-        tenant = request.user.tenant
-        now = timezone.now()
-        week_ago = now - timedelta(days=7)
-
-        # Statistics
-        total_users = User.objects.filter(tenant=tenant).count()
-        total_students = User.objects.filter(tenant=tenant, role="STUDENT").count()
-        total_instructors = User.objects.filter(
-            tenant=tenant, role="INSTRUCTOR"
-        ).count()
-        total_courses = Course.objects.filter(tenant=tenant).count()
-        active_courses = Course.objects.filter(tenant=tenant, is_active=True).count()
-        pending_approvals = EnrollmentRequest.objects.filter(
-            tenant=tenant, status="PENDING"
-        ).count()
-        total_enrollments = Enrollment.objects.filter(tenant=tenant).count()
-        enrollments_this_week = Enrollment.objects.filter(
-            tenant=tenant, enrolled_at__gte=week_ago
-        ).count()
-
         return Response(
             success_response(
                 message="Admin Dashboard",
                 data={
                     "role": request.user.role,
-                    "stats": {
-                        "total_users": total_users,
-                        "total_students": total_students,
-                        "total_instructors": total_instructors,
-                        "total_courses": total_courses,
-                        "active_courses": active_courses,
-                        "pending_approvals": pending_approvals,
-                        "total_enrollments": total_enrollments,
-                        "enrollments_this_week": enrollments_this_week,
-                    },
+                    "stats": get_admin_dashboard_stats(request.user.tenant),
                 },
             )
         )
@@ -400,9 +368,9 @@ class InstructorDashboardView(APIView):
     def get(self, request):
         from apps.courses.models import Course, Lesson
         from apps.enrollments.models import (
+            CourseProgress,
             Enrollment,
             EnrollmentRequest,
-            LessonProgress,
         )
 
         instructor = request.user
@@ -411,9 +379,14 @@ class InstructorDashboardView(APIView):
         # Get instructor's courses
         my_courses = Course.objects.filter(tenant=tenant, created_by=instructor)
 
-        # Statistics
-        total_courses = my_courses.count()
-        active_courses = my_courses.filter(is_active=True).count()
+        # Statistics — each table is hit once, so the query count does not
+        # grow with the number of courses, lessons or students.
+        course_stats = my_courses.aggregate(
+            total_courses=Count("id"),
+            active_courses=Count("id", filter=Q(is_active=True)),
+        )
+        total_courses = course_stats["total_courses"]
+        active_courses = course_stats["active_courses"]
         total_lessons = Lesson.objects.filter(
             tenant=tenant, course__in=my_courses
         ).count()
@@ -427,21 +400,15 @@ class InstructorDashboardView(APIView):
             tenant=tenant, course__in=my_courses, status="PENDING"
         ).count()
 
-        # Calculate average completion rate
-        total_progress = 0
-        total_possible = 0
-        for course in my_courses:
-            lessons_count = Lesson.objects.filter(course=course, is_active=True).count()
-            if lessons_count > 0:
-                enrollments = Enrollment.objects.filter(course=course)
-                for enrollment in enrollments:
-                    completed = LessonProgress.objects.filter(
-                        student=enrollment.student,
-                        lesson__course=course,
-                        is_completed=True,
-                    ).count()
-                    total_progress += completed
-                    total_possible += lessons_count
+        # Average completion rate across every enrolled student's progress row
+        completion = CourseProgress.objects.filter(
+            tenant=tenant, course__in=my_courses, total_lessons__gt=0
+        ).aggregate(
+            total_progress=Sum("completed_count"),
+            total_possible=Sum("total_lessons"),
+        )
+        total_progress = completion["total_progress"] or 0
+        total_possible = completion["total_possible"] or 0
 
         avg_completion = round(
             (total_progress / total_possible * 100) if total_possible > 0 else 0, 1
@@ -470,11 +437,10 @@ class StudentDashboardView(APIView):
 
     @swagger_auto_schema(responses={200: "Student dashboard stats"})
     def get(self, request):
-        from apps.courses.models import Lesson
         from apps.enrollments.models import (
+            CourseProgress,
             Enrollment,
             EnrollmentRequest,
-            LessonProgress,
         )
 
         student = request.user
@@ -489,31 +455,28 @@ class StudentDashboardView(APIView):
             tenant=tenant, student=student, status="PENDING"
         ).count()
 
-        # Calculate progress
-        total_lessons = 0
-        completed_lessons = 0
-        courses_in_progress = 0
-        courses_completed = 0
-
-        for enrollment in my_enrollments:
-            course_lessons = Lesson.objects.filter(
-                course=enrollment.course, is_active=True
-            ).count()
-            completed = LessonProgress.objects.filter(
-                tenant=tenant,
-                student=student,
-                lesson__course=enrollment.course,
-                is_completed=True,
-            ).count()
-
-            total_lessons += course_lessons
-            completed_lessons += completed
-
-            if course_lessons > 0:
-                if completed == course_lessons:
-                    courses_completed += 1
-                elif completed > 0:
-                    courses_in_progress += 1
+        # Calculate progress from the denormalized per-course rows
+        progress = CourseProgress.objects.filter(
+            tenant=tenant,
+            student=student,
+            course__in=my_enrollments.values("course"),
+        ).aggregate(
+            total_lessons=Sum("total_lessons"),
+            completed_lessons=Sum("completed_count"),
+            courses_completed=Count(
+                "id",
+                filter=Q(total_lessons__gt=0, completed_count=F("total_lessons")),
+            ),
+            courses_in_progress=Count(
+                "id",
+                filter=Q(total_lessons__gt=0, completed_count__gt=0)
+                & ~Q(completed_count=F("total_lessons")),
+            ),
+        )
+        total_lessons = progress["total_lessons"] or 0
+        completed_lessons = progress["completed_lessons"] or 0
+        courses_in_progress = progress["courses_in_progress"]
+        courses_completed = progress["courses_completed"]
 
         overall_progress = round(
             (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0, 1
@@ -0,0 +1,16 @@
+from django.urls import path
+
+from .views import QuestionBankJobCallbackView, QuizJobCallbackView
+
+urlpatterns = [
+    path(
+        "quizzes/<int:quiz_id>/job-complete/",
+        QuizJobCallbackView.as_view(),
+        name="internal-quiz-job-callback",
+    ),
+    path(
+        "question-banks/<int:bank_id>/job-complete/",
+        QuestionBankJobCallbackView.as_view(),
+        name="internal-question-bank-job-callback",
+    ),
+]
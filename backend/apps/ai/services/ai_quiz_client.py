@@ -1,3 +1,4 @@
+import json
 import logging
 
 import requests
@@ -10,55 +11,137 @@ AI_SERVICE_BASE = settings.AI_SERVICE_URL  # e.g. "http://eduflow-ai:8002"
 
 class AIQuizClient:
     """
-    Client that calls the FastAPI AI service to generate quizzes from PDFs.
-    Forwards the instructor's JWT for authentication.
+    Client for the FastAPI AI service quiz job endpoints.
+    Authenticates as an internal service, so it works from Celery tasks
+    as well as request threads, and never waits on the model itself.
     """
 
     @staticmethod
-    def generate_quiz_from_pdf(
+    def _headers() -> dict:
+        return {
+            "X-Service-Token": settings.INTERNAL_SERVICE_TOKEN or "",
+            "Content-Type": "application/json",
+        }
+
+    @staticmethod
+    def submit_quiz_job(
         pdf_key: str,
-        jwt_token: str,
         num_questions: int = 5,
-    ) -> dict:
+        callback_url: str | None = None,
+        metadata: dict | None = None,
+    ) -> str:
         """
-        Call the AI service /api/v1/quiz/generate-from-pdf endpoint.
+        Queue quiz generation on the AI service.
 
         Args:
             pdf_key: S3 object key for the PDF file
-            jwt_token: Bearer JWT token to forward for auth
             num_questions: Number of MCQs to generate
+            callback_url: Backend /internal/ URL to POST the result to
+            metadata: Echoed back in the callback and job status
 
         Returns:
-            dict with {"questions": [...]}
+            The AI service job id
 
         Raises:
             RuntimeError on any failure
         """
-        url = f"{AI_SERVICE_BASE}/api/v1/quiz/generate-from-pdf"
-
-        headers = {
-            "Authorization": f"Bearer {jwt_token}",
-            "Content-Type": "application/json",
-        }
+        url = f"{AI_SERVICE_BASE}/api/v1/quiz/jobs"
 
         payload = {
             "pdf_key": pdf_key,
             "num_questions": num_questions,
+            "callback_url": callback_url,
+            "metadata": metadata,
         }
 
         try:
-            logger.info(f"Calling AI service: {url}")
-            response = requests.post(url, json=payload, headers=headers, timeout=120)
+            logger.info(f"Submitting quiz job: {url}")
+            response = requests.post(
+                url, json=payload, headers=AIQuizClient._headers(), timeout=10
+            )
+        except requests.RequestException as e:
+            raise RuntimeError(f"Cannot reach AI service at {url}: {e}") from e
+
+        if response.status_code != 202:
+            raise RuntimeError(
+                f"AI service returned {response.status_code}: "
+                f"{AIQuizClient._error_detail(response)}"
+            )
 
+        return response.json()["job_id"]
+
+    @staticmethod
+    def get_quiz_job(job_id: str) -> dict | None:
+        """
+        Return the job status dict ({"status", "questions", "error", ...}),
+        or None when the AI service no longer knows the job.
+
+        Raises:
+            RuntimeError on any other failure
+        """
+        url = f"{AI_SERVICE_BASE}/api/v1/quiz/jobs/{job_id}"
+
+        try:
+            response = requests.get(url, headers=AIQuizClient._headers(), timeout=10)
+        except requests.RequestException as e:
+            raise RuntimeError(f"Cannot reach AI service at {url}: {e}") from e
+
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"AI service returned {response.status_code}: "
+                f"{AIQuizClient._error_detail(response)}"
+            )
+
+        return response.json()
+
+    @staticmethod
+    def stream_quiz_from_pdf(pdf_key: str, num_questions: int = 5):
+        """
+        Generator over the AI service's NDJSON quiz stream, yielding each
+        question dict as soon as the AI service emits it.
+
+        Raises:
+            RuntimeError if the stream can't be opened or reports an error
+        """
+        url = f"{AI_SERVICE_BASE}/api/v1/quiz/generate-from-pdf/stream"
+        payload = {"pdf_key": pdf_key, "num_questions": num_questions}
+
+        try:
+            # Connect fast; allow long gaps between questions
+            response = requests.post(
+                url,
+                json=payload,
+                headers=AIQuizClient._headers(),
+                stream=True,
+                timeout=(10, 300),
+            )
+        except requests.RequestException as e:
+            raise RuntimeError(f"Cannot reach AI service at {url}: {e}") from e
+
+        with response:
             if response.status_code != 200:
-                error_detail = response.json().get("detail", response.text)
                 raise RuntimeError(
-                    f"AI service returned {response.status_code}: {error_detail}"
+                    f"AI service returned {response.status_code}: "
+                    f"{AIQuizClient._error_detail(response)}"
                 )
 
-            return response.json()
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event["type"] == "question":
+                        yield event["question"]
+                    elif event["type"] == "error":
+                        raise RuntimeError(f"AI service error: {event['detail']}")
+            except requests.RequestException as e:
+                raise RuntimeError(f"AI service stream broke: {e}") from e
 
-        except requests.ConnectionError as e:
-            raise RuntimeError(f"Cannot reach AI service at {url}: {e}") from e
-        except requests.Timeout:
-            raise RuntimeError("AI service timed out (120s). The PDF may be too large.")
+    @staticmethod
+    def _error_detail(response) -> str:
+        try:
+            return response.json().get("detail", response.text)
+        except ValueError:
+            return response.text
@@ -0,0 +1,132 @@
+import logging
+import random
+import re
+from urllib.parse import unquote
+
+from apps.courses.models import BankQuestion, LessonResource, QuestionBank
+from django.conf import settings
+from django.db import transaction
+
+from .ai_quiz_client import AIQuizClient
+from .quiz_persistence import save_generated_questions
+
+logger = logging.getLogger(__name__)
+
+
+def is_pdf_resource(resource):
+    return resource.file_type != "link" and bool(
+        resource.file_url
+        and (resource.file_url.endswith(".pdf") or "pdf" in resource.file_type.lower())
+    )
+
+
+def pdf_key_for(resource):
+    """S3 key of a resource, taken from its full URL when it is an S3 URL."""
+    s3_match = re.search(r"\.amazonaws\.com/(.+)$", resource.file_url)
+    if s3_match:
+        return unquote(s3_match.group(1))
+    return resource.file_url
+
+
+def lesson_pdf_resource(lesson):
+    """First PDF resource attached to ``lesson``, or None."""
+    for resource in LessonResource.objects.filter(lesson=lesson).exclude(
+        file_type="link"
+    ):
+        if is_pdf_resource(resource):
+            return resource
+    return None
+
+
+def start_question_bank(bank, pdf_key):
+    """
+    Submit a GENERATING bank to the AI service job queue and remember the
+    job id. The questions arrive via the internal callback (or the
+    poll_quiz_jobs sweeper). The AI service generates a request this size
+    in batches, each under its own model timeout, and returns whatever
+    batches finished.
+
+    Raises RuntimeError when the AI service rejects or can't be reached.
+    """
+    callback_url = (
+        f"{settings.AI_CALLBACK_BASE_URL}/internal/ai/question-banks/"
+        f"{bank.id}/job-complete/"
+    )
+
+    job_id = AIQuizClient.submit_quiz_job(
+        pdf_key=pdf_key,
+        num_questions=settings.QUESTION_BANK_SIZE,
+        callback_url=callback_url,
+        metadata={"question_bank_id": bank.id},
+    )
+
+    QuestionBank.objects.filter(pk=bank.pk).update(ai_job_id=job_id)
+    bank.ai_job_id = job_id
+    return job_id
+
+
+def complete_question_bank_job(bank_id, job):
+    """
+    Apply a finished AI job to its question bank. Like complete_quiz_job,
+    only a GENERATING bank still waiting on that job id is touched.
+    Returns the new bank status, or None if nothing changed.
+    """
+    with transaction.atomic():
+        bank = (
+            QuestionBank.objects.select_for_update()
+            .filter(id=bank_id, status="GENERATING", ai_job_id=job["job_id"])
+            .first()
+        )
+        if bank is None:
+            return None
+
+        questions = job.get("questions") or []
+        if job["status"] == "completed" and questions:
+            BankQuestion.objects.bulk_create(
+                BankQuestion(
+                    bank=bank,
+                    question_text=q_data["question"],
+                    correct_answer=q_data["correct_answer"],
+                    options=q_data.get("options", []),
+                )
+                for q_data in questions
+            )
+            bank.status = "READY"
+        else:
+            logger.error(f"AI job {job['job_id']} for bank {bank_id} failed: {job}")
+            bank.status = "FAILED"
+        bank.save(update_fields=["status", "updated_at"])
+
+    return bank.status
+
+
+def ready_bank_for_lesson(lesson):
+    """A READY question bank for one of the lesson's resources, or None."""
+    return (
+        QuestionBank.objects.filter(
+            resource__lesson=lesson, tenant_id=lesson.tenant_id, status="READY"
+        )
+        .order_by("resource_id")
+        .first()
+    )
+
+
+def assemble_quiz_from_bank(quiz, bank, num_questions=5):
+    """
+    Fill ``quiz`` with a random sample of the bank's questions and mark it
+    READY. No AI call is made, so this is cheap enough for the request path.
+    """
+    pool = list(bank.questions.values("question_text", "correct_answer", "options"))
+    sample = random.sample(pool, min(num_questions, len(pool)))
+
+    return save_generated_questions(
+        quiz,
+        [
+            {
+                "question": row["question_text"],
+                "correct_answer": row["correct_answer"],
+                "options": row["options"],
+            }
+            for row in sample
+        ],
+    )
@@ -0,0 +1,61 @@
+import logging
+
+from apps.courses.models import Quiz
+from django.conf import settings
+from django.db import transaction
+
+from .ai_quiz_client import AIQuizClient
+from .quiz_persistence import save_generated_questions
+
+logger = logging.getLogger(__name__)
+
+
+def start_quiz_generation(quiz, pdf_key, num_questions=5):
+    """
+    Submit a GENERATING quiz to the AI service job queue and remember the
+    job id. Returns immediately; the result arrives via the internal
+    callback (or the poll_quiz_jobs sweeper).
+
+    Raises RuntimeError when the AI service rejects or can't be reached.
+    """
+    callback_url = (
+        f"{settings.AI_CALLBACK_BASE_URL}/internal/ai/quizzes/{quiz.id}/job-complete/"
+    )
+
+    job_id = AIQuizClient.submit_quiz_job(
+        pdf_key=pdf_key,
+        num_questions=num_questions,
+        callback_url=callback_url,
+        metadata={"quiz_id": quiz.id},
+    )
+
+    Quiz.objects.filter(pk=quiz.pk).update(ai_job_id=job_id)
+    quiz.ai_job_id = job_id
+    return job_id
+
+
+def complete_quiz_job(quiz_id, job):
+    """
+    Apply a finished AI job ({"job_id", "status", "questions", "error"}) to
+    its quiz. Safe to call more than once per job: only a GENERATING quiz
+    still waiting on that job id is touched.
+    Returns the new quiz status, or None if nothing changed.
+    """
+    with transaction.atomic():
+        quiz = (
+            Quiz.objects.select_for_update()
+            .filter(id=quiz_id, status="GENERATING", ai_job_id=job["job_id"])
+            .first()
+        )
+        if quiz is None:
+            return None
+
+        questions = job.get("questions") or []
+        if job["status"] == "completed" and questions:
+            save_generated_questions(quiz, questions)
+        else:
+            logger.error(f"AI job {job['job_id']} for quiz {quiz_id} failed: {job}")
+            quiz.status = "FAILED"
+            quiz.save(update_fields=["status"])
+
+    return quiz.status
@@ -0,0 +1,51 @@
+from apps.courses.models import Option, Question, Quiz
+from django.db import transaction
+
+
+@transaction.atomic
+def save_generated_questions(quiz, questions_data):
+    """
+    Persist AI-generated questions and their options for ``quiz`` and mark
+    it READY, all in one transaction.
+
+    ``questions_data`` is the AI service payload:
+    [{"question": ..., "correct_answer": ..., "options": [...]}, ...]
+
+    Questions and options go in with one bulk INSERT each, so a quiz is
+    written in three statements regardless of size, and a crash mid-way
+    leaves no half-written quiz behind.
+    """
+    questions = _create_questions(quiz, questions_data)
+
+    Quiz.objects.filter(pk=quiz.pk).update(status="READY")
+    quiz.status = "READY"
+
+    return questions
+
+
+@transaction.atomic
+def append_generated_questions(quiz, questions_data):
+    """
+    Add questions and their options to ``quiz`` without changing its
+    status. Used on its own when questions arrive one by one from a stream.
+    """
+    return _create_questions(quiz, questions_data)
+
+
+def _create_questions(quiz, questions_data):
+    questions = Question.objects.bulk_create(
+        Question(
+            quiz=quiz,
+            question_text=q_data["question"],
+            correct_answer=q_data["correct_answer"],
+        )
+        for q_data in questions_data
+    )
+
+    Option.objects.bulk_create(
+        Option(question=question, option_text=opt_text)
+        for question, q_data in zip(questions, questions_data)
+        for opt_text in q_data.get("options", [])
+    )
+
+    return questions
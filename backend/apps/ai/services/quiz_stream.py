@@ -0,0 +1,55 @@
+import logging
+
+from apps.courses.models import Quiz
+from asgiref.sync import sync_to_async
+
+from .ai_quiz_client import AIQuizClient
+from .quiz_persistence import append_generated_questions
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+async def stream_and_save_questions(quiz, pdf_key, num_questions=5):
+    """
+    Relay the AI service's question stream for a GENERATING quiz, saving
+    each question as it arrives. Async generator of event dicts for the
+    client: {"type": "question", ...} per question, then "done" or "error".
+
+    Async so Django's ASGI handler sends each event as soon as it is
+    yielded; a sync iterator would be drained into a list first. Reading
+    the AI stream runs in a worker thread and saving in Django's sync
+    thread, one question at a time.
+
+    The quiz ends READY if at least one question was saved, else FAILED,
+    even when the client disconnects part-way.
+    """
+    questions = AIQuizClient.stream_quiz_from_pdf(pdf_key, num_questions)
+    read_next = sync_to_async(next, thread_sensitive=False)
+    save = sync_to_async(append_generated_questions)
+
+    count = 0
+    try:
+        while (q_data := await read_next(questions, _END)) is not _END:
+            await save(quiz, [q_data])
+            count += 1
+            yield {
+                "type": "question",
+                "quiz_id": quiz.id,
+                "index": count - 1,
+                "question": q_data,
+            }
+    except RuntimeError as e:
+        logger.error(f"Quiz {quiz.id} stream failed after {count} questions: {e}")
+        yield {"type": "error", "quiz_id": quiz.id, "detail": str(e)}
+    finally:
+        # Closes the AI service response when the client went away
+        try:
+            await sync_to_async(questions.close, thread_sensitive=False)()
+        except ValueError:
+            pass  # still blocked in a read; the response closes when collected
+        quiz.status = "READY" if count else "FAILED"
+        await sync_to_async(Quiz.objects.filter(pk=quiz.pk).update)(status=quiz.status)
+
+    yield {"type": "done", "quiz_id": quiz.id, "count": count, "status": quiz.status}
@@ -0,0 +1,32 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def reserve_ai_slot(tenant_id):
+    """
+    Count one AI task against the tenant's budget for the current window
+    (AI_TENANT_RATE_LIMIT tasks per AI_TENANT_RATE_WINDOW seconds).
+
+    Returns 0 when the task may go ahead, otherwise the number of seconds
+    to wait before trying again. The counter lives in the shared cache, so
+    the limit holds across all AI workers.
+    """
+    limit = settings.AI_TENANT_RATE_LIMIT
+    if not limit:
+        return 0
+
+    window = settings.AI_TENANT_RATE_WINDOW
+    now = time.time()
+    key = f"ai_rate:{tenant_id}:{int(now // window)}"
+
+    cache.add(key, 0, timeout=window + 5)
+    if cache.incr(key) <= limit:
+        return 0
+
+    # Spread deferred tasks over the next window instead of releasing
+    # them all at once when it opens
+    until_reset = window - now % window
+    return int(until_reset) + 1 + random.randint(0, window // 4)
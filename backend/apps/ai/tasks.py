@@ -1,18 +1,28 @@
 import logging
+import time
 
 from celery import shared_task
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+@shared_task(bind=True, max_retries=2, default_retry_delay=30, acks_late=True)
 def generate_lesson_quiz(self, quiz_id, lesson_id, tenant_id):
     """
     Celery task: generate an AI quiz for a lesson's PDF resources.
     Called automatically when a student marks a lesson as complete.
     The Quiz row already exists with status='GENERATING'.
     """
-    from apps.courses.models import Lesson, LessonResource, Option, Question, Quiz
+    from apps.courses.models import Lesson, Quiz
+
+    from .services.question_bank import (
+        assemble_quiz_from_bank,
+        lesson_pdf_resource,
+        pdf_key_for,
+        ready_bank_for_lesson,
+    )
+    from .services.quiz_jobs import start_quiz_generation
+    from .services.rate_limit import reserve_ai_slot
 
     try:
         quiz = Quiz.objects.get(id=quiz_id)
@@ -21,43 +31,39 @@ def generate_lesson_quiz(self, quiz_id, lesson_id, tenant_id):
         logger.error(f"Quiz or Lesson not found: {e}")
         return
 
-    # Find PDF resources for this lesson
-    pdf_resources = LessonResource.objects.filter(lesson=lesson).exclude(
-        file_type="link"
-    )
-    pdf_resource = None
-    for res in pdf_resources:
-        if res.file_url and (
-            res.file_url.endswith(".pdf") or "pdf" in res.file_type.lower()
-        ):
-            pdf_resource = res
-            break
+    if quiz.status != "GENERATING" or quiz.ai_job_id:
+        # Redelivered task; the quiz is already queued or finished
+        return
+
+    # The bank may have become ready since the quiz was requested
+    bank = ready_bank_for_lesson(lesson)
+    if bank is not None:
+        assemble_quiz_from_bank(quiz, bank)
+        logger.info(f"Auto-quiz {quiz.id} assembled from question bank {bank.id}")
+        return
 
+    pdf_resource = lesson_pdf_resource(lesson)
     if not pdf_resource:
         logger.warning(f"No PDF resource found for lesson {lesson_id}")
         quiz.status = "FAILED"
         quiz.save()
         return
 
-    # Extract S3 key from the full URL
-    import re
-
-    pdf_key = pdf_resource.file_url
-    s3_match = re.search(r"\.amazonaws\.com/(.+)$", pdf_key)
-    if s3_match:
-        from urllib.parse import unquote
+    pdf_key = pdf_key_for(pdf_resource)
 
-        pdf_key = unquote(s3_match.group(1))
-
-    # Call the AI service (no JWT needed — internal service call)
-    from .services.ai_quiz_client import AIQuizClient
+    wait = reserve_ai_slot(tenant_id)
+    if wait:
+        # Tenant is over its AI budget; try again in the next window.
+        # A fresh message keeps the error retries below untouched.
+        generate_lesson_quiz.apply_async(
+            (quiz_id, lesson_id, tenant_id), countdown=wait
+        )
+        return
 
+    # Queue generation on the AI service; the result comes back through
+    # the internal callback, so this worker is free again immediately
     try:
-        ai_result = AIQuizClient.generate_quiz_from_pdf(
-            pdf_key=pdf_key,
-            jwt_token="internal-celery-task",  # AI service trusts internal calls
-            num_questions=5,
-        )
+        start_quiz_generation(quiz, pdf_key, num_questions=5)
     except RuntimeError as e:
         logger.error(f"AI service error for lesson {lesson_id}: {e}")
         if self.request.retries < self.max_retries:
@@ -66,27 +72,168 @@ def generate_lesson_quiz(self, quiz_id, lesson_id, tenant_id):
         quiz.save()
         return
 
-    # Save questions and options
-    questions_data = ai_result.get("questions", [])
-    if not questions_data:
-        logger.warning(f"AI returned no questions for lesson {lesson_id}")
-        quiz.status = "FAILED"
-        quiz.save()
+    logger.info(f"Auto-quiz {quiz.id} queued on AI job {quiz.ai_job_id}")
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=60, acks_late=True)
+def build_question_bank(self, resource_id):
+    """
+    Celery task: pre-generate the question bank for a PDF resource, so
+    lesson quizzes can later be sampled from it without an AI round trip.
+    Queued when the resource is uploaded, and nightly for any PDF still
+    missing a bank.
+    """
+    from apps.courses.models import LessonResource, QuestionBank
+
+    from .services.question_bank import (
+        is_pdf_resource,
+        pdf_key_for,
+        start_question_bank,
+    )
+    from .services.rate_limit import reserve_ai_slot
+
+    try:
+        resource = LessonResource.objects.select_related("lesson").get(id=resource_id)
+    except LessonResource.DoesNotExist:
+        logger.warning(f"Lesson resource {resource_id} not found")
+        return
+
+    if not is_pdf_resource(resource):
         return
 
-    for q_data in questions_data:
-        question = Question.objects.create(
-            quiz=quiz,
-            question_text=q_data["question"],
-            correct_answer=q_data["correct_answer"],
+    bank, _ = QuestionBank.objects.get_or_create(
+        resource=resource, defaults={"tenant_id": resource.lesson.tenant_id}
+    )
+    if bank.status != "GENERATING" or bank.ai_job_id:
+        # Redelivered task; the bank is already queued or finished
+        return
+
+    wait = reserve_ai_slot(bank.tenant_id)
+    if wait:
+        build_question_bank.apply_async((resource_id,), countdown=wait)
+        return
+
+    try:
+        start_question_bank(bank, pdf_key_for(resource))
+    except RuntimeError as e:
+        logger.error(f"AI service error for question bank {bank.id}: {e}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        bank.status = "FAILED"
+        bank.save(update_fields=["status", "updated_at"])
+        return
+
+    logger.info(f"Question bank {bank.id} queued on AI job {bank.ai_job_id}")
+
+
+@shared_task
+def build_missing_question_banks(limit=200):
+    """
+    Off-peak backfill: queue banks for PDF resources that have none yet
+    (uploaded before banks existed) and retry banks that failed.
+    """
+    from apps.courses.models import LessonResource, QuestionBank
+    from django.db.models import Q
+    from django.utils import timezone
+
+    from .services.question_bank import is_pdf_resource
+
+    resources = (
+        LessonResource.objects.exclude(file_type="link")
+        .filter(Q(question_bank__isnull=True) | Q(question_bank__status="FAILED"))
+        .order_by("id")
+    )
+
+    queued = 0
+    for resource in resources.iterator():
+        if queued >= limit:
+            break
+        if not is_pdf_resource(resource):
+            continue
+
+        QuestionBank.objects.filter(resource=resource, status="FAILED").update(
+            status="GENERATING", ai_job_id="", updated_at=timezone.now()
         )
-        for opt_text in q_data.get("options", []):
-            Option.objects.create(question=question, option_text=opt_text)
+        build_question_bank.delay(resource.id)
+        queued += 1
+
+    return f"Queued {queued} question banks."
 
-    quiz.status = "READY"
-    quiz.save()
 
-    logger.info(
-        f"Auto-quiz {quiz.id} ready: {len(questions_data)} questions "
-        f"for lesson {lesson_id}"
+@shared_task
+def poll_quiz_jobs(stale_after_seconds=120):
+    """
+    Backstop for lost callbacks: poll the AI service for quizzes and
+    question banks that have been GENERATING for a while and apply any
+    finished jobs. A job the AI service can't find, or one still unfinished
+    after AI_JOB_DEADLINE_SECONDS, is failed.
+    """
+    from datetime import timedelta
+
+    from apps.courses.models import QuestionBank, Quiz
+    from django.conf import settings
+    from django.utils import timezone
+
+    from .services.question_bank import complete_question_bank_job
+    from .services.quiz_jobs import complete_quiz_job
+
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=stale_after_seconds)
+    deadline = now - timedelta(seconds=settings.AI_JOB_DEADLINE_SECONDS)
+
+    stale_quizzes = Quiz.objects.filter(
+        status="GENERATING", created_at__lt=cutoff
+    ).exclude(ai_job_id="")
+    stale_banks = QuestionBank.objects.filter(
+        status="GENERATING", updated_at__lt=cutoff
+    ).exclude(ai_job_id="")
+
+    applied = _apply_finished_jobs(
+        stale_quizzes.values_list("id", "ai_job_id", "created_at"),
+        complete_quiz_job,
+        deadline,
+    )
+    applied += _apply_finished_jobs(
+        stale_banks.values_list("id", "ai_job_id", "updated_at"),
+        complete_question_bank_job,
+        deadline,
     )
+
+    return f"Applied {applied} finished quiz jobs."
+
+
+def _apply_finished_jobs(rows, complete, deadline):
+    from .services.ai_quiz_client import AIQuizClient
+
+    applied = 0
+    for obj_id, job_id, started_at in rows:
+        try:
+            job = AIQuizClient.get_quiz_job(job_id)
+        except RuntimeError as e:
+            logger.warning(f"Could not poll AI job {job_id}: {e}")
+            continue
+
+        if job is None or job["status"] not in ("completed", "failed"):
+            # A missing job may just be a poll that reached a replica which
+            # hasn't seen it yet; only give up once the deadline has passed
+            if started_at >= deadline:
+                continue
+            job = {
+                "job_id": job_id,
+                "status": "failed",
+                "error": "Job did not finish before the deadline",
+            }
+
+        if complete(obj_id, job):
+            applied += 1
+
+    return applied
+
+
+@shared_task(acks_late=True)
+def load_test_ai_task(seconds=2.0):
+    """
+    Stand-in for an AI-heavy task that just holds a worker slot.
+    Used by the otp_latency_load_test command to build up an AI backlog.
+    """
+    time.sleep(seconds)
@@ -0,0 +1,195 @@
+from unittest.mock import patch
+
+import pytest
+from apps.accounts.models import User
+from apps.ai.tasks import build_missing_question_banks
+from apps.ai.views import QuestionBankJobCallbackView
+from apps.courses.models import (
+    BankQuestion,
+    Course,
+    Lesson,
+    LessonResource,
+    Question,
+    QuestionBank,
+    Quiz,
+)
+from apps.courses.views import LessonResourceViewSet
+from apps.enrollments.views import LessonProgressViewSet
+from apps.tenants.models import Tenant
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+BANK_QUESTIONS = [
+    {"question": f"Q{idx}?", "correct_answer": "A", "options": ["A", "B"]}
+    for idx in range(30)
+]
+
+
+@pytest.fixture
+def lesson():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9000000001", role="INSTRUCTOR"
+    )
+    course = Course.objects.create(tenant=tenant, title="Course", created_by=instructor)
+    return Lesson.objects.create(
+        tenant=tenant,
+        course=course,
+        title="Lesson",
+        video_url="https://example.com/video",
+        order=1,
+    )
+
+
+def _post(view, path, user, data):
+    request = APIRequestFactory().post(path, data, format="json")
+    force_authenticate(request, user=user)
+    return view(request)
+
+
+@pytest.mark.django_db
+def test_uploading_a_pdf_queues_its_question_bank(
+    lesson, django_capture_on_commit_callbacks
+):
+    view = LessonResourceViewSet.as_view({"post": "create"})
+    data = {
+        "lesson": lesson.id,
+        "title": "Notes",
+        "file_url": "https://bucket.s3.amazonaws.com/course-resources/notes.pdf",
+        "file_type": "pdf",
+    }
+
+    with patch(
+        "apps.ai.services.question_bank.AIQuizClient.submit_quiz_job",
+        return_value="job-1",
+    ) as submit, django_capture_on_commit_callbacks(execute=True):
+        response = _post(view, "/lesson-resources/", lesson.course.created_by, data)
+
+    assert response.status_code == 201
+    bank = QuestionBank.objects.get(resource_id=response.data["id"])
+    assert (bank.status, bank.ai_job_id) == ("GENERATING", "job-1")
+    assert submit.call_args.kwargs["pdf_key"] == "course-resources/notes.pdf"
+    assert submit.call_args.kwargs["num_questions"] == 30
+    assert submit.call_args.kwargs["callback_url"] == (
+        f"http://backend.test/internal/ai/question-banks/{bank.id}/job-complete/"
+    )
+
+
+@pytest.mark.django_db
+def test_callback_fills_the_bank_once(lesson):
+    resource = LessonResource.objects.create(
+        lesson=lesson, title="Notes", file_url="https://x.test/a.pdf", file_type="pdf"
+    )
+    bank = QuestionBank.objects.create(
+        resource=resource, tenant=lesson.tenant, ai_job_id="job-1"
+    )
+    payload = {"job_id": "job-1", "status": "completed", "questions": BANK_QUESTIONS}
+    view = QuestionBankJobCallbackView.as_view()
+
+    for _ in range(2):
+        request = APIRequestFactory().post(
+            f"/internal/ai/question-banks/{bank.id}/job-complete/",
+            payload,
+            format="json",
+        )
+        assert view(request, bank_id=bank.id).status_code == 200
+
+    bank.refresh_from_db()
+    assert bank.status == "READY"
+    assert BankQuestion.objects.filter(bank=bank).count() == 30
+
+
+@pytest.mark.django_db
+def test_lesson_completion_samples_quiz_from_ready_bank(lesson):
+    resource = LessonResource.objects.create(
+        lesson=lesson, title="Notes", file_url="https://x.test/a.pdf", file_type="pdf"
+    )
+    bank = QuestionBank.objects.create(
+        resource=resource, tenant=lesson.tenant, status="READY"
+    )
+    BankQuestion.objects.bulk_create(
+        BankQuestion(
+            bank=bank,
+            question_text=q["question"],
+            correct_answer=q["correct_answer"],
+            options=q["options"],
+        )
+        for q in BANK_QUESTIONS
+    )
+    student = User.objects.create(
+        tenant=lesson.tenant, phone_number="8000000001", role="STUDENT"
+    )
+
+    view = LessonProgressViewSet.as_view({"post": "create"})
+    with patch("apps.ai.tasks.generate_lesson_quiz.delay") as delay:
+        response = _post(view, "/lesson-progress/", student, {"lesson": lesson.id})
+
+    assert response.status_code == 200
+    assert response.data["data"]["quiz_status"] == "ready"
+    delay.assert_not_called()
+
+    quiz = Quiz.objects.get(id=response.data["data"]["quiz_id"])
+    assert quiz.status == "READY"
+    questions = Question.objects.filter(quiz=quiz)
+    assert questions.count() == 5
+    assert all(q.options.count() == 2 for q in questions)
+
+
+@pytest.mark.django_db
+def test_nightly_backfill_queues_missing_and_failed_banks(lesson):
+    missing, failed, ready, link = (
+        LessonResource.objects.create(
+            lesson=lesson, title=title, file_url=url, file_type=file_type
+        )
+        for title, url, file_type in [
+            ("Missing", "https://x.test/a.pdf", "pdf"),
+            ("Failed", "https://x.test/b.pdf", "pdf"),
+            ("Ready", "https://x.test/c.pdf", "pdf"),
+            ("Link", "https://x.test/page", "link"),
+        ]
+    )
+    QuestionBank.objects.create(resource=failed, tenant=lesson.tenant, status="FAILED")
+    QuestionBank.objects.create(resource=ready, tenant=lesson.tenant, status="READY")
+
+    with patch("apps.ai.tasks.build_question_bank.delay") as delay:
+        build_missing_question_banks()
+
+    assert sorted(call.args[0] for call in delay.call_args_list) == sorted(
+        [missing.id, failed.id]
+    )
+    assert QuestionBank.objects.get(resource=failed).status == "GENERATING"
+
+
+@pytest.mark.django_db
+def test_timed_out_bank_fails_and_lessons_fall_back_to_generation(
+    lesson, django_capture_on_commit_callbacks
+):
+    resource = LessonResource.objects.create(
+        lesson=lesson, title="Notes", file_url="https://x.test/a.pdf", file_type="pdf"
+    )
+    bank = QuestionBank.objects.create(
+        resource=resource, tenant=lesson.tenant, ai_job_id="job-1"
+    )
+    request = APIRequestFactory().post(
+        f"/internal/ai/question-banks/{bank.id}/job-complete/",
+        {"job_id": "job-1", "status": "failed", "error": "Generation timed out"},
+        format="json",
+    )
+    QuestionBankJobCallbackView.as_view()(request, bank_id=bank.id)
+
+    bank.refresh_from_db()
+    assert bank.status == "FAILED"
+    assert not BankQuestion.objects.filter(bank=bank).exists()
+
+    student = User.objects.create(
+        tenant=lesson.tenant, phone_number="8000000001", role="STUDENT"
+    )
+    view = LessonProgressViewSet.as_view({"post": "create"})
+    with patch(
+        "apps.ai.tasks.generate_lesson_quiz.delay"
+    ) as delay, django_capture_on_commit_callbacks(execute=True):
+        response = _post(view, "/lesson-progress/", student, {"lesson": lesson.id})
+
+    assert response.data["data"]["quiz_status"] == "generating"
+    delay.assert_called_once_with(
+        response.data["data"]["quiz_id"], lesson.id, lesson.tenant_id
+    )
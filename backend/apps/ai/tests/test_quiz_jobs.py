@@ -0,0 +1,132 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from apps.accounts.models import User
+from apps.ai.services.quiz_jobs import complete_quiz_job, start_quiz_generation
+from apps.ai.tasks import poll_quiz_jobs
+from apps.ai.views import QuizJobCallbackView
+from apps.courses.models import Course, Question, Quiz
+from apps.tenants.models import Tenant
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+QUESTIONS = [
+    {"question": "Q1?", "correct_answer": "A", "options": ["A", "B"]},
+    {"question": "Q2?", "correct_answer": "B", "options": ["A", "B"]},
+]
+
+
+@pytest.fixture
+def quiz():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9000000001", role="INSTRUCTOR"
+    )
+    course = Course.objects.create(tenant=tenant, title="Course", created_by=instructor)
+    return Quiz.objects.create(
+        course=course, tenant=tenant, title="Quiz", status="GENERATING"
+    )
+
+
+@pytest.mark.django_db
+def test_start_quiz_generation_records_job_and_callback(quiz):
+    with patch(
+        "apps.ai.services.quiz_jobs.AIQuizClient.submit_quiz_job",
+        return_value="job-1",
+    ) as submit:
+        start_quiz_generation(quiz, "course-resources/file.pdf")
+
+    quiz.refresh_from_db()
+    assert quiz.ai_job_id == "job-1"
+    assert quiz.status == "GENERATING"
+    assert submit.call_args.kwargs["callback_url"] == (
+        f"http://backend.test/internal/ai/quizzes/{quiz.id}/job-complete/"
+    )
+
+
+@pytest.mark.django_db
+def test_callback_saves_questions_once(quiz):
+    Quiz.objects.filter(pk=quiz.pk).update(ai_job_id="job-1")
+    payload = {"job_id": "job-1", "status": "completed", "questions": QUESTIONS}
+    view = QuizJobCallbackView.as_view()
+    factory = APIRequestFactory()
+
+    for _ in range(2):
+        request = factory.post(
+            f"/internal/ai/quizzes/{quiz.id}/job-complete/", payload, format="json"
+        )
+        response = view(request, quiz_id=quiz.id)
+        assert response.status_code == 200
+
+    quiz.refresh_from_db()
+    assert quiz.status == "READY"
+    assert Question.objects.filter(quiz=quiz).count() == 2
+
+
+@pytest.mark.django_db
+def test_callback_for_another_job_is_ignored(quiz):
+    Quiz.objects.filter(pk=quiz.pk).update(ai_job_id="job-2")
+
+    assert complete_quiz_job(quiz.id, {"job_id": "job-1", "status": "failed"}) is None
+
+    quiz.refresh_from_db()
+    assert quiz.status == "GENERATING"
+
+
+@pytest.mark.django_db
+def test_poll_quiz_jobs_applies_finished_jobs_and_waits_for_missing_ones(quiz):
+    other = Quiz.objects.create(
+        course=quiz.course, tenant=quiz.tenant, title="Other", status="GENERATING"
+    )
+    Quiz.objects.filter(pk=quiz.pk).update(ai_job_id="job-done")
+    Quiz.objects.filter(pk=other.pk).update(ai_job_id="job-missing")
+    Quiz.objects.update(created_at=timezone.now() - timedelta(minutes=10))
+
+    jobs = {
+        "job-done": {
+            "job_id": "job-done",
+            "status": "completed",
+            "questions": QUESTIONS,
+        },
+        "job-missing": None,
+    }
+    with patch(
+        "apps.ai.services.ai_quiz_client.AIQuizClient.get_quiz_job",
+        side_effect=jobs.get,
+    ):
+        poll_quiz_jobs()
+
+    quiz.refresh_from_db()
+    other.refresh_from_db()
+    assert quiz.status == "READY"
+    # Another AI replica may still be running it
+    assert other.status == "GENERATING"
+
+
+@pytest.mark.django_db
+def test_poll_quiz_jobs_fails_jobs_past_the_deadline(quiz, settings):
+    running = Quiz.objects.create(
+        course=quiz.course, tenant=quiz.tenant, title="Running", status="GENERATING"
+    )
+    Quiz.objects.filter(pk=quiz.pk).update(ai_job_id="job-missing")
+    Quiz.objects.filter(pk=running.pk).update(ai_job_id="job-running")
+    Quiz.objects.update(
+        created_at=timezone.now()
+        - timedelta(seconds=settings.AI_JOB_DEADLINE_SECONDS + 60)
+    )
+
+    jobs = {
+        "job-missing": None,
+        "job-running": {"job_id": "job-running", "status": "running"},
+    }
+    with patch(
+        "apps.ai.services.ai_quiz_client.AIQuizClient.get_quiz_job",
+        side_effect=jobs.get,
+    ):
+        poll_quiz_jobs()
+
+    quiz.refresh_from_db()
+    running.refresh_from_db()
+    assert quiz.status == "FAILED"
+    assert running.status == "FAILED"
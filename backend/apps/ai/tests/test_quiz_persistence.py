@@ -0,0 +1,59 @@
+import pytest
+from apps.accounts.models import User
+from apps.ai.services.quiz_persistence import save_generated_questions
+from apps.courses.models import Course, Option, Question, Quiz
+from apps.tenants.models import Tenant
+
+QUESTIONS = [
+    {
+        "question": f"Question {idx}?",
+        "correct_answer": "A",
+        "options": ["A", "B", "C", "D"],
+    }
+    for idx in range(5)
+]
+
+
+@pytest.fixture
+def quiz():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9000000001", role="INSTRUCTOR"
+    )
+    course = Course.objects.create(tenant=tenant, title="Course", created_by=instructor)
+    return Quiz.objects.create(
+        course=course, tenant=tenant, title="Quiz", status="GENERATING"
+    )
+
+
+@pytest.mark.django_db
+def test_save_generated_questions_uses_bulk_inserts(
+    quiz, django_assert_max_num_queries
+):
+    with django_assert_max_num_queries(5):
+        save_generated_questions(quiz, QUESTIONS)
+
+    quiz.refresh_from_db()
+    assert quiz.status == "READY"
+    assert Question.objects.filter(quiz=quiz).count() == 5
+    assert Option.objects.filter(question__quiz=quiz).count() == 20
+
+    question = Question.objects.get(quiz=quiz, question_text="Question 3?")
+    assert [o.option_text for o in question.options.order_by("id")] == [
+        "A",
+        "B",
+        "C",
+        "D",
+    ]
+
+
+@pytest.mark.django_db
+def test_save_generated_questions_is_all_or_nothing(quiz):
+    broken = QUESTIONS + [{"question": "No answer?", "options": ["A"]}]
+
+    with pytest.raises(KeyError):
+        save_generated_questions(quiz, broken)
+
+    quiz.refresh_from_db()
+    assert quiz.status == "GENERATING"
+    assert not Question.objects.filter(quiz=quiz).exists()
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from apps.accounts.models import User
+from apps.ai.services.quiz_stream import stream_and_save_questions
+from apps.ai.views import GenerateQuizStreamView
+from apps.courses.models import Course, Question, Quiz
+from apps.tenants.models import Tenant
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import path
+from rest_framework.authentication import BaseAuthentication
+
+QUESTIONS = [
+    {"question": "Q1?", "correct_answer": "A", "options": ["A", "B"]},
+    {"question": "Q2?", "correct_answer": "B", "options": ["A", "B"]},
+]
+
+
+@pytest.fixture
+def quiz():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9000000001", role="INSTRUCTOR"
+    )
+    course = Course.objects.create(tenant=tenant, title="Course", created_by=instructor)
+    return Quiz.objects.create(
+        course=course, tenant=tenant, title="Quiz", status="GENERATING"
+    )
+
+
+def _stream(*items):
+    def fake(pdf_key, num_questions):
+        for item in items:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    return patch(
+        "apps.ai.services.quiz_stream.AIQuizClient.stream_quiz_from_pdf",
+        side_effect=fake,
+    )
+
+
+@async_to_sync
+async def _collect(events):
+    return [event async for event in events]
+
+
+@pytest.mark.django_db
+def test_questions_are_saved_as_they_arrive(quiz):
+    @async_to_sync
+    async def first_then_rest(events):
+        first = await anext(events)
+        saved = await sync_to_async(Question.objects.filter(quiz=quiz).count)()
+        return first, saved, [event async for event in events]
+
+    with _stream(*QUESTIONS):
+        events = stream_and_save_questions(quiz, "file.pdf", 2)
+        first, saved, rest = first_then_rest(events)
+
+    assert first["type"] == "question"
+    assert saved == 1
+
+    assert [e["type"] for e in rest] == ["question", "done"]
+    assert rest[-1]["count"] == 2
+    quiz.refresh_from_db()
+    assert quiz.status == "READY"
+
+
+@pytest.mark.django_db
+def test_failure_part_way_keeps_saved_questions(quiz):
+    with _stream(QUESTIONS[0], RuntimeError("model crashed")):
+        events = _collect(stream_and_save_questions(quiz, "file.pdf", 2))
+
+    assert [e["type"] for e in events] == ["question", "error", "done"]
+    quiz.refresh_from_db()
+    assert quiz.status == "READY"
+    assert Question.objects.filter(quiz=quiz).count() == 1
+
+
+@pytest.mark.django_db
+def test_client_disconnect_still_finishes_the_quiz(quiz):
+    @async_to_sync
+    async def read_one_and_leave(events):
+        await anext(events)
+        await events.aclose()
+
+    with _stream(*QUESTIONS):
+        read_one_and_leave(stream_and_save_questions(quiz, "file.pdf", 2))
+
+    quiz.refresh_from_db()
+    assert quiz.status == "READY"
+
+
+@pytest.mark.django_db
+def test_empty_stream_fails_the_quiz(quiz):
+    with _stream():
+        events = _collect(stream_and_save_questions(quiz, "file.pdf", 2))
+
+    assert events[-1]["status"] == "FAILED"
+    quiz.refresh_from_db()
+    assert quiz.status == "FAILED"
+
+
+# ---------------------------------------------------------------------------
+# Through Django's ASGI handler, as served by daphne
+# ---------------------------------------------------------------------------
+
+
+class _UserAuthentication(BaseAuthentication):
+    user = None
+
+    def authenticate(self, request):
+        return (self.user, None)
+
+
+class _StreamView(GenerateQuizStreamView):
+    authentication_classes = [_UserAuthentication]
+
+
+urlpatterns = [path("stream/", _StreamView.as_view())]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_response_sends_each_event_as_it_is_generated(quiz, settings):
+    settings.ROOT_URLCONF = __name__
+    _UserAuthentication.user = quiz.course.created_by
+    first_sent = threading.Event()
+
+    def ai_stream(pdf_key, num_questions):
+        yield QUESTIONS[0]
+        # Only continues once the client has the first line; a relay that
+        # buffers the whole body would never get here
+        if not first_sent.wait(timeout=5):
+            raise RuntimeError("first question was not sent before the second")
+        yield QUESTIONS[1]
+
+    body = json.dumps({"course_id": quiz.course_id, "pdf_key": "file.pdf"}).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/stream/",
+        "raw_path": b"/stream/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"host", b"testserver"),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    messages = []
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # the client stays connected
+
+    async def send(message):
+        messages.append(message)
+        if message["type"] == "http.response.body" and message.get("body"):
+            first_sent.set()
+
+    with patch(
+        "apps.ai.services.quiz_stream.AIQuizClient.stream_quiz_from_pdf",
+        side_effect=ai_stream,
+    ):
+        async_to_sync(ASGIHandler())(scope, receive, send)
+
+    start = messages[0]
+    headers = dict(start["headers"])
+    assert start["status"] == 200
+    assert headers[b"X-Accel-Buffering"] == b"no"
+    assert headers[b"Cache-Control"] == b"no-cache"
+
+    chunks = [m["body"] for m in messages[1:] if m.get("body")]
+    events = [json.loads(chunk) for chunk in chunks]
+    # One event per body message, in order
+    assert [e["type"] for e in events] == ["question", "question", "done"]
+    assert events[-1]["status"] == "READY"
+    assert Question.objects.filter(quiz__course=quiz.course).count() == 2
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import pytest
+from apps.accounts.models import User
+from apps.ai.services.rate_limit import reserve_ai_slot
+from apps.ai.tasks import generate_lesson_quiz
+from apps.courses.models import Course, Lesson, LessonResource, Quiz
+from apps.tenants.models import Tenant
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def ai_rate_limit(settings):
+    settings.AI_TENANT_RATE_LIMIT = 2
+    settings.AI_TENANT_RATE_WINDOW = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_reserve_ai_slot_limits_each_tenant_separately():
+    assert [reserve_ai_slot(1) for _ in range(2)] == [0, 0]
+
+    wait = reserve_ai_slot(1)
+    assert 0 < wait <= 60 + 1 + 15
+
+    assert reserve_ai_slot(2) == 0
+
+
+def test_reserve_ai_slot_is_disabled_by_zero_limit(settings):
+    settings.AI_TENANT_RATE_LIMIT = 0
+    assert all(reserve_ai_slot(1) == 0 for _ in range(10))
+
+
+@pytest.mark.django_db
+def test_generate_lesson_quiz_is_deferred_over_the_tenant_limit():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9000000001", role="INSTRUCTOR"
+    )
+    course = Course.objects.create(tenant=tenant, title="Course", created_by=instructor)
+    lesson = Lesson.objects.create(
+        tenant=tenant,
+        course=course,
+        title="Lesson",
+        video_url="https://example.com/video",
+        order=1,
+    )
+    LessonResource.objects.create(
+        lesson=lesson, title="Notes", file_url="https://x.test/a.pdf", file_type="pdf"
+    )
+    quiz = Quiz.objects.create(
+        course=course, lesson=lesson, tenant=tenant, title="Quiz", status="GENERATING"
+    )
+    for _ in range(2):
+        reserve_ai_slot(tenant.id)
+
+    with patch(
+        "apps.ai.services.quiz_jobs.AIQuizClient.submit_quiz_job"
+    ) as submit, patch.object(generate_lesson_quiz, "apply_async") as apply_async:
+        generate_lesson_quiz(quiz.id, lesson.id, tenant.id)
+
+    submit.assert_not_called()
+    assert apply_async.call_args.args[0] == (quiz.id, lesson.id, tenant.id)
+    assert apply_async.call_args.kwargs["countdown"] > 0
+
+    quiz.refresh_from_db()
+    assert (quiz.status, quiz.ai_job_id) == ("GENERATING", "")
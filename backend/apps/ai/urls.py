@@ -3,6 +3,7 @@ from django.urls import path
 from .views import (
     CourseQuizzesView,
     GenerateQuizFromPDFView,
+    GenerateQuizStreamView,
     LessonQuizView,
     QuizDetailView,
 )
@@ -13,6 +14,11 @@ urlpatterns = [
         GenerateQuizFromPDFView.as_view(),
         name="generate-quiz-from-pdf",
     ),
+    path(
+        "quizzes/generate-from-pdf/stream/",
+        GenerateQuizStreamView.as_view(),
+        name="generate-quiz-from-pdf-stream",
+    ),
     path(
         "quizzes/<int:quiz_id>/",
         QuizDetailView.as_view(),
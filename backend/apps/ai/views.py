@@ -1,14 +1,17 @@
+import json
 import logging
 
-from apps.courses.models import Course, Option, Question, Quiz
+from apps.courses.models import Course, Quiz
 from apps.courses.serializers import QuizSerializer
-from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .services.ai_quiz_client import AIQuizClient
+from .services.question_bank import complete_question_bank_job
+from .services.quiz_jobs import complete_quiz_job, start_quiz_generation
+from .services.quiz_stream import stream_and_save_questions
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +22,44 @@ class GenerateQuizFromPDFView(APIView):
 
     Body: { "course_id": 1, "pdf_key": "course-resources/file.pdf", "num_questions": 5 }
 
-    Only INSTRUCTOR and ADMIN can generate quizzes.
+    Only INSTRUCTOR and ADMIN can generate quizzes. Returns 202 with the
+    quiz in GENERATING state; questions are filled in by the AI job.
     """
 
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        validated = self._validate(request)
+        if isinstance(validated, Response):
+            return validated
+        course, pdf_key, num_questions = validated
+        user = request.user
+
+        # ── Queue generation on the AI service ──
+        quiz = self._create_quiz(course, user)
+
+        try:
+            start_quiz_generation(quiz, pdf_key, num_questions=num_questions)
+        except RuntimeError as e:
+            logger.error(f"AI service error: {e}")
+            quiz.status = "FAILED"
+            quiz.save(update_fields=["status"])
+            return Response(
+                {"detail": str(e)},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
+
+        logger.info(
+            f"Quiz {quiz.id} queued on AI job {quiz.ai_job_id} "
+            f"for course {course.id} by user {user.id}"
+        )
+
+        # Poll GET /api/ai/quizzes/<id>/ until status is READY or FAILED
+        serializer = QuizSerializer(quiz)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    def _validate(self, request):
+        """Return (course, pdf_key, num_questions), or an error Response."""
         user = request.user
 
         # ── RBAC check ──
@@ -60,72 +95,97 @@ class GenerateQuizFromPDFView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # ── Extract JWT token from cookie to forward to AI service ──
-        jwt_token = request.COOKIES.get(
-            settings.SIMPLE_JWT.get("AUTH_COOKIE", "access_token")
+        return course, pdf_key, num_questions
+
+    def _create_quiz(self, course, user):
+        return Quiz.objects.create(
+            course=course,
+            tenant=user.tenant,
+            created_by=user,
+            title=f"AI Quiz – {course.title}",
+            status="GENERATING",
         )
-        if not jwt_token:
-            # Fallback: try Authorization header
-            auth_header = request.META.get("HTTP_AUTHORIZATION", "")
-            if auth_header.startswith("Bearer "):
-                jwt_token = auth_header.split(" ", 1)[1]
 
-        if not jwt_token:
-            return Response(
-                {"detail": "Could not extract JWT token."},
-                status=status.HTTP_401_UNAUTHORIZED,
-            )
 
-        # ── Call AI service ──
-        try:
-            ai_result = AIQuizClient.generate_quiz_from_pdf(
-                pdf_key=pdf_key,
-                jwt_token=jwt_token,
-                num_questions=num_questions,
-            )
-        except RuntimeError as e:
-            logger.error(f"AI service error: {e}")
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_502_BAD_GATEWAY,
-            )
+class GenerateQuizStreamView(GenerateQuizFromPDFView):
+    """
+    POST /api/ai/quizzes/generate-from-pdf/stream/
+
+    Same body and checks as generate-from-pdf, but relays questions as
+    NDJSON while the AI service produces them, saving each one as it
+    arrives:
+        {"type": "question", "quiz_id": 1, "index": 0, "question": {...}}
+        {"type": "done", "quiz_id": 1, "count": 5, "status": "READY"}
+    """
+
+    def post(self, request):
+        validated = self._validate(request)
+        if isinstance(validated, Response):
+            return validated
+        course, pdf_key, num_questions = validated
+
+        quiz = self._create_quiz(course, request.user)
+
+        async def lines():
+            async for event in stream_and_save_questions(quiz, pdf_key, num_questions):
+                yield json.dumps(event) + "\n"
+
+        response = StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+        # Flush every line through nginx instead of buffering the body
+        response["X-Accel-Buffering"] = "no"
+        response["Cache-Control"] = "no-cache"
+        return response
 
-        # ── Save Quiz → Questions → Options ──
-        questions_data = ai_result.get("questions", [])
 
-        if not questions_data:
+class QuizJobCallbackView(APIView):
+    """
+    POST /internal/ai/quizzes/<quiz_id>/job-complete/
+
+    Called by the AI service when a quiz job finishes.
+    Body: { "job_id": "...", "status": "completed" | "failed",
+            "questions": [...], "error": null }
+
+    Only reachable with the internal service token
+    (InternalServiceAuthMiddleware).
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request, quiz_id):
+        job = request.data
+        if not job.get("job_id") or job.get("status") not in ("completed", "failed"):
             return Response(
-                {"detail": "AI service returned no questions."},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {"detail": "job_id and a final status are required."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        quiz = Quiz.objects.create(
-            course=course,
-            tenant=user.tenant,
-            created_by=user,
-            title=f"AI Quiz – {course.title}",
-        )
+        # Duplicate or stale callbacks are acknowledged and ignored
+        new_status = complete_quiz_job(quiz_id, job)
+        return Response({"quiz_id": quiz_id, "status": new_status})
 
-        for q_data in questions_data:
-            question = Question.objects.create(
-                quiz=quiz,
-                question_text=q_data["question"],
-                correct_answer=q_data["correct_answer"],
-            )
 
-            for opt_text in q_data.get("options", []):
-                Option.objects.create(
-                    question=question,
-                    option_text=opt_text,
-                )
+class QuestionBankJobCallbackView(APIView):
+    """
+    POST /internal/ai/question-banks/<bank_id>/job-complete/
 
-        logger.info(
-            f"Quiz {quiz.id} created with {len(questions_data)} questions "
-            f"for course {course.id} by user {user.id}"
-        )
+    Called by the AI service when a question bank job finishes.
+    Same body as QuizJobCallbackView.
+    """
 
-        serializer = QuizSerializer(quiz)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request, bank_id):
+        job = request.data
+        if not job.get("job_id") or job.get("status") not in ("completed", "failed"):
+            return Response(
+                {"detail": "job_id and a final status are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        new_status = complete_question_bank_job(bank_id, job)
+        return Response({"question_bank_id": bank_id, "status": new_status})
 
 
 class QuizDetailView(APIView):
@@ -0,0 +1,57 @@
+import math
+
+from django.db.models import Aggregate
+
+
+class PercentileCont(Aggregate):
+    """
+    Continuous percentile of ``expression`` (``percentile`` between 0 and 1),
+    interpolated between neighbouring values like PostgreSQL's
+    ``percentile_cont``. NULLs are ignored; no rows gives NULL.
+    """
+
+    function = "PERCENTILE_CONT"
+    name = "PercentileCont"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, percentile, **extra):
+        percentile = float(percentile)
+        if not 0 <= percentile <= 1:
+            raise ValueError("percentile must be between 0 and 1.")
+        super().__init__(expression, percentile=percentile, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # No ordered-set aggregates; see register_sqlite_aggregates
+        return self.as_sql(
+            compiler,
+            connection,
+            template="%(function)s(%(expressions)s, %(percentile)s)",
+            **extra_context,
+        )
+
+
+class _SQLitePercentileCont:
+    def __init__(self):
+        self.values = []
+        self.percentile = 0.5
+
+    def step(self, value, percentile):
+        self.percentile = percentile
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        values = sorted(self.values)
+        position = (len(values) - 1) * self.percentile
+        lower, upper = math.floor(position), math.ceil(position)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def register_sqlite_aggregates(sender, connection, **kwargs):
+    """connection_created receiver; SQLite is only used by the test settings."""
+    if connection.vendor == "sqlite":
+        connection.connection.create_aggregate(
+            "PERCENTILE_CONT", 2, _SQLitePercentileCont
+        )
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class CommonConfig(AppConfig):
     name = "apps.common"
+
+    def ready(self):
+        from apps.common.aggregates import register_sqlite_aggregates
+        from django.db.backends.signals import connection_created
+
+        connection_created.connect(register_sqlite_aggregates)
@@ -1,6 +1,14 @@
 from django.contrib import admin
 
-from .models import Course, Lesson, Option, Question, Quiz
+from .models import (
+    BankQuestion,
+    Course,
+    Lesson,
+    Option,
+    Question,
+    QuestionBank,
+    Quiz,
+)
 
 
 @admin.register(Course)
@@ -62,3 +70,16 @@ class QuestionAdmin(admin.ModelAdmin):
     list_display = ("id", "question_text", "quiz", "correct_answer")
     search_fields = ("question_text",)
     inlines = [OptionInline]
+
+
+class BankQuestionInline(admin.TabularInline):
+    model = BankQuestion
+    extra = 0
+
+
+@admin.register(QuestionBank)
+class QuestionBankAdmin(admin.ModelAdmin):
+    list_display = ("id", "resource", "tenant", "status", "updated_at")
+    list_filter = ("tenant", "status")
+    readonly_fields = ("created_at", "updated_at")
+    inlines = [BankQuestionInline]
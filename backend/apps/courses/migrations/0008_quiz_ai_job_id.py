@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0007_quiz_lesson_quiz_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="ai_job_id",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
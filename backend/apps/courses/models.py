@@ -89,6 +89,8 @@ class Quiz(models.Model):
     )
     title = models.CharField(max_length=255)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="READY")
+    # AI service job producing this quiz while status is GENERATING
+    ai_job_id = models.CharField(max_length=64, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -115,3 +117,39 @@ class Option(models.Model):
 
     def __str__(self):
         return self.option_text
+
+
+class QuestionBank(models.Model):
+    """
+    Questions pre-generated once for a PDF resource. Lesson quizzes are
+    sampled from a READY bank instead of waiting on the AI service.
+    """
+
+    STATUS_CHOICES = Quiz.STATUS_CHOICES
+
+    resource = models.OneToOneField(
+        LessonResource, on_delete=models.CASCADE, related_name="question_bank"
+    )
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default="GENERATING"
+    )
+    # AI service job producing this bank while status is GENERATING
+    ai_job_id = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Question bank - {self.resource.title}"
+
+
+class BankQuestion(models.Model):
+    bank = models.ForeignKey(
+        QuestionBank, on_delete=models.CASCADE, related_name="questions"
+    )
+    question_text = models.TextField()
+    correct_answer = models.CharField(max_length=255)
+    options = models.JSONField(default=list)
+
+    def __str__(self):
+        return self.question_text[:80]
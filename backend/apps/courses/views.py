@@ -1,3 +1,9 @@
+from apps.enrollments.services import (
+    invalidate_course_progress_stats,
+    rebuild_course_progress,
+    refresh_course_total_lessons,
+)
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import serializers, status
@@ -7,7 +13,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from .models import Course, Lesson, LessonResource
+from .models import Course, Lesson, LessonResource, QuestionBank
 from .permissions import IsAdminOrInstructor
 from .serializers import (
     CourseListSerializer,
@@ -118,8 +124,34 @@ class LessonViewSet(ModelViewSet):
             queryset = queryset.filter(course_id=course_id)
         return queryset
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(tenant=self.request.user.tenant, created_by=self.request.user)
+        lesson = serializer.save(
+            tenant=self.request.user.tenant, created_by=self.request.user
+        )
+        if lesson.is_active:
+            refresh_course_total_lessons(lesson.course)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        was_active = serializer.instance.is_active
+        previous_course = serializer.instance.course
+        lesson = serializer.save()
+
+        if lesson.course != previous_course:
+            rebuild_course_progress(course=previous_course)
+            rebuild_course_progress(course=lesson.course)
+        elif lesson.is_active != was_active:
+            refresh_course_total_lessons(lesson.course)
+        else:
+            invalidate_course_progress_stats(lesson.course_id)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        course = instance.course
+        instance.delete()
+        # Deleting a lesson also drops its LessonProgress rows
+        rebuild_course_progress(course=course)
 
 
 class LessonResourceViewSet(ModelViewSet):
@@ -144,5 +176,22 @@ class LessonResourceViewSet(ModelViewSet):
             raise serializers.ValidationError(
                 "You cannot add resources to lessons from another tenant."
             )
-        serializer.save()
+        resource = serializer.save()
         print("DEBUG: Resource saved successfully")
+        self._queue_question_bank(resource)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous_url = serializer.instance.file_url
+        resource = serializer.save()
+        if resource.file_url != previous_url:
+            # Questions from the old file no longer apply
+            QuestionBank.objects.filter(resource=resource).delete()
+            self._queue_question_bank(resource)
+
+    def _queue_question_bank(self, resource):
+        from apps.ai.services.question_bank import is_pdf_resource
+        from apps.ai.tasks import build_question_bank
+
+        if is_pdf_resource(resource):
+            transaction.on_commit(lambda: build_question_bank.delay(resource.id))
@@ -0,0 +1,175 @@
+import uuid
+
+from apps.accounts.models import User
+from apps.courses.models import Course, Lesson
+from apps.enrollments.models import Enrollment, EnrollmentRequest, LessonProgress
+from apps.notifications.models import Notification
+from apps.tenants.models import Tenant
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+
+# Indexes added for tenant-scoped hot queries, grouped by table
+TENANT_INDEXES = {
+    "enrollment": ["enroll_tenant_course_idx"],
+    "enrollment_request": ["enroll_req_tenant_status_idx"],
+    "lesson_progress": ["progress_student_done_idx", "progress_lesson_done_idx"],
+    "notification": ["notif_user_created_idx", "notif_user_unread_idx"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway tenant and print query plans for the tenant-scoped "
+        "hot queries with and without the composite indexes. "
+        "Everything runs in one transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=500)
+        parser.add_argument("--courses", type=int, default=20)
+        parser.add_argument("--lessons", type=int, default=10)
+        parser.add_argument("--notifications", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            tenant, student, course = self._seed(options)
+            self._analyze()
+
+            queries = self._hot_queries(tenant, student, course)
+            after = {label: qs.explain() for label, qs in queries}
+
+            # Plain DROP INDEX statements so the rollback below restores them
+            with connection.cursor() as cursor:
+                for names in TENANT_INDEXES.values():
+                    for name in names:
+                        cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+            self._analyze()
+            before = {label: qs.explain() for label, qs in queries}
+
+            transaction.set_rollback(True)
+
+        for label, _ in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} =="))
+            self.stdout.write(self.style.WARNING("-- before --"))
+            self.stdout.write(before[label])
+            self.stdout.write(self.style.SUCCESS("-- after --"))
+            self.stdout.write(after[label])
+
+    def _seed(self, options):
+        run = uuid.uuid4().hex[:6]
+        tenant = Tenant.objects.create(name=f"explain-{run}")
+
+        instructor = User.objects.create(
+            tenant=tenant, phone_number=f"i{run}", role="INSTRUCTOR"
+        )
+        students = User.objects.bulk_create(
+            User(tenant=tenant, phone_number=f"s{run}{idx}", role="STUDENT")
+            for idx in range(options["students"])
+        )
+        courses = Course.objects.bulk_create(
+            Course(tenant=tenant, title=f"Course {idx}", created_by=instructor)
+            for idx in range(options["courses"])
+        )
+        lessons = Lesson.objects.bulk_create(
+            Lesson(
+                tenant=tenant,
+                course=course,
+                title=f"Lesson {order}",
+                video_url="https://example.com/video",
+                order=order,
+            )
+            for course in courses
+            for order in range(options["lessons"])
+        )
+
+        lessons_by_course = {}
+        for lesson in lessons:
+            lessons_by_course.setdefault(lesson.course_id, []).append(lesson)
+
+        enrollments = []
+        requests = []
+        progress = []
+        for idx, student in enumerate(students):
+            course = courses[idx % len(courses)]
+            enrollments.append(
+                Enrollment(tenant=tenant, student=student, course=course)
+            )
+            requests.append(
+                EnrollmentRequest(
+                    tenant=tenant,
+                    student=student,
+                    course=course,
+                    status="PENDING" if idx % 10 == 0 else "APPROVED",
+                )
+            )
+            course_lessons = lessons_by_course[course.id]
+            for order, lesson in enumerate(course_lessons):
+                progress.append(
+                    LessonProgress(
+                        tenant=tenant,
+                        student=student,
+                        lesson=lesson,
+                        is_completed=order <= idx % len(course_lessons),
+                    )
+                )
+
+        Enrollment.objects.bulk_create(enrollments, batch_size=1000)
+        EnrollmentRequest.objects.bulk_create(requests, batch_size=1000)
+        LessonProgress.objects.bulk_create(progress, batch_size=1000)
+        Notification.objects.bulk_create(
+            (
+                Notification(
+                    tenant=tenant,
+                    user=student,
+                    type="SYSTEM",
+                    message="Seeded notification",
+                    is_read=idx % 5 != 0,
+                )
+                for student in students
+                for idx in range(options["notifications"])
+            ),
+            batch_size=1000,
+        )
+
+        return tenant, students[0], courses[0]
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def _hot_queries(self, tenant, student, course):
+        return [
+            (
+                "Enrollment(tenant, course)",
+                Enrollment.objects.filter(tenant=tenant, course=course),
+            ),
+            (
+                "LessonProgress(tenant, student, is_completed)",
+                LessonProgress.objects.filter(
+                    tenant=tenant, student=student, is_completed=True
+                ),
+            ),
+            (
+                "LessonProgress(tenant, lesson, is_completed) grouped",
+                LessonProgress.objects.filter(
+                    tenant=tenant, lesson__course=course, is_completed=True
+                )
+                .values("lesson")
+                .annotate(completed=Count("id")),
+            ),
+            (
+                "Notification list (tenant, user, created_at)",
+                Notification.objects.filter(tenant=tenant, user=student)[:20],
+            ),
+            (
+                "Notification unread (tenant, user, is_read)",
+                Notification.objects.filter(
+                    tenant=tenant, user=student, is_read=False
+                ).order_by("-created_at")[:20],
+            ),
+            (
+                "EnrollmentRequest(tenant, status)",
+                EnrollmentRequest.objects.filter(tenant=tenant, status="PENDING"),
+            ),
+        ]
@@ -0,0 +1,29 @@
+from apps.enrollments.services import rebuild_course_progress
+from apps.tenants.models import Tenant
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized CourseProgress table from lesson progress"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant", type=int, help="Only rebuild rows for this tenant id"
+        )
+
+    def handle(self, *args, **options):
+        tenant = None
+        if options["tenant"] is not None:
+            try:
+                tenant = Tenant.objects.get(id=options["tenant"])
+            except Tenant.DoesNotExist:
+                raise CommandError(f"Tenant {options['tenant']} does not exist")
+
+        scope = f"tenant {tenant.id}" if tenant else "all tenants"
+        self.stdout.write(f"Rebuilding course progress for {scope}...")
+
+        written = rebuild_course_progress(tenant=tenant)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {written} course progress rows.")
+        )
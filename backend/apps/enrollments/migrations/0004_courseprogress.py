@@ -0,0 +1,116 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_course_progress(apps, schema_editor):
+    # Same rows as services.rebuild_course_progress, on the historical models
+    CourseProgress = apps.get_model("enrollments", "CourseProgress")
+    Enrollment = apps.get_model("enrollments", "Enrollment")
+    LessonProgress = apps.get_model("enrollments", "LessonProgress")
+    Lesson = apps.get_model("courses", "Lesson")
+
+    lessons = (
+        Lesson.objects.filter(course=OuterRef("course"), is_active=True)
+        .values("course")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    completed = LessonProgress.objects.filter(
+        tenant=OuterRef("tenant"),
+        student=OuterRef("student"),
+        lesson__course=OuterRef("course"),
+        is_completed=True,
+    ).values("student")
+
+    rows = Enrollment.objects.annotate(
+        total=Coalesce(Subquery(lessons, output_field=IntegerField()), 0),
+        completed=Coalesce(
+            Subquery(
+                completed.annotate(total=Count("id")).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        latest=Subquery(
+            completed.annotate(latest=Max("completed_at")).values("latest")
+        ),
+    ).values_list(
+        "tenant_id", "student_id", "course_id", "total", "completed", "latest"
+    )
+
+    CourseProgress.objects.bulk_create(
+        (
+            CourseProgress(
+                tenant_id=tenant_id,
+                student_id=student_id,
+                course_id=course_id,
+                total_lessons=total,
+                completed_count=completed_count,
+                last_activity=latest,
+            )
+            for tenant_id, student_id, course_id, total, completed_count, latest in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0007_quiz_lesson_quiz_status"),
+        ("enrollments", "0003_enrollmentrequest"),
+        ("tenants", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("total_lessons", models.PositiveIntegerField(default=0)),
+                ("last_activity", models.DateTimeField(blank=True, null=True)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="student_progress",
+                        to="courses.course",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="course_progress",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="tenants.tenant"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "course progress",
+                "unique_together": {("tenant", "student", "course")},
+            },
+        ),
+        migrations.RunPython(backfill_course_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0007_quiz_lesson_quiz_status"),
+        ("enrollments", "0004_courseprogress"),
+        ("tenants", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="enrollment",
+            index=models.Index(
+                fields=["tenant", "course"], name="enroll_tenant_course_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="enrollmentrequest",
+            index=models.Index(
+                fields=["tenant", "status"], name="enroll_req_tenant_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lessonprogress",
+            index=models.Index(
+                condition=models.Q(("is_completed", True)),
+                fields=["tenant", "student"],
+                name="progress_student_done_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lessonprogress",
+            index=models.Index(
+                condition=models.Q(("is_completed", True)),
+                fields=["tenant", "lesson"],
+                name="progress_lesson_done_idx",
+            ),
+        ),
+    ]
@@ -24,6 +24,10 @@ class Enrollment(models.Model):
     class Meta:
         unique_together = ("tenant", "student", "course")
         ordering = ["-enrolled_at"]
+        # (tenant, student) is already the prefix of the unique index above
+        indexes = [
+            models.Index(fields=["tenant", "course"], name="enroll_tenant_course_idx"),
+        ]
 
     def __str__(self):
         return f"{self.student.phone_number} → {self.course.title}"
@@ -45,6 +49,18 @@ class LessonProgress(models.Model):
 
     class Meta:
         unique_together = ("tenant", "student", "lesson")
+        indexes = [
+            models.Index(
+                fields=["tenant", "student"],
+                condition=models.Q(is_completed=True),
+                name="progress_student_done_idx",
+            ),
+            models.Index(
+                fields=["tenant", "lesson"],
+                condition=models.Q(is_completed=True),
+                name="progress_lesson_done_idx",
+            ),
+        ]
 
     def mark_completed(self):
         self.is_completed = True
@@ -86,6 +102,40 @@ class EnrollmentRequest(models.Model):
 
     class Meta:
         unique_together = ("tenant", "student", "course")
+        indexes = [
+            models.Index(
+                fields=["tenant", "status"], name="enroll_req_tenant_status_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.student.phone_number} → {self.course.title}"
+
+
+class CourseProgress(models.Model):
+    """
+    Denormalized per-student course progress.
+    Kept in step with LessonProgress and Lesson changes by
+    apps.enrollments.services so dashboards read one row per course.
+    """
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE)
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="course_progress",
+    )
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="student_progress"
+    )
+
+    completed_count = models.PositiveIntegerField(default=0)
+    total_lessons = models.PositiveIntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("tenant", "student", "course")
+        verbose_name_plural = "course progress"
+
+    def __str__(self):
+        return f"{self.student.phone_number} - {self.course.title}"
@@ -0,0 +1,251 @@
+from apps.common.aggregates import PercentileCont
+from apps.courses.models import Lesson
+from apps.enrollments.models import CourseProgress, Enrollment, LessonProgress
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+COURSE_PROGRESS_STATS_TTL = 300  # seconds
+HOUR_PERCENTILES = (25, 50, 75, 90)
+
+
+def active_lessons_subquery(course_ref="course"):
+    """Correlated COUNT of active lessons for the course at ``course_ref``."""
+    lessons = (
+        Lesson.objects.filter(course=OuterRef(course_ref), is_active=True)
+        .values("course")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(lessons, output_field=IntegerField()), 0)
+
+
+def create_course_progress(enrollment):
+    """Create the progress row for a new enrollment."""
+    progress, _ = CourseProgress.objects.get_or_create(
+        tenant=enrollment.tenant,
+        student=enrollment.student,
+        course=enrollment.course,
+        defaults={
+            "total_lessons": Lesson.objects.filter(
+                course=enrollment.course, is_active=True
+            ).count()
+        },
+    )
+    invalidate_course_progress_stats(enrollment.course_id)
+    return progress
+
+
+@transaction.atomic
+def record_lesson_completed(lesson_progress):
+    """
+    Add one completed lesson to the student's course progress.
+    Call only when the LessonProgress row has just become completed.
+    """
+    course = lesson_progress.lesson.course
+    lookup = {
+        "tenant": lesson_progress.tenant,
+        "student": lesson_progress.student,
+        "course": course,
+    }
+
+    updated = CourseProgress.objects.filter(**lookup).update(
+        completed_count=F("completed_count") + 1,
+        last_activity=lesson_progress.completed_at,
+    )
+    if not updated:
+        # No row yet: count everything the student already completed in the
+        # course, including this lesson, rather than starting from zero
+        done = LessonProgress.objects.filter(
+            tenant=lesson_progress.tenant,
+            student=lesson_progress.student,
+            lesson__course=course,
+            is_completed=True,
+        ).aggregate(count=Count("id"), latest=Max("completed_at"))
+
+        _, created = CourseProgress.objects.get_or_create(
+            **lookup,
+            defaults={
+                "total_lessons": Lesson.objects.filter(
+                    course=course, is_active=True
+                ).count(),
+                "completed_count": done["count"],
+                "last_activity": done["latest"],
+            },
+        )
+        if not created:
+            # Another completion created the row first
+            CourseProgress.objects.filter(**lookup).update(
+                completed_count=F("completed_count") + 1,
+                last_activity=lesson_progress.completed_at,
+            )
+    invalidate_course_progress_stats(course.id)
+
+
+def refresh_course_total_lessons(course):
+    """Re-sync total_lessons after a lesson is added, activated or deactivated."""
+    total = Lesson.objects.filter(course=course, is_active=True).count()
+    CourseProgress.objects.filter(course=course).update(total_lessons=total)
+    invalidate_course_progress_stats(course.id)
+
+
+def rebuild_course_progress(tenant=None, course=None):
+    """
+    Recompute CourseProgress from Enrollment and LessonProgress.
+    Scoped to a tenant and/or course when given, otherwise rebuilds everything.
+    Returns the number of rows written.
+    """
+    enrollments = Enrollment.objects.all()
+    stale = CourseProgress.objects.all()
+
+    if tenant is not None:
+        enrollments = enrollments.filter(tenant=tenant)
+        stale = stale.filter(tenant=tenant)
+
+    if course is not None:
+        enrollments = enrollments.filter(course=course)
+        stale = stale.filter(course=course)
+
+    completed = LessonProgress.objects.filter(
+        tenant=OuterRef("tenant"),
+        student=OuterRef("student"),
+        lesson__course=OuterRef("course"),
+        is_completed=True,
+    ).values("student")
+
+    rows = enrollments.annotate(
+        total=active_lessons_subquery(),
+        completed=Coalesce(
+            Subquery(
+                completed.annotate(total=Count("id")).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        latest=Subquery(
+            completed.annotate(latest=Max("completed_at")).values("latest")
+        ),
+    ).values_list(
+        "tenant_id", "student_id", "course_id", "total", "completed", "latest"
+    )
+
+    with transaction.atomic():
+        stale.delete()
+        created = CourseProgress.objects.bulk_create(
+            [
+                CourseProgress(
+                    tenant_id=tenant_id,
+                    student_id=student_id,
+                    course_id=course_id,
+                    total_lessons=total,
+                    completed_count=completed_count,
+                    last_activity=latest,
+                )
+                for tenant_id, student_id, course_id, total, completed_count, latest in rows.iterator()
+            ],
+            batch_size=1000,
+        )
+
+    if course is not None:
+        invalidate_course_progress_stats(course.id)
+
+    return len(created)
+
+
+# ---------------------------------------------------------------------------
+# Per-lesson completion stats for the instructor analytics page
+# ---------------------------------------------------------------------------
+
+
+def course_progress_stats_key(course_id):
+    return f"course_progress_stats:{course_id}"
+
+
+def invalidate_course_progress_stats(course_id):
+    """Drop the cached lesson stats once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(course_progress_stats_key(course_id)))
+
+
+def get_course_progress_stats(course):
+    """Return per-lesson completion stats for a course, cached per course."""
+    key = course_progress_stats_key(course.id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = build_course_progress_stats(course)
+        cache.set(key, stats, COURSE_PROGRESS_STATS_TTL)
+    return stats
+
+
+def build_course_progress_stats(course):
+    """
+    Per-lesson completion counts plus time-to-complete percentiles.
+
+    Counts and percentiles come from one GROUP BY over LessonProgress, with
+    the percentiles computed by the database (percentile_cont), so only one
+    row per lesson is read back whatever the number of students.
+    Time to complete is measured from the student's enrollment in the course.
+    """
+    tenant = course.tenant_id
+    total_students = Enrollment.objects.filter(tenant=tenant, course=course).count()
+
+    enrolled_at = Enrollment.objects.filter(
+        tenant=tenant, student=OuterRef("student"), course=course
+    ).values("enrolled_at")[:1]
+    duration = F("completed_at") - Subquery(enrolled_at)
+
+    rows = {
+        row["lesson"]: row
+        for row in LessonProgress.objects.filter(
+            tenant=tenant, lesson__course=course, is_completed=True
+        )
+        .values("lesson")
+        .annotate(
+            completed=Count("id"),
+            **{f"p{q}": PercentileCont(duration, q / 100) for q in HOUR_PERCENTILES},
+        )
+    }
+
+    lesson_stats = []
+    for lesson_id, title in Lesson.objects.filter(
+        tenant=tenant, course=course
+    ).values_list("id", "title"):
+        row = rows.get(lesson_id, {})
+        completed_count = row.get("completed", 0)
+        percentiles = _hour_percentiles(row)
+
+        lesson_stats.append(
+            {
+                "lesson_id": lesson_id,
+                "lesson_title": title,
+                "completed_students": completed_count,
+                "total_students": total_students,
+                "completion_rate": round(
+                    (
+                        (completed_count / total_students * 100)
+                        if total_students > 0
+                        else 0
+                    ),
+                    1,
+                ),
+                "median_hours_to_complete": percentiles and percentiles["p50"],
+                "hours_to_complete_percentiles": percentiles,
+            }
+        )
+
+    return {
+        "course_id": course.id,
+        "course_title": course.title,
+        "total_students": total_students,
+        "lessons": lesson_stats,
+    }
+
+
+def _hour_percentiles(row):
+    """Durations from the stats row as hours; None when nothing was timed."""
+    if row.get("p50") is None:
+        return None
+    return {
+        f"p{q}": round(max(row[f"p{q}"].total_seconds() / 3600, 0.0), 2)
+        for q in HOUR_PERCENTILES
+    }
@@ -0,0 +1,240 @@
+import importlib
+from datetime import timedelta
+
+import pytest
+from apps.accounts.models import User
+from apps.courses.models import Course, Lesson
+from apps.enrollments.models import CourseProgress, Enrollment, LessonProgress
+from apps.enrollments.services import (
+    build_course_progress_stats,
+    create_course_progress,
+    get_course_progress_stats,
+    rebuild_course_progress,
+    record_lesson_completed,
+    refresh_course_total_lessons,
+)
+from apps.tenants.models import Tenant
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.fixture
+def enrolled_student():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9999999999", role="INSTRUCTOR"
+    )
+    student = User.objects.create(
+        tenant=tenant, phone_number="8888888888", role="STUDENT"
+    )
+    course = Course.objects.create(
+        tenant=tenant, title="Django Mastery", created_by=instructor
+    )
+    lessons = [
+        Lesson.objects.create(
+            tenant=tenant,
+            course=course,
+            title=f"Lesson {order}",
+            video_url="https://example.com/video",
+            order=order,
+        )
+        for order in range(4)
+    ]
+    enrollment = Enrollment.objects.create(
+        tenant=tenant, student=student, course=course
+    )
+    return enrollment, lessons
+
+
+@pytest.mark.django_db
+def test_course_progress_tracks_completions_and_lesson_changes(enrolled_student):
+    enrollment, lessons = enrolled_student
+    progress = create_course_progress(enrollment)
+    assert (progress.completed_count, progress.total_lessons) == (0, 4)
+
+    for lesson in lessons[:2]:
+        record_lesson_completed(
+            LessonProgress.objects.create(
+                tenant=enrollment.tenant,
+                student=enrollment.student,
+                lesson=lesson,
+                is_completed=True,
+                completed_at=timezone.now(),
+            )
+        )
+
+    lessons[3].is_active = False
+    lessons[3].save()
+    refresh_course_total_lessons(enrollment.course)
+
+    progress.refresh_from_db()
+    assert progress.completed_count == 2
+    assert progress.total_lessons == 3
+    assert progress.last_activity is not None
+
+
+def _complete(enrollment, lesson, completed_at=None):
+    return LessonProgress.objects.create(
+        tenant=enrollment.tenant,
+        student=enrollment.student,
+        lesson=lesson,
+        is_completed=True,
+        completed_at=completed_at or timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+def test_first_recorded_completion_counts_earlier_lessons(enrolled_student):
+    enrollment, lessons = enrolled_student
+    # Completed before CourseProgress rows were maintained
+    earlier = timezone.now() - timedelta(days=3)
+    _complete(enrollment, lessons[0], earlier)
+    _complete(enrollment, lessons[1], earlier)
+
+    latest = _complete(enrollment, lessons[2])
+    record_lesson_completed(latest)
+
+    progress = CourseProgress.objects.get(
+        student=enrollment.student, course=enrollment.course
+    )
+    assert (progress.completed_count, progress.total_lessons) == (3, 4)
+    assert progress.last_activity == latest.completed_at
+
+
+@pytest.mark.django_db
+def test_migration_backfills_course_progress(enrolled_student):
+    enrollment, lessons = enrolled_student
+    _complete(enrollment, lessons[0])
+    migration = importlib.import_module(
+        "apps.enrollments.migrations.0004_courseprogress"
+    )
+
+    migration.backfill_course_progress(apps, None)
+
+    progress = CourseProgress.objects.get(
+        student=enrollment.student, course=enrollment.course
+    )
+    assert (progress.completed_count, progress.total_lessons) == (1, 4)
+    assert progress.last_activity is not None
+
+
+@pytest.mark.django_db
+def test_rebuild_course_progress_matches_lesson_progress(enrolled_student):
+    enrollment, lessons = enrolled_student
+    LessonProgress.objects.create(
+        tenant=enrollment.tenant,
+        student=enrollment.student,
+        lesson=lessons[0],
+        is_completed=True,
+        completed_at=timezone.now(),
+    )
+    LessonProgress.objects.create(
+        tenant=enrollment.tenant,
+        student=enrollment.student,
+        lesson=lessons[1],
+        is_completed=False,
+    )
+
+    call_command("rebuild_course_progress")
+
+    progress = CourseProgress.objects.get(
+        student=enrollment.student, course=enrollment.course
+    )
+    assert progress.completed_count == 1
+    assert progress.total_lessons == 4
+
+    lessons[0].delete()
+    assert rebuild_course_progress(course=enrollment.course) == 1
+
+    progress = CourseProgress.objects.get(
+        student=enrollment.student, course=enrollment.course
+    )
+    assert (progress.completed_count, progress.total_lessons) == (0, 3)
+    assert progress.last_activity is None
+
+
+@pytest.mark.django_db
+def test_course_progress_stats_are_grouped_and_invalidated(
+    enrolled_student, django_assert_max_num_queries, django_capture_on_commit_callbacks
+):
+    enrollment, lessons = enrolled_student
+    cache.clear()
+    Enrollment.objects.filter(pk=enrollment.pk).update(
+        enrolled_at=timezone.now() - timedelta(hours=10)
+    )
+    record_lesson_completed(
+        LessonProgress.objects.create(
+            tenant=enrollment.tenant,
+            student=enrollment.student,
+            lesson=lessons[0],
+            is_completed=True,
+            completed_at=timezone.now(),
+        )
+    )
+
+    with django_assert_max_num_queries(4):
+        stats = get_course_progress_stats(enrollment.course)
+
+    first, second = stats["lessons"][:2]
+    assert stats["total_students"] == 1
+    assert (first["completed_students"], first["completion_rate"]) == (1, 100.0)
+    assert 9.9 < first["median_hours_to_complete"] < 10.1
+    assert second["completed_students"] == 0
+    assert second["hours_to_complete_percentiles"] is None
+
+    with django_assert_max_num_queries(0):
+        assert get_course_progress_stats(enrollment.course) == stats
+
+    with django_capture_on_commit_callbacks(execute=True):
+        record_lesson_completed(
+            LessonProgress.objects.create(
+                tenant=enrollment.tenant,
+                student=enrollment.student,
+                lesson=lessons[1],
+                is_completed=True,
+                completed_at=timezone.now(),
+            )
+        )
+    refreshed = get_course_progress_stats(enrollment.course)
+    assert refreshed["lessons"][1]["completed_students"] == 1
+
+
+@pytest.mark.django_db
+def test_course_progress_percentiles_are_computed_in_the_database(enrolled_student):
+    enrollment, lessons = enrolled_student
+    now = timezone.now()
+    hours = [1, 2, 4, 8, 16]
+    for idx, taken in enumerate(hours):
+        if idx == 0:
+            student = enrollment.student
+        else:
+            student = User.objects.create(
+                tenant=enrollment.tenant, phone_number=f"700000000{idx}"
+            )
+            Enrollment.objects.create(
+                tenant=enrollment.tenant, student=student, course=enrollment.course
+            )
+        Enrollment.objects.filter(student=student).update(
+            enrolled_at=now - timedelta(hours=taken)
+        )
+        LessonProgress.objects.create(
+            tenant=enrollment.tenant,
+            student=student,
+            lesson=lessons[0],
+            is_completed=True,
+            completed_at=now,
+        )
+
+    first = build_course_progress_stats(enrollment.course)["lessons"][0]
+
+    # Interpolated like statistics.quantiles(method="inclusive")
+    assert first["completed_students"] == 5
+    assert first["hours_to_complete_percentiles"] == {
+        "p25": 2.0,
+        "p50": 4.0,
+        "p75": 8.0,
+        "p90": 12.8,
+    }
+    assert first["median_hours_to_complete"] == 4.0
@@ -0,0 +1,80 @@
+import pytest
+from apps.accounts.models import User
+from apps.courses.models import Course, Lesson
+from apps.enrollments.models import Enrollment, LessonProgress
+from apps.enrollments.services import rebuild_course_progress
+from apps.enrollments.views import EnrollmentViewSet
+from apps.tenants.models import Tenant
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+list_view = EnrollmentViewSet.as_view({"get": "list"})
+
+
+def _seed_courses(tenant, instructor, student, count):
+    for idx in range(count):
+        course = Course.objects.create(
+            tenant=tenant, title=f"Course {idx}", created_by=instructor
+        )
+        lessons = [
+            Lesson.objects.create(
+                tenant=tenant,
+                course=course,
+                title=f"Lesson {order}",
+                video_url="https://example.com/video",
+                order=order,
+            )
+            for order in range(3)
+        ]
+        Enrollment.objects.create(tenant=tenant, student=student, course=course)
+        LessonProgress.objects.create(
+            tenant=tenant, student=student, lesson=lessons[0], is_completed=True
+        )
+    rebuild_course_progress(tenant=tenant)
+
+
+def _get(user, **params):
+    request = APIRequestFactory().get("/api/enrollments/", params)
+    force_authenticate(request, user=user)
+    return list_view(request)
+
+
+@pytest.mark.django_db
+def test_enrollment_list_reports_progress_per_course():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9999999999", role="INSTRUCTOR"
+    )
+    student = User.objects.create(
+        tenant=tenant, phone_number="8888888888", role="STUDENT"
+    )
+    _seed_courses(tenant, instructor, student, count=2)
+
+    response = _get(student)
+
+    assert response.status_code == 200
+    page = response.data["data"]
+    assert page["count"] == 2
+    for row in page["results"]:
+        assert row["total_lessons"] == 3
+        assert row["completed_lessons"] == 1
+        assert row["progress_percentage"] == 33
+
+
+@pytest.mark.django_db
+def test_enrollment_list_query_count_is_independent_of_course_count(
+    django_assert_max_num_queries,
+):
+    tenant = Tenant.objects.create(name="Test Tenant")
+    instructor = User.objects.create(
+        tenant=tenant, phone_number="9999999999", role="INSTRUCTOR"
+    )
+    student = User.objects.create(
+        tenant=tenant, phone_number="8888888888", role="STUDENT"
+    )
+    _seed_courses(tenant, instructor, student, count=15)
+
+    # One COUNT for the paginator, one SELECT for the page, one tenant lookup.
+    with django_assert_max_num_queries(3):
+        response = _get(student)
+
+    assert len(response.data["data"]["results"]) == 15
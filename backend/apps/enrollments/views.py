@@ -2,7 +2,12 @@ from apps.common.exceptions import AppException
 from apps.common.permissions import IsAdmin, IsInstructor
 from apps.common.responses import success_response
 from apps.courses.models import Course, Lesson
-from apps.enrollments.models import Enrollment, EnrollmentRequest, LessonProgress
+from apps.enrollments.models import (
+    CourseProgress,
+    Enrollment,
+    EnrollmentRequest,
+    LessonProgress,
+)
 from apps.enrollments.serializers import (
     EnrollmentCreateSerializer,
     EnrollmentRequestCreateSerializer,
@@ -10,9 +15,17 @@ from apps.enrollments.serializers import (
     LessonProgressCreateSerializer,
     LessonProgressListSerializer,
 )
+from apps.enrollments.services import (
+    active_lessons_subquery,
+    create_course_progress,
+    get_course_progress_stats,
+    record_lesson_completed,
+)
 from apps.enrollments.tasks import enrollment_approved_task
 from apps.notifications.services import create_notification
 from django.db import transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -53,24 +66,40 @@ class EnrollmentViewSet(ModelViewSet):
         return EnrollmentCreateSerializer
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
         user = request.user
         tenant = user.tenant
 
-        # Enhanced response with progress data
+        queryset = self.get_queryset().select_related("course")
+
+        if user.role == "STUDENT":
+            # Students read their denormalized CourseProgress row; the lesson
+            # count subquery only covers rows not yet backfilled.
+            progress = CourseProgress.objects.filter(
+                tenant=tenant, student=user, course=OuterRef("course")
+            )
+            queryset = queryset.annotate(
+                total_lessons=Coalesce(
+                    Subquery(progress.values("total_lessons")),
+                    active_lessons_subquery(),
+                ),
+                completed_lessons=Coalesce(
+                    Subquery(progress.values("completed_count")), 0
+                ),
+            )
+        else:
+            queryset = queryset.annotate(
+                total_lessons=active_lessons_subquery(),
+                completed_lessons=Value(0),
+            )
+
+        page = self.paginate_queryset(queryset)
+        enrollments = page if page is not None else queryset
+
         enrollments_data = []
-        for enrollment in queryset:
+        for enrollment in enrollments:
             course = enrollment.course
-            total_lessons = Lesson.objects.filter(course=course, is_active=True).count()
-            completed_lessons = 0
-
-            if user.role == "STUDENT":
-                completed_lessons = LessonProgress.objects.filter(
-                    tenant=tenant,
-                    student=user,
-                    lesson__course=course,
-                    is_completed=True,
-                ).count()
+            total_lessons = enrollment.total_lessons
+            completed_lessons = enrollment.completed_lessons
 
             progress_percentage = round(
                 (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0
@@ -79,7 +108,7 @@ class EnrollmentViewSet(ModelViewSet):
             enrollments_data.append(
                 {
                     "id": enrollment.id,
-                    "course": enrollment.course.id,
+                    "course": course.id,
                     "course_title": course.title,
                     "course_description": course.description,
                     "enrolled_at": enrollment.enrolled_at,
@@ -89,6 +118,9 @@ class EnrollmentViewSet(ModelViewSet):
                 }
             )
 
+        if page is not None:
+            enrollments_data = self.get_paginated_response(enrollments_data).data
+
         return Response(
             success_response(
                 data=enrollments_data, message="Enrollments fetched successfully"
@@ -100,7 +132,9 @@ class EnrollmentViewSet(ModelViewSet):
             data=request.data, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
-        enrollment = serializer.save()
+        with transaction.atomic():
+            enrollment = serializer.save()
+            create_course_progress(enrollment)
 
         return Response(
             success_response(
@@ -158,15 +192,19 @@ class LessonProgressViewSet(ModelViewSet):
             )
 
         # Get or create progress — handle already-exists gracefully
-        progress, created = LessonProgress.objects.get_or_create(
-            tenant=tenant,
-            student=user,
-            lesson=lesson,
-            defaults={"is_completed": True, "completed_at": timezone.now()},
-        )
+        with transaction.atomic():
+            progress, created = LessonProgress.objects.get_or_create(
+                tenant=tenant,
+                student=user,
+                lesson=lesson,
+                defaults={"is_completed": True, "completed_at": timezone.now()},
+            )
 
-        if not created and not progress.is_completed:
-            progress.mark_completed()
+            if created:
+                record_lesson_completed(progress)
+            elif not progress.is_completed:
+                progress.mark_completed()
+                record_lesson_completed(progress)
 
         # ── Auto-Quiz Generation ──
         quiz_status = None
@@ -192,7 +230,11 @@ class LessonProgressViewSet(ModelViewSet):
                     quiz_id = existing_quiz.id
                     quiz_status = existing_quiz.status.lower()
                 else:
-                    # Create placeholder quiz and dispatch Celery task
+                    from apps.ai.services.question_bank import (
+                        assemble_quiz_from_bank,
+                        ready_bank_for_lesson,
+                    )
+
                     new_quiz = Quiz.objects.create(
                         course=lesson.course,
                         lesson=lesson,
@@ -202,15 +244,23 @@ class LessonProgressViewSet(ModelViewSet):
                         status="GENERATING",
                     )
                     quiz_id = new_quiz.id
-                    quiz_status = "generating"
 
-                    from apps.ai.tasks import generate_lesson_quiz
-
-                    transaction.on_commit(
-                        lambda: generate_lesson_quiz.delay(
-                            new_quiz.id, lesson.id, tenant.id
+                    bank = ready_bank_for_lesson(lesson)
+                    if bank is not None:
+                        # Sample from the pre-generated bank; no AI call
+                        assemble_quiz_from_bank(new_quiz, bank)
+                        quiz_status = "ready"
+                    else:
+                        # No bank yet: generate on demand in the background
+                        quiz_status = "generating"
+
+                        from apps.ai.tasks import generate_lesson_quiz
+
+                        transaction.on_commit(
+                            lambda: generate_lesson_quiz.delay(
+                                new_quiz.id, lesson.id, tenant.id
+                            )
                         )
-                    )
         except Exception as e:
             import logging
 
@@ -379,6 +429,7 @@ class AdminEnrollmentRequestReviewAPIView(APIView):
                 enrollment = Enrollment.objects.create(
                     tenant=tenant, student=enroll_req.student, course=enroll_req.course
                 )
+                create_course_progress(enrollment)
 
                 enroll_req.status = "APPROVED"
                 enroll_req.save()
@@ -451,6 +502,7 @@ class InstructorEnrollmentRequestReviewAPIView(APIView):
                 enrollment = Enrollment.objects.create(
                     tenant=tenant, student=enroll_req.student, course=enroll_req.course
                 )
+                create_course_progress(enrollment)
 
                 enroll_req.status = "APPROVED"
                 enroll_req.save()
@@ -489,33 +541,9 @@ class InstructorCourseProgressAPIView(APIView):
                 "Course not found or access denied", status.HTTP_404_NOT_FOUND
             )
 
-        total_students = Enrollment.objects.filter(tenant=tenant, course=course).count()
-
-        lessons = Lesson.objects.filter(tenant=tenant, course=course)
-
-        lesson_stats = []
-        for lesson in lessons:
-            completed_count = LessonProgress.objects.filter(
-                tenant=tenant, lesson=lesson, is_completed=True
-            ).count()
-
-            lesson_stats.append(
-                {
-                    "lesson_id": lesson.id,
-                    "lesson_title": lesson.title,
-                    "completed_students": completed_count,
-                    "total_students": total_students,
-                }
-            )
-
         return Response(
             success_response(
-                data={
-                    "course_id": course.id,
-                    "course_title": course.title,
-                    "total_students": total_students,
-                    "lessons": lesson_stats,
-                },
+                data=get_course_progress_stats(course),
                 message="Course progress fetched successfully",
             )
         )
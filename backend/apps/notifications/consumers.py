@@ -1,5 +1,10 @@
+from collections import deque
+
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
+# Notification ids remembered per connection to drop redelivered pushes
+SEEN_NOTIFICATIONS_LIMIT = 256
+
 
 class NotificationConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
@@ -10,6 +15,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             return
 
         self.group_name = f"user_{user.id}"
+        self.seen_ids = deque(maxlen=SEEN_NOTIFICATIONS_LIMIT)
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
 
@@ -21,11 +27,20 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
 
     async def notify(self, event):
         """
-        Receives messages from channel layer
+        Receives messages from channel layer.
+        Pushes are at-least-once, so repeats of a seen id are dropped here
+        and the id is forwarded for clients to dedup across reconnects.
         """
+        notification_id = event.get("id")
+        if notification_id is not None:
+            if notification_id in self.seen_ids:
+                return
+            self.seen_ids.append(notification_id)
+
         await self.send_json(
             {
                 "type": "notification",
+                "id": notification_id,
                 "message": event["message"],
                 "created_at": event["created_at"],
             }
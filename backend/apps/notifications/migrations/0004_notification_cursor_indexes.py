@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_tenant_scoped_indexes"),
+        ("tenants", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="notification",
+            name="notif_user_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="notification",
+            name="notif_user_unread_idx",
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["tenant", "user", "-created_at", "-id"],
+                name="notif_user_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["tenant", "user", "-created_at", "-id"],
+                name="notif_user_unread_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:25
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_pushed(apps, schema_editor):
+    # Rows created before the outbox were already pushed inline
+    Notification = apps.get_model("notifications", "Notification")
+    Notification.objects.filter(pushed_at__isnull=True).update(
+        pushed_at=F("created_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0004_notification_cursor_indexes"),
+        ("tenants", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="pushed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_pushed, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("pushed_at__isnull", True)),
+                fields=["id"],
+                name="notif_unpushed_idx",
+            ),
+        ),
+    ]
@@ -15,9 +15,27 @@ class Notification(models.Model):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set once the WebSocket push went out; NULL rows form the push outbox
+    pushed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["tenant", "user", "-created_at", "-id"],
+                name="notif_user_created_idx",
+            ),
+            models.Index(
+                fields=["tenant", "user", "-created_at", "-id"],
+                condition=models.Q(is_read=False),
+                name="notif_user_unread_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(pushed_at__isnull=True),
+                name="notif_unpushed_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.type} → {self.user.phone_number}"
@@ -1,22 +1,245 @@
+import asyncio
+import logging
+
+from apps.common.redis import redis_client
 from apps.notifications.models import Notification
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# The badge shows "99+" past this, so counting stops one row later
+UNREAD_BADGE_LIMIT = 99
+
+# Audiences larger than this are fanned out by a Celery task
+BULK_NOTIFICATION_INLINE_LIMIT = 50
+BULK_NOTIFICATION_BATCH_SIZE = 1000
 
 
 def create_notification(*, tenant, user, type, message):
     notification = Notification.objects.create(
         tenant=tenant, user=user, type=type, message=message
     )
+    increment_unread_count(user.id)
 
-    # Send via WebSocket
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f"user_{user.id}",
-        {
-            "type": "notify",
-            "message": notification.message,
-            "created_at": notification.created_at.isoformat(),
-        },
-    )
+    # WebSocket push happens in a worker once the row is committed
+    enqueue_push([notification.id])
 
     return notification
+
+
+def create_notifications_bulk(*, tenant, users, type, message):
+    """
+    Create the same notification for many users with bulk_create.
+    ``users`` may hold User instances or user ids.
+    """
+    user_ids = [getattr(user, "pk", user) for user in users]
+    notifications = []
+
+    for start in range(0, len(user_ids), BULK_NOTIFICATION_BATCH_SIZE):
+        notifications.extend(
+            Notification.objects.bulk_create(
+                Notification(tenant=tenant, user_id=user_id, type=type, message=message)
+                for user_id in user_ids[start : start + BULK_NOTIFICATION_BATCH_SIZE]
+            )
+        )
+
+    increment_unread_counts(user_ids)
+    enqueue_push([notification.id for notification in notifications])
+
+    return notifications
+
+
+def dispatch_notifications_bulk(*, tenant, users, type, message):
+    """
+    Notify many users without holding up the request.
+    Small audiences are handled inline; larger ones go to a Celery task
+    once the current transaction commits.
+    """
+    user_ids = [getattr(user, "pk", user) for user in users]
+
+    if len(user_ids) <= BULK_NOTIFICATION_INLINE_LIMIT:
+        return create_notifications_bulk(
+            tenant=tenant, users=user_ids, type=type, message=message
+        )
+
+    from apps.notifications.tasks import create_notifications_bulk_task
+
+    transaction.on_commit(
+        lambda: create_notifications_bulk_task.delay(
+            tenant_id=tenant.id, user_ids=user_ids, type=type, message=message
+        )
+    )
+    return None
+
+
+# ---------------------------------------------------------------------------
+# WebSocket push outbox
+#
+# Notification rows with pushed_at IS NULL are the outbox. After commit a
+# Celery task pushes them and stamps pushed_at; the beat sweeper retries
+# anything left behind (broker down, worker killed mid-batch). Delivery is
+# at-least-once, so every event carries the notification id for dedup.
+# ---------------------------------------------------------------------------
+
+
+def enqueue_push(notification_ids):
+    from apps.notifications.tasks import push_notifications_task
+
+    def _enqueue():
+        try:
+            push_notifications_task.delay(notification_ids=notification_ids)
+        except Exception:
+            # The sweeper picks these rows up on its next run
+            logger.exception("Could not enqueue notification push")
+
+    transaction.on_commit(_enqueue)
+
+
+def push_pending_notifications(notification_ids=None, older_than=None, limit=None):
+    """
+    Push unpushed notifications over the channel layer and mark them pushed.
+    Rows are locked with SKIP LOCKED, so concurrent drainers never share a row.
+    Returns the number of notifications pushed.
+    """
+    limit = limit or BULK_NOTIFICATION_BATCH_SIZE
+    pending = Notification.objects.filter(pushed_at__isnull=True)
+
+    if notification_ids is not None:
+        pending = pending.filter(id__in=notification_ids)
+    if older_than is not None:
+        pending = pending.filter(created_at__lt=older_than)
+
+    with transaction.atomic():
+        batch = list(
+            pending.select_for_update(skip_locked=True)
+            .order_by("id")
+            .only("id", "user_id", "message", "created_at")[:limit]
+        )
+        if not batch:
+            return 0
+
+        _push_notifications(batch)
+        Notification.objects.filter(id__in=[n.id for n in batch]).update(
+            pushed_at=timezone.now()
+        )
+
+    return len(batch)
+
+
+def _push_notifications(notifications):
+    """Send one batch of pushes concurrently on a single event loop."""
+    channel_layer = get_channel_layer()
+
+    async def _send_all():
+        await asyncio.gather(
+            *(
+                channel_layer.group_send(
+                    f"user_{notification.user_id}",
+                    {
+                        "type": "notify",
+                        "id": notification.id,
+                        "message": notification.message,
+                        "created_at": notification.created_at.isoformat(),
+                    },
+                )
+                for notification in notifications
+            )
+        )
+
+    async_to_sync(_send_all)()
+
+
+def unread_badge_count(user):
+    """
+    Unread count for the badge, capped at UNREAD_BADGE_LIMIT + 1.
+    The LIMIT keeps the COUNT on the partial unread index instead of
+    walking every unread row.
+    """
+    return Notification.objects.filter(
+        tenant_id=user.tenant_id, user=user, is_read=False
+    )[: UNREAD_BADGE_LIMIT + 1].count()
+
+
+# ---------------------------------------------------------------------------
+# Redis unread counter
+#
+# One integer per user, adjusted after each commit. A missing key means
+# "unknown" and is seeded from the database on the next read, so increments
+# and decrements only touch keys that already exist. Drift is repaired by
+# notifications.tasks.reconcile_unread_counts_task.
+# ---------------------------------------------------------------------------
+
+
+def unread_count_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def get_unread_count(user):
+    """
+    Unread badge count: one Redis GET, seeded from unread_badge_count on a
+    miss. Both paths are capped the same way, so the badge never depends on
+    which one answered.
+    """
+    if redis_client is None:
+        return unread_badge_count(user)
+
+    key = unread_count_key(user.id)
+    cached = redis_client.get(key)
+    if cached is not None:
+        return min(int(cached), UNREAD_BADGE_LIMIT + 1)
+
+    count = unread_badge_count(user)
+    # A capped count is only a lower bound and would drift once the user
+    # starts reading; such users keep using the (LIMITed) query instead.
+    # NX so a concurrent increment that seeded first is not overwritten.
+    if count <= UNREAD_BADGE_LIMIT:
+        redis_client.set(key, count, nx=True)
+    return count
+
+
+def increment_unread_count(user_id, amount=1):
+    increment_unread_counts([user_id], amount)
+
+
+def increment_unread_counts(user_ids, amount=1):
+    """Increment the existing counters of many users in two pipelined trips."""
+    if redis_client is None:
+        return
+
+    def _incr():
+        keys = [unread_count_key(user_id) for user_id in user_ids]
+
+        pipe = redis_client.pipeline()
+        for key in keys:
+            pipe.exists(key)
+        existing = pipe.execute()
+
+        pipe = redis_client.pipeline()
+        for key, exists in zip(keys, existing):
+            if exists:
+                pipe.incrby(key, amount)
+        pipe.execute()
+
+    transaction.on_commit(_incr)
+
+
+def decrement_unread_count(user_id, amount=1):
+    if redis_client is None:
+        return
+
+    def _decr():
+        key = unread_count_key(user_id)
+        if redis_client.exists(key) and redis_client.decrby(key, amount) < 0:
+            redis_client.set(key, 0)
+
+    transaction.on_commit(_decr)
+
+
+def reset_unread_count(user_id):
+    if redis_client is None:
+        return
+
+    transaction.on_commit(lambda: redis_client.set(unread_count_key(user_id), 0))
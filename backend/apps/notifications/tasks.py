@@ -0,0 +1,91 @@
+from celery import shared_task
+
+
+@shared_task
+def create_notifications_bulk_task(tenant_id, user_ids, type, message):
+    """Fan a notification out to a large audience off the request thread."""
+    from apps.notifications.services import create_notifications_bulk
+    from apps.tenants.models import Tenant
+
+    tenant = Tenant.objects.get(id=tenant_id)
+    notifications = create_notifications_bulk(
+        tenant=tenant, users=user_ids, type=type, message=message
+    )
+
+    return f"Created {len(notifications)} notifications."
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=10)
+def push_notifications_task(self, notification_ids):
+    """Push freshly committed notifications over the channel layer."""
+    from apps.notifications.services import push_pending_notifications
+
+    pushed = 0
+    try:
+        while True:
+            count = push_pending_notifications(notification_ids=notification_ids)
+            if not count:
+                break
+            pushed += count
+    except Exception as e:
+        # Rows stay unpushed; retry here, the sweeper is the backstop
+        raise self.retry(exc=e)
+
+    return f"Pushed {pushed} notifications."
+
+
+@shared_task
+def sweep_unpushed_notifications_task(grace_seconds=30):
+    """
+    Push notifications whose immediate push never ran or failed.
+    The grace period leaves fresh rows to push_notifications_task.
+    """
+    from datetime import timedelta
+
+    from apps.notifications.services import push_pending_notifications
+    from django.utils import timezone
+
+    older_than = timezone.now() - timedelta(seconds=grace_seconds)
+
+    pushed = 0
+    while True:
+        count = push_pending_notifications(older_than=older_than)
+        if not count:
+            break
+        pushed += count
+
+    return f"Swept {pushed} unpushed notifications."
+
+
+@shared_task
+def reconcile_unread_counts_task(batch_size=500):
+    """
+    Overwrite every cached unread counter with the database count.
+    Repairs drift from lost on_commit hooks or bulk updates.
+    """
+    from apps.common.redis import redis_client
+    from apps.notifications.models import Notification
+    from apps.notifications.services import unread_count_key
+    from django.db.models import Count
+
+    if redis_client is None:
+        return "Redis not configured; nothing to reconcile."
+
+    prefix = unread_count_key("")
+    keys = list(redis_client.scan_iter(match=f"{prefix}*", count=batch_size))
+
+    for start in range(0, len(keys), batch_size):
+        user_ids = [int(key[len(prefix) :]) for key in keys[start : start + batch_size]]
+        counts = dict(
+            Notification.objects.filter(user_id__in=user_ids, is_read=False)
+            .values("user")
+            .annotate(unread=Count("id"))
+            .values_list("user", "unread")
+        )
+
+        pipe = redis_client.pipeline()
+        for user_id in user_ids:
+            pipe.set(unread_count_key(user_id), counts.get(user_id, 0))
+        pipe.execute()
+
+    return f"Reconciled {len(keys)} unread counters."
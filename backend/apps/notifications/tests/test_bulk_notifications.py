@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from apps.accounts.models import User
+from apps.notifications.models import Notification
+from apps.notifications.services import (
+    create_notifications_bulk,
+    dispatch_notifications_bulk,
+)
+from apps.tenants.models import Tenant
+
+
+@pytest.fixture
+def channel_layer():
+    layer = MagicMock(group_send=AsyncMock())
+    with patch("apps.notifications.services.get_channel_layer", return_value=layer):
+        yield layer
+
+
+def _students(tenant, count):
+    return User.objects.bulk_create(
+        User(tenant=tenant, phone_number=f"7{idx:09d}") for idx in range(count)
+    )
+
+
+@pytest.mark.django_db
+def test_create_notifications_bulk_inserts_and_pushes_in_batches(
+    channel_layer, django_assert_max_num_queries, django_capture_on_commit_callbacks
+):
+    tenant = Tenant.objects.create(name="Test Tenant")
+    students = _students(tenant, 30)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with django_assert_max_num_queries(1):
+            created = create_notifications_bulk(
+                tenant=tenant, users=students, type="COURSE", message="New lesson"
+            )
+
+        # Nothing is pushed until the transaction commits
+        assert channel_layer.group_send.await_count == 0
+
+    assert len(created) == 30
+    assert Notification.objects.filter(tenant=tenant, is_read=False).count() == 30
+    assert not Notification.objects.filter(pushed_at__isnull=True).exists()
+    assert channel_layer.group_send.await_count == 30
+    groups = {call.args[0] for call in channel_layer.group_send.await_args_list}
+    assert groups == {f"user_{student.id}" for student in students}
+
+
+@pytest.mark.django_db
+def test_dispatch_notifications_bulk_defers_large_audiences(
+    channel_layer, django_capture_on_commit_callbacks
+):
+    tenant = Tenant.objects.create(name="Test Tenant")
+    students = _students(tenant, 60)
+
+    with patch(
+        "apps.notifications.tasks.create_notifications_bulk_task.delay"
+    ) as delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            result = dispatch_notifications_bulk(
+                tenant=tenant, users=students, type="COURSE", message="Broadcast"
+            )
+
+    assert result is None
+    assert not Notification.objects.exists()
+    delay.assert_called_once()
+    assert len(delay.call_args.kwargs["user_ids"]) == 60
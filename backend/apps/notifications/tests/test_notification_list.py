@@ -0,0 +1,118 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from apps.accounts.models import User
+from apps.notifications.models import Notification
+from apps.notifications.views import (
+    NotificationListAPIView,
+    UnreadNotificationCountAPIView,
+)
+from apps.tenants.models import Tenant
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+list_view = NotificationListAPIView.as_view()
+count_view = UnreadNotificationCountAPIView.as_view()
+
+
+def _get(view, user, **params):
+    request = APIRequestFactory().get("/api/notifications/", params)
+    force_authenticate(request, user=user)
+    return view(request)
+
+
+@pytest.fixture
+def user_with_notifications():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    user = User.objects.create(tenant=tenant, phone_number="7777777777")
+    Notification.objects.bulk_create(
+        Notification(
+            tenant=tenant,
+            user=user,
+            type="SYSTEM",
+            message=f"Notification {idx}",
+            is_read=idx % 2 == 0,
+        )
+        for idx in range(25)
+    )
+    return user
+
+
+@pytest.mark.django_db
+def test_notification_list_pages_with_cursor(user_with_notifications):
+    first = _get(list_view, user_with_notifications).data["data"]
+
+    assert len(first["results"]) == 20
+    assert first["previous"] is None
+    assert first["unread_count"] == 12
+
+    cursor = parse_qs(urlparse(first["next"]).query)["cursor"][0]
+    second = _get(list_view, user_with_notifications, cursor=cursor).data["data"]
+
+    assert len(second["results"]) == 5
+    assert second["next"] is None
+    seen = {row["id"] for row in first["results"] + second["results"]}
+    assert len(seen) == 25
+
+
+@pytest.mark.django_db
+def test_notification_list_unread_filter(user_with_notifications):
+    page = _get(list_view, user_with_notifications, unread=1).data["data"]
+
+    assert len(page["results"]) == 12
+    assert not any(row["is_read"] for row in page["results"])
+
+
+@pytest.mark.django_db
+def test_unread_badge_count_is_capped(user_with_notifications):
+    Notification.objects.bulk_create(
+        Notification(
+            tenant=user_with_notifications.tenant,
+            user=user_with_notifications,
+            type="SYSTEM",
+            message="Bulk",
+        )
+        for _ in range(150)
+    )
+
+    response = _get(count_view, user_with_notifications)
+
+    assert response.data["data"]["unread_count"] == 100
+
+
+@pytest.mark.django_db
+def test_notification_cursor_splits_rows_sharing_a_timestamp(user_with_notifications):
+    # Bulk sends stamp every row with the same created_at
+    Notification.objects.filter(user=user_with_notifications).update(
+        created_at=timezone.now()
+    )
+    ids = sorted(
+        Notification.objects.filter(user=user_with_notifications).values_list(
+            "id", flat=True
+        ),
+        reverse=True,
+    )
+
+    first = _get(list_view, user_with_notifications, page_size=10).data["data"]
+    cursor = parse_qs(urlparse(first["next"]).query)["cursor"][0]
+    second = _get(list_view, user_with_notifications, page_size=10, cursor=cursor).data[
+        "data"
+    ]
+
+    assert [row["id"] for row in first["results"]] == ids[:10]
+    assert [row["id"] for row in second["results"]] == ids[10:20]
+
+    cursor = parse_qs(urlparse(second["previous"]).query)["cursor"][0]
+    back = _get(list_view, user_with_notifications, page_size=10, cursor=cursor).data[
+        "data"
+    ]
+
+    assert [row["id"] for row in back["results"]] == ids[:10]
+    assert back["previous"] is None
+
+
+@pytest.mark.django_db
+def test_notification_list_rejects_a_malformed_cursor(user_with_notifications):
+    response = _get(list_view, user_with_notifications, cursor="not-a-cursor")
+
+    assert response.status_code == 404
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from apps.accounts.models import User
+from apps.notifications.consumers import NotificationConsumer
+from apps.notifications.models import Notification
+from apps.notifications.services import (
+    create_notification,
+    push_pending_notifications,
+)
+from apps.notifications.tasks import sweep_unpushed_notifications_task
+from apps.tenants.models import Tenant
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+
+@pytest.fixture
+def channel_layer():
+    layer = MagicMock(group_send=AsyncMock())
+    with patch("apps.notifications.services.get_channel_layer", return_value=layer):
+        yield layer
+
+
+@pytest.fixture
+def user():
+    tenant = Tenant.objects.create(name="Test Tenant")
+    return User.objects.create(tenant=tenant, phone_number="9000000001")
+
+
+@pytest.mark.django_db
+def test_create_notification_pushes_after_commit(
+    user, channel_layer, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        notification = create_notification(
+            tenant=user.tenant, user=user, type="SYSTEM", message="Hello"
+        )
+        assert channel_layer.group_send.await_count == 0
+
+    channel_layer.group_send.assert_awaited_once()
+    group, event = channel_layer.group_send.await_args.args
+    assert group == f"user_{user.id}"
+    assert event["id"] == notification.id
+
+    notification.refresh_from_db()
+    assert notification.pushed_at is not None
+
+
+@pytest.mark.django_db
+def test_failed_push_stays_in_outbox_until_swept(user, channel_layer):
+    notification = Notification.objects.create(
+        tenant=user.tenant, user=user, type="SYSTEM", message="Hello"
+    )
+
+    channel_layer.group_send.side_effect = ConnectionError("channel layer down")
+    with pytest.raises(ConnectionError):
+        push_pending_notifications(notification_ids=[notification.id])
+
+    notification.refresh_from_db()
+    assert notification.pushed_at is None
+
+    channel_layer.group_send.side_effect = None
+    Notification.objects.filter(pk=notification.pk).update(
+        created_at=timezone.now() - timedelta(minutes=5)
+    )
+    sweep_unpushed_notifications_task()
+
+    notification.refresh_from_db()
+    assert notification.pushed_at is not None
+    # Already pushed rows are not sent again
+    assert push_pending_notifications(notification_ids=[notification.id]) == 0
+
+
+def test_consumer_drops_redelivered_notifications():
+    consumer = NotificationConsumer()
+    consumer.scope = {"user": MagicMock(is_anonymous=False, id=1)}
+    consumer.channel_layer = MagicMock(group_add=AsyncMock())
+    consumer.channel_name = "test"
+    consumer.accept = AsyncMock()
+    consumer.send_json = AsyncMock()
+
+    event = {"type": "notify", "id": 7, "message": "Hi", "created_at": "now"}
+
+    async_to_sync(consumer.connect)()
+    async_to_sync(consumer.notify)(event)
+    async_to_sync(consumer.notify)(event)
+
+    consumer.send_json.assert_awaited_once()
+    assert consumer.send_json.await_args.args[0]["id"] == 7
@@ -1,25 +1,152 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
 from apps.common.responses import success_response
 from apps.notifications.models import DeviceToken, Notification
 from apps.notifications.serializers import NotificationSerializer
+from apps.notifications.services import (
+    decrement_unread_count,
+    get_unread_count,
+    reset_unread_count,
+)
+from django.db.models import Q
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from rest_framework.views import APIView
 
 
+class NotificationCursorPagination(BasePagination):
+    """
+    Keyset pagination, newest first; served by notif_user_created_idx.
+
+    The cursor carries the (created_at, id) of the row at the page edge and
+    the next page is read with a range filter on both, so rows sharing a
+    timestamp (bulk-created notifications) never fall back to an offset.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            rows = list(queryset.order_by("-created_at", "-id")[: page_size + 1])
+            self.has_next = len(rows) > page_size
+            self.has_previous = False
+        else:
+            created_at, pk, reverse = cursor
+            if reverse:
+                rows = list(
+                    queryset.filter(
+                        Q(created_at__gt=created_at)
+                        | Q(created_at=created_at, id__gt=pk)
+                    ).order_by("created_at", "id")[: page_size + 1]
+                )
+                self.has_previous = len(rows) > page_size
+                self.has_next = True
+                rows = rows[:page_size][::-1]
+            else:
+                rows = list(
+                    queryset.filter(
+                        Q(created_at__lt=created_at)
+                        | Q(created_at=created_at, id__lt=pk)
+                    ).order_by("-created_at", "-id")[: page_size + 1]
+                )
+                self.has_next = len(rows) > page_size
+                self.has_previous = True
+
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            created_at = datetime.fromisoformat(data["c"])
+            return created_at, int(data["i"]), bool(data.get("r"))
+        except (KeyError, TypeError, ValueError, UnicodeEncodeError):
+            raise NotFound("Invalid cursor")
+
+    def encode_cursor(self, row, reverse=False):
+        data = {"c": row.created_at.isoformat(), "i": row.id}
+        if reverse:
+            data["r"] = 1
+        encoded = urlsafe_b64encode(json.dumps(data).encode()).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
 class NotificationListAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
-    @swagger_auto_schema(responses={200: NotificationSerializer(many=True)})
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter("cursor", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter(
+                "unread",
+                openapi.IN_QUERY,
+                description="Pass 1 to list unread notifications only",
+                type=openapi.TYPE_BOOLEAN,
+            ),
+        ],
+        responses={200: NotificationSerializer(many=True)},
+    )
     def get(self, request):
         notifications = Notification.objects.filter(
             tenant=request.user.tenant, user=request.user
         )
 
-        serializer = NotificationSerializer(notifications, many=True)
+        if request.query_params.get("unread") in ("1", "true"):
+            notifications = notifications.filter(is_read=False)
+
+        paginator = NotificationCursorPagination()
+        page = paginator.paginate_queryset(notifications, request, view=self)
+        serializer = NotificationSerializer(page, many=True)
 
         return Response(
-            success_response(data=serializer.data, message="Notifications fetched")
+            success_response(
+                data={
+                    "next": paginator.get_next_link(),
+                    "previous": paginator.get_previous_link(),
+                    "results": serializer.data,
+                    "unread_count": get_unread_count(request.user),
+                },
+                message="Notifications fetched",
+            )
         )
 
 
@@ -28,13 +155,15 @@ class MarkNotificationReadAPIView(APIView):
 
     @swagger_auto_schema(responses={200: "Notification marked as read"})
     def post(self, request, notification_id):
-        notification = Notification.objects.filter(
-            id=notification_id, tenant=request.user.tenant, user=request.user
-        ).first()
+        updated = Notification.objects.filter(
+            id=notification_id,
+            tenant=request.user.tenant,
+            user=request.user,
+            is_read=False,
+        ).update(is_read=True)
 
-        if notification:
-            notification.is_read = True
-            notification.save(update_fields=["is_read"])
+        if updated:
+            decrement_unread_count(request.user.id)
 
         return Response(success_response(message="Notification marked as read"))
 
@@ -47,6 +176,7 @@ class MarkAllNotificationsReadAPIView(APIView):
         Notification.objects.filter(
             tenant=request.user.tenant, user=request.user, is_read=False
         ).update(is_read=True)
+        reset_unread_count(request.user.id)
 
         return Response(success_response(message="All notifications marked as read"))
 
@@ -56,9 +186,7 @@ class UnreadNotificationCountAPIView(APIView):
 
     @swagger_auto_schema(responses={200: "Unread notifications count"})
     def get(self, request):
-        count = Notification.objects.filter(
-            tenant=request.user.tenant, user=request.user, is_read=False
-        ).count()
+        count = get_unread_count(request.user)
 
         return Response(success_response(data={"unread_count": count}))
 
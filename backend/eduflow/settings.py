@@ -230,6 +230,23 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 
+# Each queue has its own worker (see docker-compose.yml), so a backlog of
+# AI work can't hold up OTP delivery.
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "apps.accounts.tasks.send_otp_task": {"queue": "auth-critical"},
+    "apps.notifications.tasks.*": {"queue": "notifications"},
+    "apps.enrollments.tasks.*": {"queue": "notifications"},
+    "apps.ai.tasks.*": {"queue": "ai-heavy"},
+}
+# Workers reserve one task per process unless their command line says
+# otherwise; long AI tasks must not sit prefetched behind each other
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Per-tenant budget for AI tasks across all workers; 0 disables the limit
+AI_TENANT_RATE_LIMIT = int(os.getenv("AI_TENANT_RATE_LIMIT", "20"))
+AI_TENANT_RATE_WINDOW = int(os.getenv("AI_TENANT_RATE_WINDOW", "60"))  # seconds
+
 
 # ==============================
 # REDIS CONFIG
@@ -248,6 +265,22 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.enrollments.tasks.pending_enrollment_reminder_task",
         "schedule": crontab(minute=0),
     },
+    "reconcile-unread-notification-counts-every-15-minutes": {
+        "task": "apps.notifications.tasks.reconcile_unread_counts_task",
+        "schedule": crontab(minute="*/15"),
+    },
+    "sweep-unpushed-notifications-every-minute": {
+        "task": "apps.notifications.tasks.sweep_unpushed_notifications_task",
+        "schedule": crontab(),
+    },
+    "poll-quiz-jobs-every-2-minutes": {
+        "task": "apps.ai.tasks.poll_quiz_jobs",
+        "schedule": crontab(minute="*/2"),
+    },
+    "build-missing-question-banks-nightly": {
+        "task": "apps.ai.tasks.build_missing_question_banks",
+        "schedule": crontab(hour=3, minute=0),
+    },
 }
 
 
@@ -260,3 +293,10 @@ CELERY_REDIS_BACKEND_USE_SSL = {
 }
 
 AI_SERVICE_URL = "http://eduflow-ai:8002"
+# Base URL the AI service uses to reach this backend's /internal/ routes
+AI_CALLBACK_BASE_URL = os.getenv("AI_CALLBACK_BASE_URL", "http://backend:8000")
+INTERNAL_SERVICE_TOKEN = os.getenv("INTERNAL_SERVICE_TOKEN")
+# Questions pre-generated per PDF resource; lesson quizzes sample from these
+QUESTION_BANK_SIZE = int(os.getenv("QUESTION_BANK_SIZE", "30"))
+# Unfinished AI jobs are failed this long after they started
+AI_JOB_DEADLINE_SECONDS = int(os.getenv("AI_JOB_DEADLINE_SECONDS", "3600"))
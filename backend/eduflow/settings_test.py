@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     # Project apps
+    "apps.common",
     "apps.tenants",
     "apps.accounts",
     "apps.courses",
@@ -59,6 +60,20 @@ DATABASES = {
     }
 }
 
+AUTH_USER_MODEL = "accounts.User"
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# --------------------------------------------------
+# REST framework (mirrors production pagination)
+# --------------------------------------------------
+
+REST_FRAMEWORK = {
+    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "PAGE_SIZE": 20,
+    "EXCEPTION_HANDLER": "apps.common.exception_handler.custom_exception_handler",
+}
+
 # --------------------------------------------------
 # Passwords (fast hashing for tests)
 # --------------------------------------------------
@@ -87,3 +102,15 @@ STATIC_URL = "/static/"
 REDIS_URL = "redis://localhost:6379/0"
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+
+# --------------------------------------------------
+# AI service (never called for real in tests)
+# --------------------------------------------------
+
+AI_SERVICE_URL = "http://ai-service.test"
+AI_CALLBACK_BASE_URL = "http://backend.test"
+QUESTION_BANK_SIZE = 30
+AI_JOB_DEADLINE_SECONDS = 3600
+AI_TENANT_RATE_LIMIT = 0
+AI_TENANT_RATE_WINDOW = 60
+INTERNAL_SERVICE_TOKEN = "test-internal-token"
@@ -22,6 +22,7 @@ urlpatterns = [
     path("api/", include("apps.common.urls")),
     path("api/notifications/", include("apps.notifications.urls")),
     path("api/ai/", include("apps.ai.urls")),
+    path("internal/ai/", include("apps.ai.internal_urls")),
     path(
         "swagger/",
         schema_view.with_ui("swagger", cache_timeout=0),